@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+from south.utils import datetime_utils as datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Adding field 'Account.creator'
+        db.add_column(u'accounting_core_account', 'creator',
+                      self.gf('django.db.models.fields.related.ForeignKey')(blank=True, related_name='+', null=True, on_delete=models.SET_NULL, to=orm['users.TruffeUser']),
+                      keep_default=False)
+
+        # Adding field 'Account.created_at'
+        db.add_column(u'accounting_core_account', 'created_at',
+                      self.gf('django.db.models.fields.DateTimeField')(db_index=True, null=True, blank=True),
+                      keep_default=False)
+
+        if not db.dry_run:
+            db.execute("UPDATE accounting_core_account SET created_at = (SELECT %s FROM accounting_core_accountlogging WHERE accounting_core_accountlogging.object_id = accounting_core_account.id AND what = 'created' ORDER BY id LIMIT 1), creator_id = (SELECT who_id FROM accounting_core_accountlogging WHERE accounting_core_accountlogging.object_id = accounting_core_account.id AND what = 'created' ORDER BY id LIMIT 1)" % (db.quote_name('when'),))
+
+        # Adding field 'AccountCategory.creator'
+        db.add_column(u'accounting_core_accountcategory', 'creator',
+                      self.gf('django.db.models.fields.related.ForeignKey')(blank=True, related_name='+', null=True, on_delete=models.SET_NULL, to=orm['users.TruffeUser']),
+                      keep_default=False)
+
+        # Adding field 'AccountCategory.created_at'
+        db.add_column(u'accounting_core_accountcategory', 'created_at',
+                      self.gf('django.db.models.fields.DateTimeField')(db_index=True, null=True, blank=True),
+                      keep_default=False)
+
+        if not db.dry_run:
+            db.execute("UPDATE accounting_core_accountcategory SET created_at = (SELECT %s FROM accounting_core_accountcategorylogging WHERE accounting_core_accountcategorylogging.object_id = accounting_core_accountcategory.id AND what = 'created' ORDER BY id LIMIT 1), creator_id = (SELECT who_id FROM accounting_core_accountcategorylogging WHERE accounting_core_accountcategorylogging.object_id = accounting_core_accountcategory.id AND what = 'created' ORDER BY id LIMIT 1)" % (db.quote_name('when'),))
+
+        # Adding field 'AccountingYear.creator'
+        db.add_column(u'accounting_core_accountingyear', 'creator',
+                      self.gf('django.db.models.fields.related.ForeignKey')(blank=True, related_name='+', null=True, on_delete=models.SET_NULL, to=orm['users.TruffeUser']),
+                      keep_default=False)
+
+        # Adding field 'AccountingYear.created_at'
+        db.add_column(u'accounting_core_accountingyear', 'created_at',
+                      self.gf('django.db.models.fields.DateTimeField')(db_index=True, null=True, blank=True),
+                      keep_default=False)
+
+        if not db.dry_run:
+            db.execute("UPDATE accounting_core_accountingyear SET created_at = (SELECT %s FROM accounting_core_accountingyearlogging WHERE accounting_core_accountingyearlogging.object_id = accounting_core_accountingyear.id AND what = 'created' ORDER BY id LIMIT 1), creator_id = (SELECT who_id FROM accounting_core_accountingyearlogging WHERE accounting_core_accountingyearlogging.object_id = accounting_core_accountingyear.id AND what = 'created' ORDER BY id LIMIT 1)" % (db.quote_name('when'),))
+
+        # Adding field 'CostCenter.creator'
+        db.add_column(u'accounting_core_costcenter', 'creator',
+                      self.gf('django.db.models.fields.related.ForeignKey')(blank=True, related_name='+', null=True, on_delete=models.SET_NULL, to=orm['users.TruffeUser']),
+                      keep_default=False)
+
+        # Adding field 'CostCenter.created_at'
+        db.add_column(u'accounting_core_costcenter', 'created_at',
+                      self.gf('django.db.models.fields.DateTimeField')(db_index=True, null=True, blank=True),
+                      keep_default=False)
+
+        if not db.dry_run:
+            db.execute("UPDATE accounting_core_costcenter SET created_at = (SELECT %s FROM accounting_core_costcenterlogging WHERE accounting_core_costcenterlogging.object_id = accounting_core_costcenter.id AND what = 'created' ORDER BY id LIMIT 1), creator_id = (SELECT who_id FROM accounting_core_costcenterlogging WHERE accounting_core_costcenterlogging.object_id = accounting_core_costcenter.id AND what = 'created' ORDER BY id LIMIT 1)" % (db.quote_name('when'),))
+
+        # Adding field 'TVA.creator'
+        db.add_column(u'accounting_core_tva', 'creator',
+                      self.gf('django.db.models.fields.related.ForeignKey')(blank=True, related_name='+', null=True, on_delete=models.SET_NULL, to=orm['users.TruffeUser']),
+                      keep_default=False)
+
+        # Adding field 'TVA.created_at'
+        db.add_column(u'accounting_core_tva', 'created_at',
+                      self.gf('django.db.models.fields.DateTimeField')(db_index=True, null=True, blank=True),
+                      keep_default=False)
+
+        if not db.dry_run:
+            db.execute("UPDATE accounting_core_tva SET created_at = (SELECT %s FROM accounting_core_tvalogging WHERE accounting_core_tvalogging.object_id = accounting_core_tva.id AND what = 'created' ORDER BY id LIMIT 1), creator_id = (SELECT who_id FROM accounting_core_tvalogging WHERE accounting_core_tvalogging.object_id = accounting_core_tva.id AND what = 'created' ORDER BY id LIMIT 1)" % (db.quote_name('when'),))
+
+
+    def backwards(self, orm):
+        # Deleting field 'Account.creator'
+        db.delete_column(u'accounting_core_account', 'creator_id')
+
+        # Deleting field 'Account.created_at'
+        db.delete_column(u'accounting_core_account', 'created_at')
+
+        # Deleting field 'AccountCategory.creator'
+        db.delete_column(u'accounting_core_accountcategory', 'creator_id')
+
+        # Deleting field 'AccountCategory.created_at'
+        db.delete_column(u'accounting_core_accountcategory', 'created_at')
+
+        # Deleting field 'AccountingYear.creator'
+        db.delete_column(u'accounting_core_accountingyear', 'creator_id')
+
+        # Deleting field 'AccountingYear.created_at'
+        db.delete_column(u'accounting_core_accountingyear', 'created_at')
+
+        # Deleting field 'CostCenter.creator'
+        db.delete_column(u'accounting_core_costcenter', 'creator_id')
+
+        # Deleting field 'CostCenter.created_at'
+        db.delete_column(u'accounting_core_costcenter', 'created_at')
+
+        # Deleting field 'TVA.creator'
+        db.delete_column(u'accounting_core_tva', 'creator_id')
+
+        # Deleting field 'TVA.created_at'
+        db.delete_column(u'accounting_core_tva', 'created_at')
+
+
+    models = {
+        u'accounting_core.account': {
+            'Meta': {'unique_together': "(('name', 'accounting_year'), ('account_number', 'accounting_year'))", 'object_name': 'Account'},
+            'account_number': ('django.db.models.fields.CharField', [], {'max_length': '10'}),
+            'accounting_year': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['accounting_core.AccountingYear']"}),
+            'category': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['accounting_core.AccountCategory']"}),
+            'created_at': ('django.db.models.fields.DateTimeField', [], {'db_index': 'True', 'null': 'True', 'blank': 'True'}),
+            'creator': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'+'", 'null': 'True', 'on_delete': 'models.SET_NULL', 'to': u"orm['users.TruffeUser']"}),
+            'deleted': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'description': ('django.db.models.fields.TextField', [], {'null': 'True', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'last_activity': ('django.db.models.fields.DateTimeField', [], {'db_index': 'True', 'null': 'True', 'blank': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'visibility': ('django.db.models.fields.CharField', [], {'max_length': '50'})
+        },
+        u'accounting_core.accountcategory': {
+            'Meta': {'unique_together': "(('name', 'accounting_year'),)", 'object_name': 'AccountCategory'},
+            'accounting_year': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['accounting_core.AccountingYear']"}),
+            'created_at': ('django.db.models.fields.DateTimeField', [], {'db_index': 'True', 'null': 'True', 'blank': 'True'}),
+            'creator': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'+'", 'null': 'True', 'on_delete': 'models.SET_NULL', 'to': u"orm['users.TruffeUser']"}),
+            'deleted': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'description': ('django.db.models.fields.TextField', [], {'null': 'True', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'last_activity': ('django.db.models.fields.DateTimeField', [], {'db_index': 'True', 'null': 'True', 'blank': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'order': ('django.db.models.fields.SmallIntegerField', [], {'default': '0'}),
+            'parent_hierarchique': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['accounting_core.AccountCategory']", 'null': 'True', 'blank': 'True'})
+        },
+        u'accounting_core.accountcategorylogging': {
+            'Meta': {'object_name': 'AccountCategoryLogging'},
+            'extra_data': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'object': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'logs'", 'to': u"orm['accounting_core.AccountCategory']"}),
+            'what': ('django.db.models.fields.CharField', [], {'max_length': '64'}),
+            'when': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'who': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['users.TruffeUser']"})
+        },
+        u'accounting_core.accountcategoryviews': {
+            'Meta': {'object_name': 'AccountCategoryViews'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'object': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'views'", 'to': u"orm['accounting_core.AccountCategory']"}),
+            'when': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'who': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['users.TruffeUser']"})
+        },
+        u'accounting_core.accountingyear': {
+            'Meta': {'object_name': 'AccountingYear'},
+            'created_at': ('django.db.models.fields.DateTimeField', [], {'db_index': 'True', 'null': 'True', 'blank': 'True'}),
+            'creator': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'+'", 'null': 'True', 'on_delete': 'models.SET_NULL', 'to': u"orm['users.TruffeUser']"}),
+            'deleted': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'end_date': ('django.db.models.fields.DateTimeField', [], {'null': 'True', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'last_accounting_import': ('django.db.models.fields.DateTimeField', [], {'null': 'True', 'blank': 'True'}),
+            'last_activity': ('django.db.models.fields.DateTimeField', [], {'db_index': 'True', 'null': 'True', 'blank': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '255'}),
+            'start_date': ('django.db.models.fields.DateTimeField', [], {'null': 'True', 'blank': 'True'}),
+            'status': ('django.db.models.fields.CharField', [], {'default': "'0_preparing'", 'max_length': '255'}),
+            'subvention_deadline': ('django.db.models.fields.DateTimeField', [], {'null': 'True', 'blank': 'True'})
+        },
+        u'accounting_core.accountingyearlogging': {
+            'Meta': {'object_name': 'AccountingYearLogging'},
+            'extra_data': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'object': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'logs'", 'to': u"orm['accounting_core.AccountingYear']"}),
+            'what': ('django.db.models.fields.CharField', [], {'max_length': '64'}),
+            'when': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'who': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['users.TruffeUser']"})
+        },
+        u'accounting_core.accountingyearviews': {
+            'Meta': {'object_name': 'AccountingYearViews'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'object': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'views'", 'to': u"orm['accounting_core.AccountingYear']"}),
+            'when': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'who': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['users.TruffeUser']"})
+        },
+        u'accounting_core.accountlogging': {
+            'Meta': {'object_name': 'AccountLogging'},
+            'extra_data': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'object': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'logs'", 'to': u"orm['accounting_core.Account']"}),
+            'what': ('django.db.models.fields.CharField', [], {'max_length': '64'}),
+            'when': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'who': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['users.TruffeUser']"})
+        },
+        u'accounting_core.accountviews': {
+            'Meta': {'object_name': 'AccountViews'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'object': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'views'", 'to': u"orm['accounting_core.Account']"}),
+            'when': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'who': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['users.TruffeUser']"})
+        },
+        u'accounting_core.costcenter': {
+            'Meta': {'unique_together': "(('name', 'accounting_year'), ('account_number', 'accounting_year'))", 'object_name': 'CostCenter'},
+            'account_number': ('django.db.models.fields.CharField', [], {'max_length': '10'}),
+            'accounting_year': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['accounting_core.AccountingYear']"}),
+            'created_at': ('django.db.models.fields.DateTimeField', [], {'db_index': 'True', 'null': 'True', 'blank': 'True'}),
+            'creator': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'+'", 'null': 'True', 'on_delete': 'models.SET_NULL', 'to': u"orm['users.TruffeUser']"}),
+            'deleted': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'description': ('django.db.models.fields.TextField', [], {'null': 'True', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'last_activity': ('django.db.models.fields.DateTimeField', [], {'db_index': 'True', 'null': 'True', 'blank': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'unit': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['units.Unit']"})
+        },
+        u'accounting_core.costcenterlogging': {
+            'Meta': {'object_name': 'CostCenterLogging'},
+            'extra_data': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'object': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'logs'", 'to': u"orm['accounting_core.CostCenter']"}),
+            'what': ('django.db.models.fields.CharField', [], {'max_length': '64'}),
+            'when': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'who': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['users.TruffeUser']"})
+        },
+        u'accounting_core.costcenterviews': {
+            'Meta': {'object_name': 'CostCenterViews'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'object': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'views'", 'to': u"orm['accounting_core.CostCenter']"}),
+            'when': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'who': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['users.TruffeUser']"})
+        },
+        u'accounting_core.tva': {
+            'Meta': {'object_name': 'TVA'},
+            'account': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['accounting_core.Account']"}),
+            'agepoly_only': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'code': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'created_at': ('django.db.models.fields.DateTimeField', [], {'db_index': 'True', 'null': 'True', 'blank': 'True'}),
+            'creator': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'+'", 'null': 'True', 'on_delete': 'models.SET_NULL', 'to': u"orm['users.TruffeUser']"}),
+            'deleted': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'last_activity': ('django.db.models.fields.DateTimeField', [], {'db_index': 'True', 'null': 'True', 'blank': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'value': ('django.db.models.fields.DecimalField', [], {'max_digits': '20', 'decimal_places': '2'})
+        },
+        u'accounting_core.tvalogging': {
+            'Meta': {'object_name': 'TVALogging'},
+            'extra_data': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'object': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'logs'", 'to': u"orm['accounting_core.TVA']"}),
+            'what': ('django.db.models.fields.CharField', [], {'max_length': '64'}),
+            'when': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'who': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['users.TruffeUser']"})
+        },
+        u'accounting_core.tvaviews': {
+            'Meta': {'object_name': 'TVAViews'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'object': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'views'", 'to': u"orm['accounting_core.TVA']"}),
+            'when': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'who': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['users.TruffeUser']"})
+        },
+        u'auth.group': {
+            'Meta': {'object_name': 'Group'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '80'}),
+            'permissions': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['auth.Permission']", 'symmetrical': 'False', 'blank': 'True'})
+        },
+        u'auth.permission': {
+            'Meta': {'ordering': "(u'content_type__app_label', u'content_type__model', u'codename')", 'unique_together': "((u'content_type', u'codename'),)", 'object_name': 'Permission'},
+            'codename': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'content_type': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['contenttypes.ContentType']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '50'})
+        },
+        u'contenttypes.contenttype': {
+            'Meta': {'ordering': "('name',)", 'unique_together': "(('app_label', 'model'),)", 'object_name': 'ContentType', 'db_table': "'django_content_type'"},
+            'app_label': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'model': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '100'})
+        },
+        u'units.unit': {
+            'Meta': {'object_name': 'Unit'},
+            'created_at': ('django.db.models.fields.DateTimeField', [], {'db_index': 'True', 'null': 'True', 'blank': 'True'}),
+            'creator': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'+'", 'null': 'True', 'on_delete': 'models.SET_NULL', 'to': u"orm['users.TruffeUser']"}),
+            'deleted': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'description': ('django.db.models.fields.TextField', [], {'null': 'True', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'id_epfl': ('django.db.models.fields.CharField', [], {'max_length': '64', 'null': 'True', 'blank': 'True'}),
+            'is_commission': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'is_equipe': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'is_hidden': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'last_activity': ('django.db.models.fields.DateTimeField', [], {'db_index': 'True', 'null': 'True', 'blank': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'parent_hierarchique': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['units.Unit']", 'null': 'True', 'blank': 'True'}),
+            'url': ('django.db.models.fields.URLField', [], {'max_length': '200', 'null': 'True', 'blank': 'True'})
+        },
+        u'users.truffeuser': {
+            'Meta': {'object_name': 'TruffeUser'},
+            'adresse': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'avatar': ('django.db.models.fields.files.ImageField', [], {'max_length': '100', 'null': 'True', 'blank': 'True'}),
+            'body': ('django.db.models.fields.CharField', [], {'default': "'.'", 'max_length': '1'}),
+            'date_joined': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'email': ('django.db.models.fields.EmailField', [], {'max_length': '255'}),
+            'email_perso': ('django.db.models.fields.EmailField', [], {'max_length': '255', 'null': 'True', 'blank': 'True'}),
+            'first_name': ('django.db.models.fields.CharField', [], {'max_length': '100', 'blank': 'True'}),
+            'groups': ('django.db.models.fields.related.ManyToManyField', [], {'symmetrical': 'False', 'related_name': "u'user_set'", 'blank': 'True', 'to': u"orm['auth.Group']"}),
+            'homepage': ('django.db.models.fields.TextField', [], {'null': 'True', 'blank': 'True'}),
+            'iban_ou_ccp': ('django.db.models.fields.CharField', [], {'max_length': '128', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'is_active': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'is_betatester': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'is_superuser': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'last_login': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'last_name': ('django.db.models.fields.CharField', [], {'max_length': '100', 'blank': 'True'}),
+            'mobile': ('django.db.models.fields.CharField', [], {'max_length': '25', 'blank': 'True'}),
+            'nom_banque': ('django.db.models.fields.CharField', [], {'max_length': '128', 'blank': 'True'}),
+            'password': ('django.db.models.fields.CharField', [], {'max_length': '128'}),
+            'user_permissions': ('django.db.models.fields.related.ManyToManyField', [], {'symmetrical': 'False', 'related_name': "u'user_set'", 'blank': 'True', 'to': u"orm['auth.Permission']"}),
+            'username': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '255'})
+        }
+    }
+
+    complete_apps = ['accounting_core']
\ No newline at end of file
@@ -43,6 +43,7 @@ def copy_accounting_year(request, pk):
         ay.status = '0_preparing'
 
         ay.id = None
+        ay.reset_tracking_fields()
         ay.save()
 
         for cp_obj in copiable_objects.values():
@@ -50,6 +51,7 @@ def copy_accounting_year(request, pk):
             for elem in cp_obj:
                 elem.accounting_year = ay
                 elem.id = None
+                elem.reset_tracking_fields()
                 elem.save()
 
         for cp_class, cp_obj in copiable_objects.iteritems():
@@ -17,6 +17,8 @@ from django.template.defaultfilters import floatformat
 
 from schwifty import IBAN
 import datetime
+import glob
+import hashlib
 import string
 from PIL import Image, ImageDraw, ImageFont
 import os
@@ -30,6 +32,23 @@ from notifications.utils import notify_people, unotify_people
 from rights.utils import UnitExternalEditableModel, UnitEditableModel, AgepolyEditableModel
 
 
+BVR_SCALE = 4.72
+_bvr_ressources = {}
+
+
+def get_bvr_ressources():
+    """Return the base image and the OCR-B font used to draw BVRs. Loaded only once per process."""
+
+    if not _bvr_ressources:
+        _bvr_ressources['font'] = ImageFont.truetype(os.path.join(settings.DJANGO_ROOT, 'media/fonts/OCR_BB.TTF'), int(42 * BVR_SCALE))
+
+        base = Image.open(os.path.join(settings.DJANGO_ROOT, 'media/img/base_bvr.png'))
+        base.load()
+        _bvr_ressources['base'] = base
+
+    return _bvr_ressources['base'], _bvr_ressources['font']
+
+
 class _Subvention(GenericModel, GenericModelWithFiles, GenericModelWithLines, AccountingYearLinked, GenericStateModel, GenericGroupsModel, UnitExternalEditableModel, GenericExternalUnitAllowed, GenericContactableModel, SearchableModel):
 
     SUBVENTION_TYPE = (
@@ -376,7 +395,7 @@ class _Invoice(GenericModel, GenericStateModel, GenericTaggableObject, CostCente
         base_icon = 'fa fa-list'
         elem_icon = 'fa fa-pencil-square-o'
 
-        default_sort = "[2, 'desc']"  # creation_date (pk)
+        default_sort = "[2, 'desc']"  # creation_date
 
         menu_id = 'menu-compta-invoice'
 
@@ -386,7 +405,7 @@ class _Invoice(GenericModel, GenericStateModel, GenericTaggableObject, CostCente
 
 Tu peux utiliser le numéro de BVR généré, ou demander à Marianne un 'vrai' BVR. NE GENERE JAMAIS UN NUMÉRO DE BVR ALÉATOIRE OU DE TON CHOIX.""")
 
-        trans_sort = {'get_creation_date': 'pk'}
+        trans_sort = {'get_creation_date': 'created_at'}
 
         not_sortable_columns = ['get_reference', 'get_bvr_number', 'get_total_display']
         yes_or_no_fields = ['display_bvr', 'display_account', 'annex', 'english', 'add_to']
@@ -717,11 +736,11 @@ Tu peux utiliser le numéro de BVR généré, ou demander à Marianne un 'vrai'
 
     def generate_bvr(self):
 
-        F = 4.72
+        F = BVR_SCALE
 
-        ocr_b = ImageFont.truetype(os.path.join(settings.DJANGO_ROOT, 'media/fonts/OCR_BB.TTF'), int(42 * F))
+        base, ocr_b = get_bvr_ressources()
 
-        img = Image.open(os.path.join(settings.DJANGO_ROOT, 'media/img/base_bvr.png'))
+        img = base.copy()
 
         draw = ImageDraw.Draw(img)
 
@@ -767,6 +786,30 @@ Tu peux utiliser le numéro de BVR généré, ou demander à Marianne un 'vrai'
 
         return img
 
+    def get_bvr_cache_key(self):
+        """Return a key identifying the content of the BVR: it change only if the amount or the reference change"""
+        return hashlib.sha1('{}|{:.2f}|{}'.format(self.pk, self.get_total(), self.get_bvr_number())).hexdigest()[:16]
+
+    def get_bvr_file(self):
+        """Return the path (relative to MEDIA_ROOT) of the rendered BVR, generated only if needed"""
+
+        folder = os.path.join(settings.MEDIA_ROOT, 'cache', 'bvr')
+        filename = '{}_{}.png'.format(self.pk, self.get_bvr_cache_key())
+        full_path = os.path.join(folder, filename)
+
+        if not os.path.isfile(full_path):
+            img = self.generate_bvr()
+            img = img.resize((1414, 1000), Image.LANCZOS)
+            img.save('{}.tmp'.format(full_path), 'png')
+            os.rename('{}.tmp'.format(full_path), full_path)
+
+            # Remove old versions
+            for old_file in glob.glob(os.path.join(folder, '{}_*.png'.format(self.pk))):
+                if old_file != full_path:
+                    os.unlink(old_file)
+
+        return os.path.join('cache', 'bvr', filename)
+
     def genericFormExtraClean(self, data, form):
 
         if 'custom_bvr_number' in data and data['custom_bvr_number']:
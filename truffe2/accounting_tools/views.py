@@ -13,10 +13,11 @@ from django.contrib import messages
 import datetime
 import os
 import json
-from PIL import Image
+from sendfile import sendfile
 
 
-from app.utils import generate_pdf
+from app.utils import generate_pdf, build_etag, cached_response
+from generic.pdfjobs import start_pdf_job
 
 
 def get_statistics(subventions):
@@ -52,12 +53,19 @@ def export_demands_yearly(request, ypk):
 
 @login_required
 def export_all_demands(request):
-    from accounting_core.models import AccountingYear
     from accounting_tools.models import Subvention
 
     if not Subvention.static_rights_can('EXPORT', request.user):
         raise Http404
 
+    return start_pdf_job(request, 'accounting_tools.views.build_all_demands_pdf', 'subventions.pdf')
+
+
+def build_all_demands_pdf(user):
+    """Build the PDF of all subventions, across all years. Rendered in background (see export_all_demands)"""
+    from accounting_core.models import AccountingYear
+    from accounting_tools.models import Subvention
+
     years = AccountingYear.objects.filter(deleted=False).order_by('start_date')
     subventions = []
     for ay in years:
@@ -78,7 +86,7 @@ def export_all_demands(request):
                 line += ["", "", "", ""]
         summary.append(line)
 
-    return generate_pdf("accounting_tools/subvention/subventions_pdf.html", request, {'subventions': subventions, 'summary': summary, 'years': years})
+    return ("accounting_tools/subvention/subventions_pdf.html", {'subventions': subventions, 'summary': summary, 'years': years}, None)
 
 
 @login_required
@@ -91,11 +99,7 @@ def invoice_pdf(request, pk):
     if not invoice.rights_can('DOWNLOAD_PDF', request.user):
         raise Http404
 
-    img = invoice.generate_bvr()
-    img = img.resize((1414, 1000), Image.LANCZOS)
-    img.save(os.path.join(settings.MEDIA_ROOT, 'cache/bvr/{}.png').format(invoice.pk))
-
-    return generate_pdf("accounting_tools/invoice/pdf.html", request, {'invoice': invoice})
+    return generate_pdf("accounting_tools/invoice/pdf.html", request, {'invoice': invoice, 'bvr_file': invoice.get_bvr_file()})
 
 
 @login_required
@@ -108,11 +112,9 @@ def invoice_bvr(request, pk):
     if not invoice.rights_can('SHOW', request.user):
         raise Http404
 
-    img = invoice.generate_bvr()
+    bvr_file = invoice.get_bvr_file()
 
-    response = HttpResponse(mimetype="image/png")
-    img.save(response, 'png')
-    return response
+    return cached_response(request, lambda: sendfile(request, os.path.join(settings.MEDIA_ROOT, bvr_file)), etag=build_etag(bvr_file))
 
 
 @login_required
@@ -187,7 +189,16 @@ def expenseclaim_pdf(request, pk):
     if not expenseclaim.rights_can('SHOW', request.user):
         raise Http404
 
-    return generate_pdf("accounting_tools/expenseclaim/pdf.html", request, {'object': expenseclaim}, [f.file for f in expenseclaim.get_pdf_files()])
+    return start_pdf_job(request, 'accounting_tools.views.build_expenseclaim_pdf', u'{}.pdf'.format(slugify(unicode(expenseclaim))), pk=expenseclaim.pk)
+
+
+def build_expenseclaim_pdf(user, pk):
+    """Build the PDF of an expense claim, with all proofs attached. Rendered in background (see expenseclaim_pdf)"""
+    from accounting_tools.models import ExpenseClaim
+
+    expenseclaim = ExpenseClaim.objects.get(pk=pk, deleted=False)
+
+    return ("accounting_tools/expenseclaim/pdf.html", {'object': expenseclaim}, [f.file for f in expenseclaim.get_pdf_files()])
 
 
 @login_required
@@ -221,7 +232,7 @@ def expenseclaim_csv(request, pk):
             else:
                 return redirect('accounting_tools.views.expenseclaim_list')
 
-        writer.writerow([u'0', expenseclaim_count, u'Crédit', 300000 + expenseclaim.pk, expenseclaim.logs.first().when.strftime(u"%d.%m.%Y"), expenseclaim.user.username, u'CHF', 0, u'2000', u'NDF - {0}'.format(unicode(expenseclaim)), expenseclaim.logs.first().when.strftime(u"%d.%m.%Y"), '', '', '', '', '', '', '', '', u'NDF#{0}'.format(unicode(expenseclaim.pk))])
+        writer.writerow([u'0', expenseclaim_count, u'Crédit', 300000 + expenseclaim.pk, expenseclaim.get_creation_date().strftime(u"%d.%m.%Y"), expenseclaim.user.username, u'CHF', 0, u'2000', u'NDF - {0}'.format(unicode(expenseclaim)), expenseclaim.get_creation_date().strftime(u"%d.%m.%Y"), '', '', '', '', '', '', '', '', u'NDF#{0}'.format(unicode(expenseclaim.pk))])
         provider_to_export.append(expenseclaim.user)
         first = True
         line_count = 1
@@ -1,52 +1,215 @@
 import ldap
+import ldap.filter
+from ldap.ldapobject import ReconnectLDAPObject
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.encoding import smart_str
 
+import base64
+import contextlib
+import importlib
+import Queue
 
-def get_attrs_of_sciper(sciper):
-    con = ldap.initialize(settings.LDAP)
-    con.simple_bind()
 
-    base_dn = 'c=ch'
-    filter = '(uniqueIdentifier=' + str(sciper) + ')'
-    attrs = ['sn', 'givenName', 'mail']
+BASE_DN = 'c=ch'
+PERSON_ATTRS = ['uniqueIdentifier', 'sn', 'givenName', 'mail', 'cn']
 
-    name, firstname, email = '', '', ''
-    for someone in con.search_s(base_dn, ldap.SCOPE_SUBTREE, filter, attrs):
-        name = someone[1].get('sn', [''])[0].split(',')[0]
-        firstname = someone[1].get('givenName', [''])[0].split(',')[0]
-        email = someone[1].get('mail', [''])[0]
 
-    if not name:
-        print "No user in LDAP with sciper {}".format(sciper)
+class LdapBackend(object):
+    """Search people in the LDAP server (settings.LDAP), reusing bound connections"""
 
-    return (name, firstname, email)
+    def __init__(self, url=None, pool_size=None):
+        self.url = url or settings.LDAP
+        self.pool = Queue.Queue(pool_size or settings.LDAP_POOL_SIZE)
 
+    @contextlib.contextmanager
+    def connection(self):
+        """Return a bound connection from the pool (or a new one if the pool is empty)"""
 
-def search_sciper(s):
+        try:
+            con = self.pool.get_nowait()
+        except Queue.Empty:
+            con = ReconnectLDAPObject(self.url, retry_max=3)
+            con.simple_bind_s()
+
+        try:
+            yield con
+        finally:
+            try:
+                self.pool.put_nowait(con)
+            except Queue.Full:
+                con.unbind_s()
 
-    con = ldap.initialize(settings.LDAP)
-    con.simple_bind()
+    def _search(self, filterstr):
+        with self.connection() as con:
+            return [attrs for (dn, attrs) in con.search_s(BASE_DN, ldap.SCOPE_SUBTREE, filterstr, PERSON_ATTRS)]
 
-    base_dn = 'c=ch'
-    filter = '(|(cn=*%s*)(uniqueIdentifier=%s))' % (smart_str(s), smart_str(s))
-    attrs = ['uniqueIdentifier', 'sn', 'givenName', 'mail']
+    def lookup(self, scipers):
+        """Return the list of entries (dict of attributes) of the scipers, with one search"""
+        return self._search('(|%s)' % (''.join(['(uniqueIdentifier=%s)' % (ldap.filter.escape_filter_chars(smart_str(sciper)),) for sciper in scipers]),))
 
-    results = {}
+    def search(self, s):
+        """Return the list of entries (dict of attributes) matching a name or a sciper"""
+        s = ldap.filter.escape_filter_chars(smart_str(s))
+        return self._search('(|(cn=*%s*)(uniqueIdentifier=%s))' % (s, s))
 
-    for someone in con.search_s(base_dn, ldap.SCOPE_SUBTREE, filter, attrs):
-        try:
-            sciper = someone[1]['uniqueIdentifier'][0]
-            name = someone[1]['sn'][0].split(',')[0]
-            firstname = someone[1]['givenName'][0].split(',')[0]
-            email = someone[1]['mail'][0]
 
-            results[sciper] = (sciper, firstname, name, email)
-        except:
-            pass
+class MemoryBackend(object):
+    """Search people in a list of entries (dict of attributes, like LDAP results). Used as a stand-in for the LDAP server."""
+
+    def __init__(self, entries=None):
+        self.entries = entries or []
+
+    def lookup(self, scipers):
+        scipers = set([smart_str(sciper) for sciper in scipers])
+        return [attrs for attrs in self.entries if attrs.get('uniqueIdentifier', [None])[0] in scipers]
+
+    def search(self, s):
+        s = smart_str(s)
+        return [attrs for attrs in self.entries if attrs.get('uniqueIdentifier', [None])[0] == s or any([s.lower() in cn.lower() for cn in attrs.get('cn', [])])]
+
+
+class LdifBackend(MemoryBackend):
+    """Search people in a LDIF file (settings.LDAP_LDIF_FILE)"""
+
+    def __init__(self, path=None):
+        super(LdifBackend, self).__init__(self.parse(open(path or settings.LDAP_LDIF_FILE).read()))
+
+    @staticmethod
+    def parse(data):
+        """Return the list of entries (dict of attributes) of a LDIF file"""
+
+        entries = []
+        attrs = None
+        lines = []
+
+        # Unfold continuation lines
+        for line in data.splitlines():
+            if line.startswith(' ') and lines:
+                lines[-1] += line[1:]
+            else:
+                lines.append(line)
+
+        for line in lines + ['']:
+            if not line.strip():
+                if attrs:
+                    entries.append(attrs)
+                attrs = None
+            elif not line.startswith('#') and ':' in line:
+                key, value = line.split(':', 1)
+
+                if value.startswith(':'):
+                    value = base64.b64decode(value[1:].strip())
+                else:
+                    value = value.strip()
+
+                if key == 'dn':
+                    attrs = {}
+                elif attrs is not None:
+                    attrs.setdefault(key, []).append(value)
+
+        return entries
+
+
+def _person_of(attrs):
+    """Return (name, firstname, email) of an entry"""
+    return (attrs.get('sn', [''])[0].split(',')[0], attrs.get('givenName', [''])[0].split(',')[0], attrs.get('mail', [''])[0])
+
+
+class LdapDirectory(object):
+    """Find people by sciper, with a cache of results and lookups of many scipers at once"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def get_people(self, scipers):
+        """Return a dict sciper -> (name, firstname, email) for the scipers. Unknown scipers get empty values."""
+
+        scipers = set([smart_str(sciper) for sciper in scipers])
+
+        cached = cache.get_many(['ldap~sciper_%s' % (sciper,) for sciper in scipers])
+
+        retour = dict((sciper, cached['ldap~sciper_%s' % (sciper,)]) for sciper in scipers if 'ldap~sciper_%s' % (sciper,) in cached)
+
+        missing = sorted(scipers - set(retour.keys()))
+
+        for i in range(0, len(missing), settings.LDAP_BATCH_SIZE):
+            chunk = missing[i:i + settings.LDAP_BATCH_SIZE]
 
-        if len(results) >= 7:
-            return results
+            found = {}
 
-    return results
+            for attrs in self.backend.lookup(chunk):
+                found[attrs['uniqueIdentifier'][0]] = _person_of(attrs)
+
+            cache.set_many(dict(('ldap~sciper_%s' % (sciper,), person) for (sciper, person) in found.iteritems()), settings.LDAP_CACHE_TIMEOUT)
+
+            for sciper in chunk:
+                if sciper not in found:
+                    print "No user in LDAP with sciper {}".format(sciper)
+                    found[sciper] = ('', '', '')
+                    cache.set('ldap~sciper_%s' % (sciper,), found[sciper], settings.LDAP_CACHE_MISSING_TIMEOUT)
+
+            retour.update(found)
+
+        return retour
+
+    def get_person(self, sciper):
+        """Return (name, firstname, email) of the sciper"""
+        return self.get_people([sciper])[smart_str(sciper)]
+
+    def search(self, s):
+        """Return a dict sciper -> (sciper, firstname, name, email) of, at most, 7 people matching s"""
+
+        results = {}
+
+        for attrs in self.backend.search(s):
+            try:
+                sciper = attrs['uniqueIdentifier'][0]
+                name = attrs['sn'][0].split(',')[0]
+                firstname = attrs['givenName'][0].split(',')[0]
+                email = attrs['mail'][0]
+
+                results[sciper] = (sciper, firstname, name, email)
+            except:
+                pass
+
+            if len(results) >= 7:
+                return results
+
+        return results
+
+
+_directory = None
+
+
+def get_directory():
+    """Return the directory, using the backend set in settings.LDAP_BACKEND"""
+
+    global _directory
+
+    if _directory is None:
+        module, name = settings.LDAP_BACKEND.rsplit('.', 1)
+        _directory = LdapDirectory(getattr(importlib.import_module(module), name)())
+
+    return _directory
+
+
+def set_directory_backend(backend):
+    """Replace the backend of the directory (eg. a MemoryBackend for tests)"""
+
+    global _directory
+
+    _directory = LdapDirectory(backend)
+
+
+def get_attrs_of_sciper(sciper):
+    return get_directory().get_person(sciper)
+
+
+def get_attrs_of_scipers(scipers):
+    return get_directory().get_people(scipers)
+
+
+def search_sciper(s):
+    return get_directory().search(s)
@@ -223,6 +223,20 @@ TEMPLATE_CONTEXT_PROCESSORS = ("django.contrib.auth.context_processors.auth",
 )
 
 LDAP = 'ldap://ldap.epfl.ch:389'
+LDAP_BACKEND = 'app.ldaputils.LdapBackend'  # Pour les tests, 'app.ldaputils.LdifBackend' avec LDAP_LDIF_FILE
+LDAP_LDIF_FILE = None
+LDAP_POOL_SIZE = 4  # Nombre de connexions LDAP gardées ouvertes
+LDAP_BATCH_SIZE = 100  # Nombre maximum de scipers recherchés en une requête
+LDAP_CACHE_TIMEOUT = 3600 * 24  # En secondes, durée de conservation des informations d'un sciper
+LDAP_CACHE_MISSING_TIMEOUT = 600  # En secondes, durée de conservation d'un sciper inexistant
+
+DIT_EXPORT_FILE = '/tmp/generateListAccredsForDIT'  # Export des accréditations pour le DIT (la référence pour calculer les changements est gardée à côté, en .snapshot)
+DIT_EXPORT_DELTA_FILE = '/tmp/generateListAccredsForDITDelta'  # Changements depuis le dernier envoi de changements
+DIT_UPLOADER = 'units.dit_export.SftpUploader'  # Classe utilisée pour envoyer les exports (units.dit_export.DirectoryUploader pour un dossier local)
+DIT_SFTP_TARGET = 'collecte@cadibatch.epfl.ch:agepoly/'
+DIT_UPLOAD_DIR = None  # Dossier de destination pour units.dit_export.DirectoryUploader
+
+RIGHTS_OBJECTS_CHUNK_SIZE = 10000  # Nombre de pks refusés par valeur en cache (voir rights_objects_with), pour rester sous la taille maximale d'une valeur
 
 ROOT_UNIT_PK = 1
 SYSTEM_USER_PK = 1572
@@ -252,6 +266,9 @@ THUMBNAIL_PROCESSORS = (
     'easy_thumbnails.processors.filters',
 )
 
+THUMBNAIL_STANDARD_SIZES = ((200, 100), (200, 200))  # Tailles des miniatures des fichiers générées en arrière plan après l'upload
+THUMBNAILS_FAILED_TIMEOUT = 3600 * 24 * 7  # En secondes, durée pendant laquelle la miniature d'un fichier illisible n'est pas regénérée
+
 NOTIFS_MAXIMUM_WAIT = 15  # En minutes, le temps maximal avant d'envoyer une notification
 NOTIFS_MINIMUM_BLANK = 5  # En minutes, le temps minimal sans notification avant d'envoyer une notification
 
@@ -269,6 +286,26 @@ HAYSTACK_SIGNAL_PROCESSOR = 'celery_haystack.signals.CelerySignalProcessor'
 HAYSTACK_SEARCH_RESULTS_PER_PAGE = 25
 HAYSTACK_MAX_SIMPLE_SEARCH_RESULTS = 100
 
+PUBLIC_FEEDS_MAX_AGE = 60  # En secondes, durée pendant laquelle les flux publics (news du site, écrans) peuvent être gardés en cache
+MEMBERSET_API_MAX_PAGE_SIZE = 1000  # Nombre maximum de membres par page dans l'API des groupes de membres
+
+PDF_JOBS_TIMEOUT = 3600  # En secondes, durée de conservation des PDFs générés en arrière plan
+PDF_JOBS_REUSE_TIMEOUT = 60  # En secondes, durée pendant laquelle un PDF identique demandé par le même utilisateur n'est pas regénéré
+
+AVATARS_FETCHER = 'users.avatars.PeopleFetcher'  # Classe utilisée pour récupérer les photos des utilisateurs (users.avatars.DirectoryFetcher pour un dossier local)
+AVATARS_PEOPLE_URL = 'http://people.epfl.ch/cgi-bin/people/getPhoto?id={}'
+AVATARS_LOCAL_DIR = None  # Dossier des photos pour users.avatars.DirectoryFetcher
+AVATARS_SIZE = 200  # En pixels, taille maximale des photos gardées en cache
+AVATARS_TIMEOUT = 3600 * 24  # En secondes, durée après laquelle une photo est rafraîchie (en arrière plan)
+AVATARS_MISSING_TIMEOUT = 3600 * 24 * 7  # En secondes, durée pendant laquelle un utilisateur sans photo n'est pas recherché à nouveau
+AVATARS_QUEUE_TIMEOUT = 300  # En secondes, durée pendant laquelle une photo en attente de rafraîchissement n'est pas redemandée
+AVATARS_FETCH_TIMEOUT = 10  # En secondes, temps d'attente maximum de l'annuaire
+
+AVAILABILITY_MAX_DAYS = 31  # Durée maximale de la période pour la recherche de créneaux libres (salles, affichages, véhicules)
+
+CALENDAR_ICS_PAST_DAYS = 30  # Nombre de jours passés exportés dans les calendriers iCalendar
+CALENDAR_ICS_FUTURE_DAYS = 180  # Nombre de jours futurs exportés dans les calendriers iCalendar
+
 WEBSITE_PATH = 'https://truffe2.agepoly.ch'
 
 EMAIL_FROM = 'truffe2@epfl.ch'
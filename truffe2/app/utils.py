@@ -9,10 +9,15 @@ from django.core.mail import EmailMultiAlternatives
 from django.utils.timezone import now
 from django.contrib.sites.models import get_current_site
 from django.shortcuts import render
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
 
 
 import logging
+import calendar
 import cgi
+import datetime
+import hashlib
 import ho.pisa as pisa
 import cStringIO as StringIO
 from pyPdf import PdfFileWriter, PdfFileReader
@@ -162,9 +167,28 @@ def append_pdf(input, output):
     [output.addPage(input.getPage(page_num)) for page_num in range(input.numPages)]
 
 
-def generate_pdf(template, request, contexte, extra_pdf_files=None):
+class PdfAppendError(Exception):
+    """Raised when an extra PDF file cannot be appended to a generated PDF"""
+
+    def __init__(self, pdf_file, error):
+        super(PdfAppendError, self).__init__(error)
+        self.pdf_file = pdf_file
+        self.error = error
+
+
+class PdfRenderError(Exception):
+    """Raised when pisa cannot render the html of a PDF"""
+
+    def __init__(self, html):
+        super(PdfRenderError, self).__init__('Unable to render pdf')
+        self.html = html
+
+
+def render_pdf(template, contexte, user, extra_pdf_files=None):
+    """Render a template to a PDF and return the raw data. Doesn't need a request, to be usable in background tasks."""
+
     template = get_template(template)
-    contexte.update({'MEDIA_ROOT': settings.MEDIA_ROOT, 'cdate': now(), 'user': request.user})
+    contexte.update({'MEDIA_ROOT': settings.MEDIA_ROOT, 'cdate': now(), 'user': user})
     context = Context(contexte)
 
     html = template.render(context)
@@ -182,15 +206,72 @@ def generate_pdf(template, request, contexte, extra_pdf_files=None):
         for pdf_file in extra_pdf_files:
             try:
                 append_pdf(PdfFileReader(pdf_file), output)
-            except Exception as e:
-                return render(request, "pdf_error.html", {'pdf': pdf_file, 'error': traceback.format_exc()})
+            except Exception:
+                raise PdfAppendError(pdf_file, traceback.format_exc())
 
         output.write(result)
 
-    if not pdf.err:
-        return http.HttpResponse(result.getvalue(), mimetype='application/pdf')
+    if pdf.err:
+        raise PdfRenderError(html)
+
+    return result.getvalue()
+
+
+def generate_pdf(template, request, contexte, extra_pdf_files=None):
+
+    try:
+        data = render_pdf(template, contexte, request.user, extra_pdf_files)
+    except PdfAppendError as e:
+        return render(request, "pdf_error.html", {'pdf': e.pdf_file, 'error': e.error})
+    except PdfRenderError as e:
+        return http.HttpResponse('Gremlins ate your pdf! %s' % cgi.escape(e.html))
+
+    return http.HttpResponse(data, mimetype='application/pdf')
+
+
+def build_etag(*parts):
+    """Build an ETag from a list of values (mtimes, hashes, primary keys, content, ...)"""
+    return '"{}"'.format(hashlib.md5(u'|'.join([p.decode('utf-8') if isinstance(p, str) else unicode(p) for p in parts]).encode('utf-8')).hexdigest())
+
+
+def cached_response(request, response, etag=None, last_modified=None, max_age=0, public=False):
+    """Add validators (ETag, Last-Modified) and a Cache-Control header to a response, or replace it by a 304 if the client's copy is still valid.
+
+    response can be a callable, called only if the content is really needed. last_modified is a timestamp or a datetime."""
+
+    if isinstance(last_modified, datetime.datetime):
+        last_modified = calendar.timegm(last_modified.utctimetuple())
+
+    if last_modified is not None:
+        last_modified = int(last_modified)
+
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+
+    if etag and if_none_match:
+        not_modified = etag in [e.strip() for e in if_none_match.split(',')] or if_none_match.strip() == '*'
+    elif last_modified is not None and if_modified_since is not None:
+        not_modified = last_modified <= if_modified_since
+    else:
+        not_modified = False
+
+    if not_modified:
+        response = http.HttpResponseNotModified()
+    elif hasattr(response, '__call__'):
+        response = response()
+
+    if etag:
+        response['ETag'] = etag
+
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+
+    if public:
+        patch_cache_control(response, public=True, max_age=max_age)
+    else:
+        patch_cache_control(response, private=True, max_age=max_age)
 
-    return http.HttpResponse('Gremlins ate your pdf! %s' % cgi.escape(html))
+    return response
 
 
 def pad_image(image, **kwargs):
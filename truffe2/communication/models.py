@@ -280,8 +280,8 @@ class _DisplayReservation(GenericModel, GenericDelayValidable, GenericGroupsVali
 
     title = models.CharField(_('Titre'), max_length=255)
 
-    start_date = models.DateTimeField(_(u'Date de début'))
-    end_date = models.DateTimeField(_(u'Date de fin'))
+    start_date = models.DateTimeField(_(u'Date de début'), db_index=True)
+    end_date = models.DateTimeField(_(u'Date de fin'), db_index=True)
 
     reason = models.TextField(_(u'Raison'), help_text=_(u'Explique pourquoi tu as besoin (manifestation par ex.)'))
     remarks = models.TextField(_('Remarques'), blank=True, null=True)
@@ -353,6 +353,12 @@ class _DisplayReservation(GenericModel, GenericDelayValidable, GenericGroupsVali
         trans_sort = {'get_unit_name': 'unit__name', 'get_display_link': 'display__title'}
         not_sortable_columns = ['get_conflits_list', ]
 
+        @staticmethod
+        def prepare_list(objects):
+            from generic.availability import prefetch_overlaps
+            prefetch_overlaps(objects, 'display')
+            return objects
+
     class MetaEdit:
         datetime_fields = ('start_date', 'end_date')
 
@@ -406,10 +412,17 @@ class _DisplayReservation(GenericModel, GenericDelayValidable, GenericGroupsVali
 
         return tpl
 
+    def get_conflicting_reservations(self):
+        """Return the other reservations of the display at the same time (precomputed for lists, see prefetch_overlaps)"""
+
+        if hasattr(self, '_conflicting_reservations'):
+            return self._conflicting_reservations
+
+        return self.display.displayreservation_set.exclude(pk=self.pk).exclude(deleted=True).filter(status__in=['1_asking', '2_online'], end_date__gt=self.start_date, start_date__lt=self.end_date)
+
     def get_conflits(self):
 
-        liste = self.display.displayreservation_set.exclude(pk=self.pk).exclude(deleted=True).filter(
-            status__in=['1_asking', '2_online'], end_date__gt=self.start_date, start_date__lt=self.end_date)
+        liste = self.get_conflicting_reservations()
 
         if not liste:
             return mark_safe('<span class="txt-color-green"><i class="fa fa-check"></i> {}</span>'.format(_('Pas de conflits !')))
@@ -430,8 +443,7 @@ class _DisplayReservation(GenericModel, GenericDelayValidable, GenericGroupsVali
 
     def get_conflits_list(self):
 
-        liste = self.display.displayreservation_set.exclude(pk=self.pk).exclude(deleted=True).filter(
-            status__in=['1_asking', '2_online'], end_date__gt=self.start_date, start_date__lt=self.end_date)
+        liste = self.get_conflicting_reservations()
 
         if not liste:
             return '<span class="txt-color-green"><i class="fa fa-check"></i></span>'
@@ -12,4 +12,5 @@ urlpatterns = patterns(
     url(r'^logo_public_list$', 'logo_public_list'),
     url(r'^logo_public_load$', 'logo_public_load'),
     url('display/search', 'display_search'),
+    url('display/available', 'display_available'),
 )
@@ -3,13 +3,15 @@
 from django.shortcuts import get_object_or_404, render, redirect
 from django.http import Http404, HttpResponse, HttpResponseForbidden, HttpResponseNotFound
 from django.contrib.auth.decorators import login_required
+from django.conf import settings
+from django.core.cache import cache
 from django.utils.timezone import now
-from django.db.models import Q
+from django.db.models import Q, Max, Count
 from django.utils.html import strip_tags
 
 import json
 
-from app.utils import update_current_unit
+from app.utils import update_current_unit, build_etag, cached_response
 from generic.templatetags.generic_extras import html_check_and_safe
 
 def ecrans(request):
@@ -25,7 +27,8 @@ def random_slide(request):
 
     slide = AgepSlide.objects.filter(status='2_online').exclude(deleted=True).filter(Q(start_date=None) | Q(start_date__lt=now())).filter(Q(end_date=None) | Q(end_date__gt=now())).order_by('?').all()[0]
 
-    return HttpResponse(slide.picture.url)
+    # Screens poll often: if the same slide is picked, avoid to send it again. No max_age, to keep the rotation.
+    return cached_response(request, lambda: HttpResponse(slide.picture.url), etag=build_etag(slide.picture.url), public=True)
 
 
 def website_news(request):
@@ -37,9 +40,12 @@ def website_news(request):
 
     for news in WebsiteNews.objects.filter(status='2_online').exclude(deleted=True).filter(Q(start_date=None) | Q(start_date__lt=now())).filter(Q(end_date=None) | Q(end_date__gt=now())).order_by('?'):
         if not request.GET.get('only') or request.GET.get('only')[5:] == str(news.pk):
-            retour.append({'id': 'T2V1N{}'.format(news.pk), 'title_fr': news.title, 'title_en': news.title_en or news.title, 'content_fr': news.content, 'content_en': news.content_en or news.content, 'url': news.url, 'unit': news.unit.__unicode__(), 'date': str(news.start_date or news.last_log().when)})
+            retour.append({'id': 'T2V1N{}'.format(news.pk), 'title_fr': news.title, 'title_en': news.title_en or news.title, 'content_fr': news.content, 'content_en': news.content_en or news.content, 'url': news.url, 'unit': news.unit.__unicode__(), 'date': str(news.start_date or news.get_last_edit_date())})
 
-    return HttpResponse(json.dumps(retour), content_type='application/json')
+    # The order is random, the ETag only depends on the content
+    etag = build_etag(json.dumps(sorted(retour, key=lambda news: news['id'])))
+
+    return cached_response(request, lambda: HttpResponse(json.dumps(retour), content_type='application/json'), etag=etag, max_age=settings.PUBLIC_FEEDS_MAX_AGE, public=True)
 
 
 @login_required
@@ -60,13 +66,51 @@ def logo_public_load(request):
 
     unit = get_object_or_404(Unit, pk=request.GET.get('pk'))
 
-    logos = []
+    # Depends on logos (and their files, logged) and on the rights of the user
+    logos_state = unit.logo_set.filter(deleted=False).aggregate(Max('logs__when'), Count('pk'))
+    etag = build_etag(unit.pk, request.user.pk, cache.get('right~user_%s' % (request.user.pk,)), logos_state['logs__when__max'], logos_state['pk__count'])
+
+    def _render():
+        logos = []
+
+        for logo in unit.logo_set.filter(deleted=False):
+            if logo.files.count() and logo.rights_can('SHOW', request.user):
+                logos.append(logo)
+
+        return render(request, 'communication/logo_public_load.html', {'logos': logos, 'unit': unit})
+
+    return cached_response(request, _render, etag=etag)
+
+
+@login_required
+def display_available(request):
+    """Liste des affichages ayant des créneaux libres pendant une période"""
+
+    from communication.models import Display, DisplayReservation
+    from generic.availability import free_slots_response
+
+    q = request.GET.get('q')
+    unit_pk = request.GET.get('unit_pk', "-1") or "-1"
+
+    displays = Display.objects.filter(active=True, deleted=False).select_related('unit').order_by('title')
+
+    if q:
+        displays = displays.filter(title__icontains=q)
+
+    if unit_pk == "-1":
+        displays = displays.filter(allow_externals=True)
+    else:
+        from units.models import Unit
+        get_object_or_404(Unit, pk=unit_pk)
+
+        dummy = DisplayReservation()
+        update_current_unit(request, unit_pk)
+
+        if not dummy.rights_can('CREATE', request.user):
+            raise Http404
 
-    for logo in unit.logo_set.filter(deleted=False):
-        if logo.files.count() and logo.rights_can('SHOW', request.user):
-            logos.append(logo)
+    return free_slots_response(request, displays, DisplayReservation, 'display', lambda display: {'id': display.pk, 'text': display.title, 'unit': str(display.unit)})
 
-    return render(request, 'communication/logo_public_load.html', {'logos': logos, 'unit': unit})
 
 @login_required
 def display_search(request):
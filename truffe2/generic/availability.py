@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+from django.conf import settings
+from django.http import HttpResponse
+
+import datetime
+import json
+import pytz
+
+
+def busy_intervals(reservation_class, object_field, objects_pks, start_date, end_date, status=('1_asking', '2_online')):
+    """Return, for each object, the sorted and merged list of (start, end) periods reserved between start_date and end_date. Use one query for all objects."""
+
+    reservations = reservation_class.objects.filter(**{'{}__in'.format(object_field): objects_pks, 'deleted': False, 'status__in': status, 'end_date__gt': start_date, 'start_date__lt': end_date})
+
+    intervals = dict((pk, []) for pk in objects_pks)
+
+    for object_pk, reservation_start, reservation_end in reservations.values_list(object_field, 'start_date', 'end_date'):
+        intervals[object_pk].append((max(reservation_start, start_date), min(reservation_end, end_date)))
+
+    retour = {}
+
+    for object_pk, object_intervals in intervals.iteritems():
+        merged = []
+
+        for interval_start, interval_end in sorted(object_intervals):
+            if merged and interval_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], interval_end))
+            else:
+                merged.append((interval_start, interval_end))
+
+        retour[object_pk] = merged
+
+    return retour
+
+
+def free_slots(busy, start_date, end_date, duration):
+    """Return the list of (start, end) free periods of at least duration between start_date and end_date, busy being a sorted and merged list of periods. A null or negative duration gives no slot."""
+
+    if duration <= datetime.timedelta():
+        return []
+
+    slots = []
+    current = start_date
+
+    for busy_start, busy_end in busy + [(end_date, end_date)]:
+        if busy_start - current >= duration:
+            slots.append((current, busy_start))
+        current = max(current, busy_end)
+
+    return slots
+
+
+def search_free_slots(reservation_class, object_field, objects, start_date, end_date, duration, status=('1_asking', '2_online')):
+    """Return the list of (object, free slots) for objects with at least one free slot"""
+
+    objects = list(objects)
+
+    busy = busy_intervals(reservation_class, object_field, [obj.pk for obj in objects], start_date, end_date, status)
+
+    retour = []
+
+    for obj in objects:
+        slots = free_slots(busy[obj.pk], start_date, end_date, duration)
+
+        if slots:
+            retour.append((obj, slots))
+
+    return retour
+
+
+def free_slots_response(request, objects, reservation_class, object_field, describe):
+    """Return a json list of objects with free slots, for the window and duration (in minutes) given in the request"""
+
+    try:
+        start_date = pytz.timezone(settings.TIME_ZONE).localize(datetime.datetime.fromtimestamp(float(request.GET.get('start'))))
+        end_date = pytz.timezone(settings.TIME_ZONE).localize(datetime.datetime.fromtimestamp(float(request.GET.get('end'))))
+        duration = datetime.timedelta(minutes=int(request.GET.get('duration', 60)))
+    except (TypeError, ValueError):
+        return HttpResponse(json.dumps([]))
+
+    if duration <= datetime.timedelta() or end_date <= start_date or end_date - start_date > datetime.timedelta(days=settings.AVAILABILITY_MAX_DAYS):
+        return HttpResponse(json.dumps([]))
+
+    retour = []
+
+    for obj, slots in search_free_slots(reservation_class, object_field, objects, start_date, end_date, duration):
+        data = describe(obj)
+        data['slots'] = [{'start': str(slot_start), 'end': str(slot_end)} for (slot_start, slot_end) in slots]
+        retour.append(data)
+
+    return HttpResponse(json.dumps(retour))
+
+
+def prefetch_overlaps(reservations, object_field, status=('1_asking', '2_online')):
+    """Compute the other reservations overlapping each reservation of a list (for lists), with one query. The result is used by get_conflicting_reservations."""
+
+    reservations = [reservation for reservation in reservations if reservation.pk]
+
+    if not reservations:
+        return
+
+    reservation_class = reservations[0].__class__
+    object_attname = '{}_id'.format(object_field)
+
+    others = reservation_class.objects.filter(**{'{}__in'.format(object_field): set([getattr(r, object_attname) for r in reservations]), 'deleted': False, 'status__in': status, 'end_date__gt': min([r.start_date for r in reservations]), 'start_date__lt': max([r.end_date for r in reservations])}).select_related('unit')
+
+    others = list(others)
+
+    for reservation in reservations:
+        reservation._conflicting_reservations = [other for other in others if getattr(other, object_attname) == getattr(reservation, object_attname) and other.pk != reservation.pk and other.end_date > reservation.start_date and other.start_date < reservation.end_date]
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.http import Http404
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+import datetime
+import inspect
+import pytz
+import time
+
+
+def _calendar_model_name(model_class):
+    return '%s.%s' % (inspect.getmodule(model_class).__name__, model_class.__name__)
+
+
+def calendar_expire(model_class):
+    """Mark the cached calendars of the model as invalid"""
+    cache.set('calendar~last_%s' % (_calendar_model_name(model_class),), time.time())
+
+
+def calendar_expire_for(obj):
+    """Mark as invalid the cached calendars showing the object: its own calendar and the calendars of reservations linked to it (rooms, displays, ...)"""
+
+    from generic.models import GENERICS_MODELS, GenericStateUnitValidable
+
+    if hasattr(obj, 'MetaData') and hasattr(obj.MetaData, 'menu_id_calendar'):
+        calendar_expire(obj.__class__)
+
+    linked_model = _calendar_model_name(obj.__class__)
+
+    for model_class, __ in GENERICS_MODELS.values():
+        if issubclass(model_class, GenericStateUnitValidable) and model_class.MetaState.linked_model == linked_model:
+            calendar_expire(model_class)
+
+
+def calendar_weeks(start, end):
+    """Return the list of mondays of the weeks covering the period"""
+
+    monday = start.date() - datetime.timedelta(days=start.weekday())
+    weeks = []
+
+    while monday <= end.date():
+        weeks.append(monday)
+        monday += datetime.timedelta(days=7)
+
+    return weeks
+
+
+def calendar_event(reservation):
+    """Return the data of a reservation needed by calendars, common to all users"""
+
+    if reservation.unit:
+        par = reservation.unit.name
+    else:
+        par = u'%s (%s)' % (reservation.unit_blank_name, reservation.unit_blank_user)
+
+    if hasattr(reservation, 'get_linked_object'):
+        linked_objects = reservation.get_linked_object()
+
+        if not isinstance(linked_objects, list):
+            linked_objects = [linked_objects]
+
+        linked = [(linked_object.pk, linked_object.__unicode__(), u'{}'.format(linked_object.unit)) for linked_object in linked_objects]
+    else:
+        linked = None
+
+    return {'pk': reservation.pk, 'status': reservation.status, 'start_date': reservation.start_date, 'end_date': reservation.end_date, 'last_activity': reservation.last_activity, 'description': str(reservation), 'par': par, 'linked': linked}
+
+
+def calendar_events(model_class, scope, queryset, start, end):
+    """Return the list of events (see calendar_event) for reservations of the queryset in the period.
+
+    Results are cached per week and per scope (a string identifying the queryset, like the view and the unit or the object) until a reservation of the model, or an object linked to them, is saved (see calendar_expire_for)."""
+
+    tz = pytz.timezone(settings.TIME_ZONE)
+    model_name = _calendar_model_name(model_class)
+
+    cache_key_last = 'calendar~last_%s' % (model_name,)
+    cached_last = cache.get(cache_key_last)
+
+    if cached_last is None:
+        cached_last = time.time()
+        cache.set(cache_key_last, cached_last)
+
+    weeks = calendar_weeks(start, end)
+    cache_keys = dict((week, 'calendar_%s_%s_%s' % (model_name, scope, week.isoformat())) for week in weeks)
+
+    cached_values = cache.get_many(cache_keys.values())
+
+    buckets = {}
+
+    for week, cache_key in cache_keys.iteritems():
+        if cache_key in cached_values and cached_values[cache_key][0] >= cached_last and not settings.DEBUG:
+            buckets[week] = cached_values[cache_key][1]
+
+    missing = [week for week in weeks if week not in buckets]
+
+    if missing:
+        current_time = time.time()
+
+        week_start = lambda week: tz.localize(datetime.datetime.combine(week, datetime.time()))
+        week_end = lambda week: week_start(week + datetime.timedelta(days=7))
+
+        events = [calendar_event(reservation) for reservation in calendar_queryset(model_class, queryset).filter(end_date__gte=week_start(missing[0]), start_date__lt=week_end(missing[-1]))]
+
+        to_cache = {}
+
+        for week in missing:
+            buckets[week] = [event for event in events if event['end_date'] >= week_start(week) and event['start_date'] < week_end(week)]
+            to_cache[cache_keys[week]] = (current_time, buckets[week])
+
+        cache.set_many(to_cache, 3600)
+
+    retour = []
+    already_added = set()
+
+    for week in weeks:
+        for event in buckets[week]:
+            if event['pk'] not in already_added and event['end_date'] >= start and event['start_date'] <= end:
+                already_added.add(event['pk'])
+                retour.append(event)
+
+    return retour
+
+
+def calendar_queryset(model_class, queryset):
+    """Load, with the reservations, the objects used by calendar_event"""
+
+    from generic.models import GenericExternalUnitAllowed, GenericModelWithLines, GenericStateUnitValidable
+
+    select_related = ['unit']
+
+    if issubclass(model_class, GenericExternalUnitAllowed):
+        select_related.append('unit_blank_user')
+
+    if issubclass(model_class, GenericStateUnitValidable):
+        linked_path = '__'.join((getattr(model_class.MetaState, 'filter_unit_field', None) or model_class.MetaState.unit_field).split('.')[:-1] + ['unit'])
+
+        if issubclass(model_class, GenericModelWithLines):
+            queryset = queryset.prefetch_related(linked_path)
+        else:
+            select_related.append(linked_path)
+
+    return queryset.select_related(*select_related)
+
+
+def calendar_feed(model_class, scope, queryset, start, end, user):
+    """Return the list of events (see calendar_event) for reservations of the queryset in the period, with the url of the reservation if the user can see it"""
+
+    events = calendar_events(model_class, scope, queryset, start, end)
+
+    if user.is_superuser:
+        allowed = set([event['pk'] for event in events])
+    elif events:
+        reservations = calendar_queryset(model_class, model_class.objects.filter(pk__in=[event['pk'] for event in events]))
+        allowed = set([reservation.pk for reservation in model_class.rights_can_many('SHOW', user, reservations)])
+    else:
+        allowed = set()
+
+    show_view = str(model_class._show_view)
+
+    retour = []
+
+    for event in events:
+        event = dict(event)
+        event['url'] = reverse(show_view, args=(event['pk'],)) if event['pk'] in allowed else ''
+        retour.append(event)
+
+    return retour
+
+
+def calendar_json_event(event, title, **kwargs):
+    """Return the event in the format used by the calendar"""
+
+    if event['status'] == '1_asking':
+        icon = 'fa-question'
+        className = ["event", "bg-color-redLight"]
+    else:
+        icon = 'fa-check'
+        className = ["event", "bg-color-greenLight"]
+
+    retour = {'title': title, 'start': str(event['start_date']), 'end': str(event['end_date']), 'className': className, 'icon': icon, 'url': event['url'], 'allDay': False, 'description': event['description']}
+    retour.update(kwargs)
+
+    return retour
+
+
+def _ics_escape(value):
+    return value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n')
+
+
+def _ics_date(date):
+    return date.astimezone(pytz.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def calendar_ics_token(model_class, scope, user_pk):
+    """Return the secret token of the iCalendar feed of the scope (see calendar_events) for the user. Calendar clients cannot log in: the token, in the url, identifies the user."""
+    return salted_hmac('generic.calendar_feed.calendar_ics', u'ics|{}|{}|{}'.format(user_pk, _calendar_model_name(model_class), scope)).hexdigest()
+
+
+def calendar_ics_user(model_class, scope, user_pk, token):
+    """Return the user of a token (see calendar_ics_token). Raise Http404 if the token is invalid or the user inactive."""
+
+    from users.models import TruffeUser
+
+    if not constant_time_compare(calendar_ics_token(model_class, scope, user_pk), token):
+        raise Http404
+
+    try:
+        return TruffeUser.objects.get(pk=user_pk, is_active=True)
+    except TruffeUser.DoesNotExist:
+        raise Http404
+
+
+def calendar_ics(model_class, name, events, title_function):
+    """Return an iCalendar file with the events (see calendar_feed). The content only depends on the events, to be usable as an ETag."""
+
+    lines = [
+        u'BEGIN:VCALENDAR',
+        u'VERSION:2.0',
+        u'PRODID:-//AGEPoly//Truffe2//FR',
+        u'CALSCALE:GREGORIAN',
+        u'X-WR-CALNAME:{}'.format(_ics_escape(name)),
+    ]
+
+    for event in events:
+        lines += [
+            u'BEGIN:VEVENT',
+            u'UID:{}-{}@truffe2'.format(_calendar_model_name(model_class), event['pk']),
+            u'DTSTAMP:{}'.format(_ics_date(event['last_activity'] or event['start_date'])),
+            u'DTSTART:{}'.format(_ics_date(event['start_date'])),
+            u'DTEND:{}'.format(_ics_date(event['end_date'])),
+            u'SUMMARY:{}'.format(_ics_escape(title_function(event))),
+            u'STATUS:{}'.format('TENTATIVE' if event['status'] == '1_asking' else 'CONFIRMED'),
+            u'END:VEVENT',
+        ]
+
+    lines.append(u'END:VCALENDAR')
+
+    return u'\r\n'.join(lines) + u'\r\n'
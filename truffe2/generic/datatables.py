@@ -118,7 +118,12 @@ def generic_list_json(request, model, columns, templates, bonus_data={}, check_d
     qs = do_ordering(qs)
     qs = do_paging(qs)
 
-    data = {'iTotalRecords': total_records, 'iTotalDisplayRecords': total_display_records, 'sEcho': int(request.REQUEST.get('sEcho', 0)), 'list': qs.all()}
+    if hasattr(model, 'MetaData') and hasattr(model.MetaData, 'prepare_list'):
+        object_list = model.MetaData.prepare_list(list(qs))
+    else:
+        object_list = qs.all()
+
+    data = {'iTotalRecords': total_records, 'iTotalDisplayRecords': total_display_records, 'sEcho': int(request.REQUEST.get('sEcho', 0)), 'list': object_list}
     data.update(bonus_data)
 
     rep = render(request, templates, data, content_type='application/json')
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+
+from django.core.management.base import BaseCommand
+
+
+from generic.pdfjobs import clean_pdf_jobs
+
+
+class Command(BaseCommand):
+    help = 'Remove expired PDF generated in the background'
+
+    def handle(self, *args, **options):
+
+        removed = clean_pdf_jobs()
+
+        print "{} file(s) removed".format(removed)
@@ -3,6 +3,7 @@
 from django.db import models
 from django.conf import settings
 from django.conf.urls import patterns, url
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.contrib.contenttypes.models import ContentType
 from django.forms import CharField, Textarea, Form
@@ -13,6 +14,7 @@ import json
 import copy
 import inspect
 import importlib
+import logging
 import os
 from pytz import timezone
 from datetime import timedelta
@@ -20,6 +22,8 @@ import mimetypes
 from haystack import indexes
 import textract
 from celery_haystack.indexes import CelerySearchIndex
+from easy_thumbnails.files import get_thumbnailer
+from wand.image import Image as WandImage
 
 from users.models import TruffeUser
 from generic import views
@@ -95,6 +99,12 @@ class GenericModel(models.Model):
     """Un modele generic pour truffe"""
 
     deleted = models.BooleanField(default=False)
+    last_activity = models.DateTimeField(blank=True, null=True, db_index=True)
+    creator = models.ForeignKey(TruffeUser, blank=True, null=True, related_name='+', on_delete=models.SET_NULL)
+    created_at = models.DateTimeField(blank=True, null=True, db_index=True)
+
+    # Fields maintained by logs, not editable and not part of diffs
+    tracking_fields = ('last_activity', 'creator', 'created_at')
 
     @staticmethod
     def startup():
@@ -135,9 +145,11 @@ class GenericModel(models.Model):
             views_class = type('%sViews' % (real_model_class.__name__,), (GenericObjectView,), {'object': models.ForeignKey(real_model_class, related_name='views'), '__module__': models_module.__name__})
             setattr(models_module, views_class.__name__, views_class)
             setattr(real_model_class, "_t2_views_class", views_class)
+            setattr(real_model_class, "_t2_logging_class", logging_class)
 
             unikey = '{}.{}'.format(models_module.__name__, real_model_class.__name__)
             GENERICS_MODELS[unikey] = (real_model_class, logging_class)
+            setattr(logging_class, "_t2_model_key", unikey)
 
             # Add the file model (if needed)
             if issubclass(model_class, GenericModelWithFiles):
@@ -163,15 +175,15 @@ class GenericModel(models.Model):
             def generate_meta(Model):
                 class Meta():
                     model = Model
-                    exclude = ('deleted', 'status', 'accounting_year')
+                    exclude = ('deleted', 'status', 'accounting_year') + GenericModel.tracking_fields
 
                 class MetaNoUnit():
                     model = Model
-                    exclude = ('deleted', 'status', 'accounting_year', 'unit')
+                    exclude = ('deleted', 'status', 'accounting_year', 'unit') + GenericModel.tracking_fields
 
                 class MetaNoUnitExternal():
                     model = Model
-                    exclude = ('deleted', 'status', 'accounting_year', 'unit', 'unit_blank_user')
+                    exclude = ('deleted', 'status', 'accounting_year', 'unit', 'unit_blank_user') + GenericModel.tracking_fields
 
                 if hasattr(model_class.MetaData, 'has_unit') and model_class.MetaData.has_unit:
                     if issubclass(model_class, GenericExternalUnitAllowed):
@@ -242,6 +254,7 @@ class GenericModel(models.Model):
                 setattr(views_module, '%s_list_related_json' % (base_views_name,), views.generate_list_related_json(module, base_views_name, real_model_class))
                 setattr(views_module, '%s_calendar_specific' % (base_views_name,), views.generate_calendar_specific(module, base_views_name, real_model_class))
                 setattr(views_module, '%s_calendar_specific_json' % (base_views_name,), views.generate_calendar_specific_json(module, base_views_name, real_model_class))
+                setattr(views_module, '%s_calendar_specific_ics' % (base_views_name,), views.generate_calendar_specific_ics(module, base_views_name, real_model_class))
                 setattr(views_module, '%s_directory' % (base_views_name,), views.generate_directory(module, base_views_name, real_model_class))
 
                 urls_module.urlpatterns += patterns(views_module.__name__,
@@ -250,6 +263,7 @@ class GenericModel(models.Model):
 
                     url(r'^%s/specific/(?P<pk>[0-9~]+)/calendar/$' % (base_views_name,), '%s_calendar_specific' % (base_views_name,)),
                     url(r'^%s/specific/(?P<pk>[0-9~]+)/calendar/json$' % (base_views_name,), '%s_calendar_specific_json' % (base_views_name,)),
+                    url(r'^%s/specific/(?P<pk>[0-9]+)/calendar/ics/(?P<user_pk>[0-9]+)/(?P<token>[0-9a-f]+)$' % (base_views_name,), '%s_calendar_specific_ics' % (base_views_name,)),
                     url(r'^%s/directory/$' % (base_views_name,), '%s_directory' % (base_views_name,)),
                 )
 
@@ -290,37 +304,85 @@ class GenericModel(models.Model):
                 index = index_generator(real_model_class)
                 setattr(search_indexes_module, index.__name__, index)
 
-    def build_state(self):
-        """Return the current state of the object. Used for diffs."""
-        retour = {}
+    def _state_fields(self):
         opts = self._meta
-        for f in sorted(opts.fields + opts.many_to_many):
-            if isinstance(f, models.DateTimeField):
-                if not getattr(self, f.name):
-                    retour[f.name] = None
-                else:
-                    loc = getattr(self, f.name).astimezone(timezone(settings.TIME_ZONE))
-                    retour[f.name] = loc.strftime("%Y-%m-%d %H:%M:%S")
-            elif isinstance(f, models.ManyToManyField):
-                retour[f.name] = u', '.join([unicode(x) for x in getattr(self, f.name).all()])
+        return [f for f in sorted(opts.fields + opts.many_to_many) if f.name not in GenericModel.tracking_fields]
+
+    def _state_display(self, f, value):
+        """Return the value of a field displayed in diffs, from its raw value (see build_raw_state)"""
+        if isinstance(f, models.DateTimeField):
+            if not value:
+                return None
+            loc = value.astimezone(timezone(settings.TIME_ZONE))
+            return loc.strftime("%Y-%m-%d %H:%M:%S")
+        elif isinstance(f, models.ManyToManyField):
+            return u', '.join([unicode(x) for x in f.rel.to._default_manager.filter(pk__in=value)])
+        elif isinstance(f, models.ForeignKey):
+            if value is not None and value == getattr(self, f.attname):
+                return unicode(getattr(self, f.name))
+            elif value is not None:
+                return unicode(f.rel.to._default_manager.filter(**{f.rel.field_name: value}).first())
+            return unicode(None)
+        else:
+            return unicode(value)
 
+    def build_raw_state(self):
+        """Return the raw values of fields (foreign keys ids, sets of many to many ids), without loading related objects. Used for diffs."""
+        retour = {}
+        for f in self._state_fields():
+            if isinstance(f, models.ManyToManyField):
+                retour[f.name] = frozenset(getattr(self, f.name).values_list('pk', flat=True)) if self.pk else frozenset()
             else:
-                retour[f.name] = unicode(getattr(self, f.name))
+                retour[f.name] = copy.copy(getattr(self, f.attname))
 
         return retour
 
+    def build_state(self):
+        """Return the current state of the object. Used for diffs."""
+        raw_state = self.build_raw_state()
+        return dict((f.name, self._state_display(f, raw_state[f.name])) for f in self._state_fields())
+
+    def build_state_diff(self, raw_before):
+        """Return the states (before, after) of fields changed since raw_before (see build_raw_state). Only changed fields are displayed."""
+        raw_after = self.build_raw_state()
+
+        before = {}
+        after = {}
+
+        for f in self._state_fields():
+            if f.name in raw_before and raw_before[f.name] != raw_after[f.name]:
+                before[f.name] = self._state_display(f, raw_before[f.name])
+                after[f.name] = self._state_display(f, raw_after[f.name])
+
+        return (before, after)
+
     def last_log(self):
         """Return the last log entry"""
         return self.logs.order_by('-when').first()
 
     def get_creator(self):
-        """Return the creator (based on logs)"""
+        """Return the creator (stored on the model, based on logs for old objects)"""
+        if self.creator_id:
+            return self.creator
         return getattr(self.logs.filter(what='created').first(), 'who', None)
 
     def get_creation_date(self):
-        """Return the creation date (based on logs)"""
+        """Return the creation date (stored on the model, based on logs for old objects)"""
+        if self.created_at:
+            return self.created_at
         return getattr(self.logs.filter(what='created').first(), 'when', None)
 
+    def reset_tracking_fields(self):
+        """Clear the fields maintained by logs (eg. before saving a copy)"""
+        for field in GenericModel.tracking_fields:
+            setattr(self, field, None)
+
+    def get_last_edit_date(self):
+        """Return the date of the last log entry"""
+        if self.last_activity:
+            return self.last_activity
+        return getattr(self.last_log(), 'when', None)
+
     def display_url(self):
         return reverse(str(self.__class__._show_view), args=(self.pk,))
 
@@ -333,17 +395,59 @@ class GenericModel(models.Model):
     def is_new(self, user):
         """Return true is the model has unseen updates for a user"""
 
-        try:
-            view_obj = self.views.get(who=user)
-            return view_obj.when <= self.last_log().when
-        except self._t2_views_class.DoesNotExist:
-            return True
+        if not hasattr(self, '_t2_unseen') or user.pk not in self._t2_unseen:
+            GenericModel.prefetch_unseen([self], user)
+
+        return self._t2_unseen[user.pk]
+
+    @staticmethod
+    def prefetch_unseen(objects, user):
+        """Compute the unseen state of a list of objects for a user, with grouped queries per model. Return the objects as a list."""
+
+        from django.db.models import Max
+
+        objects = list(objects)
+
+        objects_per_class = {}
+
+        for obj in objects:
+            if isinstance(obj, GenericModel):
+                objects_per_class.setdefault(obj.__class__, []).append(obj)
+
+        for model_class, class_objects in objects_per_class.iteritems():
+
+            pks = [obj.pk for obj in class_objects]
+
+            seen = dict(model_class._t2_views_class.objects.filter(who=user, object__in=pks).values_list('object').annotate(Max('when')))
+
+            # Objects not updated since last_activity exists: fall back on logs
+            without_activity = [obj.pk for obj in class_objects if not obj.last_activity]
+
+            if without_activity:
+                last_logs = dict(model_class._t2_logging_class.objects.filter(object__in=without_activity).values_list('object').annotate(Max('when')))
+            else:
+                last_logs = {}
+
+            for obj in class_objects:
+                if not hasattr(obj, '_t2_unseen'):
+                    obj._t2_unseen = {}
+
+                last_activity = obj.last_activity or last_logs.get(obj.pk)
+
+                if obj.pk not in seen:
+                    obj._t2_unseen[user.pk] = True
+                else:
+                    obj._t2_unseen[user.pk] = bool(last_activity) and seen[obj.pk] <= last_activity
+
+        return objects
 
     def user_has_seen_object(self, user):
 
-        view_obj, __ = self._t2_views_class.objects.get_or_create(object=self, who=user)
-        view_obj.when = now()
-        view_obj.save()
+        if not self._t2_views_class.objects.filter(object=self, who=user).update(when=now()):
+            self._t2_views_class(object=self, who=user).save()
+
+        if hasattr(self, '_t2_unseen'):
+            self._t2_unseen[user.pk] = False
 
 
 class GenericModelWithFiles(object):
@@ -388,10 +492,68 @@ class GenericFile(models.Model):
 
         return type == 'application/pdf'
 
+    def get_pdf_preview_path(self):
+        """Return the path (relative to MEDIA_ROOT) of the raster of the first page of the pdf"""
+        return os.path.join('cache', 'pdfthumbnail', "{}.jpg".format(self.file.name.replace('/', '_')))
+
+    def get_thumbnail_source(self):
+        """Return the path (relative to MEDIA_ROOT) of the image used for thumbnails, or None if not generated yet"""
+
+        if self.is_picture():
+            return self.file.name
+        elif self.is_pdf():
+            if os.path.isfile(os.path.join(settings.MEDIA_ROOT, self.get_pdf_preview_path())):
+                return self.get_pdf_preview_path()
+            return None
+
+        return 'img/File.png'
+
+    def get_thumbnail_placeholder(self):
+        """Return the image displayed while thumbnails are generated"""
+        return 'img/PDF.png' if self.is_pdf() else 'img/File.png'
+
+    def generate_thumbnails(self):
+        """Render the first page of pdfs and thumbnails in all standard sizes. Slow, called in background after upload."""
+
+        if self.is_pdf():
+            try:
+                with WandImage(filename="{}{}[0]".format(settings.MEDIA_ROOT, self.file)) as img:
+                    img.save(filename=os.path.join(settings.MEDIA_ROOT, self.get_pdf_preview_path()))
+            except Exception as e:
+                logger = logging.getLogger(__name__)
+                logger.warning("Cannot render the preview of %s: %s", self.file.name, e)
+
+                # The placeholder will be used, without trying again on each display (see schedule_thumbnails)
+                cache.set(self._thumbnails_cache_key('failed'), True, settings.THUMBNAILS_FAILED_TIMEOUT)
+                return
+
+        thumbnailer = get_thumbnailer(self.get_thumbnail_source())
+
+        for size in settings.THUMBNAIL_STANDARD_SIZES:
+            thumbnailer.get_thumbnail(get_thumbnail_options(size))
+
+    def _thumbnails_cache_key(self, kind):
+        return 'thumbnails~{}_{}.{}_{}'.format(kind, self.__class__.__module__, self.__class__.__name__, self.pk)
+
+    def schedule_thumbnails(self):
+        """Ask a worker to generate thumbnails, if not already asked recently and if the last try didn't fail"""
+
+        from generic.tasks import generate_file_thumbnails
+
+        if cache.get(self._thumbnails_cache_key('failed')):
+            return
+
+        if cache.add(self._thumbnails_cache_key('queued'), True, 3600):
+            generate_file_thumbnails.delay('{}.{}'.format(self.__class__.__module__, self.__class__.__name__), self.pk)
+
     class Meta:
         abstract = True
 
 
+def get_thumbnail_options(size):
+    return {'size': size, 'crop': True, 'upscale': True}
+
+
 class GenericStateModel(object):
     """Un modele generic avec une notion de statut"""
 
@@ -487,6 +649,42 @@ class GenericLogEntry(models.Model):
     def json_extra_data(self):
         return json.loads(self.extra_data)
 
+    def save(self, *args, **kwargs):
+        """Save the entry and record the activity on the object. With expire_caches=False, caches showing the object are not expired: the caller must call expire_caches once its transaction is committed."""
+
+        expire_caches = kwargs.pop('expire_caches', True)
+
+        is_new = not self.pk
+
+        super(GenericLogEntry, self).save(*args, **kwargs)
+
+        if is_new:
+            from main.models import ActivityEntry
+            ActivityEntry.record(self)
+
+            updates = {'last_activity': self.when}
+
+            if self.what == 'created' and not self.object.creator_id:
+                updates.update({'creator': self.who, 'created_at': self.when})
+
+            self.object.__class__.objects.filter(pk=self.object_id).update(**updates)
+
+            for key, value in updates.iteritems():
+                setattr(self.object, key, value)
+
+            if expire_caches:
+                self.expire_caches()
+
+    def expire_caches(self):
+        """Mark as invalid the caches showing the object of the entry"""
+
+        if self.what in ('created', 'restored'):
+            # The object is a new candidate for the cached sets of objects (see rights_objects_with)
+            self.object.__class__.rights_expire_model()
+
+        from generic.calendar_feed import calendar_expire_for
+        calendar_expire_for(self.object)
+
     class Meta:
         abstract = True
 
@@ -1252,7 +1450,7 @@ def index_generator(model_class):
 
         def prepare_last_edit_date(self, obj):
             try:
-                return obj.last_log().when
+                return obj.get_last_edit_date() or now()
             except:
                 if hasattr(obj.MetaSearch, 'last_edit_date_field'):
                     return get_property(obj, obj.MetaSearch.last_edit_date_field)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import render
+
+import hashlib
+import importlib
+import json
+import os
+import time
+import uuid
+
+
+def pdf_job_path(job_id):
+    """Return the path of the rendered file of a job"""
+    return os.path.join(settings.MEDIA_ROOT, 'cache', 'pdfjobs', '{}.pdf'.format(job_id))
+
+
+def get_pdf_job(job_id):
+    """Return the state of a job, or None if the job doesn't exist (or expired)"""
+    return cache.get('pdfjob_{}'.format(job_id))
+
+
+def set_pdf_job(job_id, job):
+    cache.set('pdfjob_{}'.format(job_id), job, settings.PDF_JOBS_TIMEOUT)
+
+
+def load_pdf_builder(builder):
+    """Return the builder function from his dotted path"""
+    return getattr(importlib.import_module('.'.join(builder.split('.')[:-1])), builder.split('.')[-1])
+
+
+def start_pdf_job(request, builder, filename, **kwargs):
+    """Enqueue the rendering of a PDF and return the page waiting for it.
+
+    builder is the dotted path of a function (user, **kwargs) returning (template, contexte, extra_pdf_files). kwargs must be json serializable.
+    If the same user asked for the same PDF a few moments ago (PDF_JOBS_REUSE_TIMEOUT), the existing job is reused."""
+
+    from generic.tasks import render_pdf_job
+
+    dedup_key = 'pdfjob~{}'.format(hashlib.sha1(json.dumps([builder, kwargs, request.user.pk], sort_keys=True)).hexdigest())
+
+    job_id = cache.get(dedup_key)
+    job = get_pdf_job(job_id) if job_id else None
+
+    if not job or job['status'] == 'error' or (job['status'] == 'done' and not os.path.isfile(pdf_job_path(job_id))):
+        job_id = str(uuid.uuid4())
+
+        set_pdf_job(job_id, {'status': 'pending', 'user_pk': request.user.pk, 'filename': filename, 'error': None, 'created': time.time()})
+        cache.set(dedup_key, job_id, settings.PDF_JOBS_REUSE_TIMEOUT)
+
+        render_pdf_job.delay(job_id, builder, request.user.pk, kwargs)
+
+    return render(request, 'generic/pdfjob/wait.html', {'job_id': job_id, 'filename': filename})
+
+
+def clean_pdf_jobs():
+    """Remove rendered files older than the jobs timeout. Return the number of removed files"""
+
+    folder = os.path.dirname(pdf_job_path('_'))
+    limit = time.time() - settings.PDF_JOBS_TIMEOUT
+
+    removed = 0
+
+    for filename in os.listdir(folder):
+        full_path = os.path.join(folder, filename)
+
+        if filename.startswith('.') or not os.path.isfile(full_path):
+            continue
+
+        if os.path.getmtime(full_path) < limit:
+            os.unlink(full_path)
+            removed += 1
+
+    return removed
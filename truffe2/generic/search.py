@@ -7,3 +7,16 @@ class SearchableModel(object):
         fields = []
         index_files = False
         linked_lines = None
+
+
+def update_search_index(model_class, pks):
+    """Update the search index of objects saved without save() (eg. with bulk_create or update()), like the signal processor does on post_save.
+
+    Call it once the transaction is committed: the index (or its celery task) reads the objects from the database."""
+
+    import haystack
+
+    handle_save = getattr(haystack.signal_processor, 'enqueue_save', haystack.signal_processor.handle_save)
+
+    for obj in model_class.objects.filter(pk__in=list(pks)):
+        handle_save(model_class, obj)
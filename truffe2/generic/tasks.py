@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+from celery import shared_task
+
+import importlib
+import os
+import traceback
+
+
+@shared_task
+def render_pdf_job(job_id, builder, user_pk, kwargs):
+    """Render a PDF asked with generic.pdfjobs.start_pdf_job"""
+
+    from app.utils import render_pdf, PdfAppendError
+    from generic.pdfjobs import get_pdf_job, set_pdf_job, pdf_job_path, load_pdf_builder
+    from users.models import TruffeUser
+
+    job = get_pdf_job(job_id)
+
+    if not job:  # Expired before we got the chance to run it
+        return
+
+    job['status'] = 'running'
+    set_pdf_job(job_id, job)
+
+    try:
+        user = TruffeUser.objects.get(pk=user_pk)
+
+        template, contexte, extra_pdf_files = load_pdf_builder(builder)(user, **kwargs)
+
+        data = render_pdf(template, contexte, user, extra_pdf_files)
+
+        # Write in a temporary file first, to never serve a partial pdf
+        path = pdf_job_path(job_id)
+
+        with open('{}.tmp'.format(path), 'wb') as f:
+            f.write(data)
+
+        os.rename('{}.tmp'.format(path), path)
+
+        job['status'] = 'done'
+
+    except PdfAppendError as e:
+        job['status'] = 'error'
+        job['error'] = {'pdf': os.path.basename(getattr(e.pdf_file, 'name', '') or ''), 'error': e.error}
+
+    except Exception:
+        job['status'] = 'error'
+        job['error'] = {'pdf': None, 'error': traceback.format_exc()}
+
+    set_pdf_job(job_id, job)
+
+
+@shared_task
+def generate_file_thumbnails(file_class, pk):
+    """Generate previews and thumbnails of an uploaded GenericFile"""
+
+    file_class = getattr(importlib.import_module('.'.join(file_class.split('.')[:-1])), file_class.split('.')[-1])
+
+    try:
+        instance = file_class.objects.get(pk=pk)
+    except file_class.DoesNotExist:
+        return
+
+    instance.generate_thumbnails()
@@ -8,4 +8,7 @@ urlpatterns = patterns(
 
     url('check_unit_name', 'check_unit_name'),
 
+    url(r'^pdfjob/(?P<job_id>[0-9a-f\-]+)/status$', 'pdfjob_status'),
+    url(r'^pdfjob/(?P<job_id>[0-9a-f\-]+)/download$', 'pdfjob_download'),
+
 )
@@ -10,7 +10,8 @@ from django.contrib.contenttypes.models import ContentType
 from django.http import HttpResponseRedirect
 from django.core.urlresolvers import reverse
 from django.utils.translation import ugettext_lazy as _
-from django.db.models import Max, Q
+from django.db import transaction
+from django.db.models import Q
 
 
 from easy_thumbnails.files import get_thumbnailer
@@ -25,13 +26,14 @@ import importlib
 import copy
 import inspect
 import urllib
-from wand.image import Image
 
 
 from accounting_core.utils import CostCenterLinked
+from generic.calendar_feed import calendar_feed, calendar_events, calendar_json_event, calendar_ics, calendar_ics_token, calendar_ics_user
 from generic.datatables import generic_list_json
 from generic.forms import ContactForm
-from app.utils import update_current_unit, get_current_unit, update_current_year, get_current_year, send_templated_mail, has_property, set_property
+from generic.search import update_search_index
+from app.utils import update_current_unit, get_current_unit, update_current_year, get_current_year, send_templated_mail, has_property, set_property, build_etag, cached_response
 from rights.utils import BasicRightModel
 
 
@@ -152,6 +154,7 @@ def generate_generic_list(module, base_name, model_class, json_view_suffix, righ
             'unit_mode': unit_mode, 'main_unit': main_unit, 'unit_blank': unit_blank, 'allow_all_units': allow_all_units_,
             'year_mode': year_mode, 'years_available': AccountingYear.build_year_menu('LIST', request.user),
             'moderables': moderables, 'object_filter': objects, 'tag_mode': tag_class is not None, 'tag': request.GET.get('tag', ''),
+            'logs_allowed': request.user.is_superuser or (hasattr(model_class, 'static_rights_can') and model_class.static_rights_can('DISPLAY_LOG', request.user, current_unit, current_year)),
         }
 
         data.update(extra_data)
@@ -381,7 +384,7 @@ def generate_edit(module, base_name, model_class, form_class, log_class, file_cl
                 # this page without using a create button (who switched the
                 # unit)
                 from units.models import Unit
-                for test_unit in Unit.objects.order_by('?'):
+                for test_unit in Unit.rights_candidates_for(request.user):
 
                     if has_property(obj, obj.MetaRights.linked_unit_property):
                         set_property(obj, obj.MetaRights.linked_unit_property, test_unit)
@@ -406,14 +409,16 @@ def generate_edit(module, base_name, model_class, form_class, log_class, file_cl
 
             main_unit = Unit.objects.get(pk=settings.ROOT_UNIT_PK)
 
-            main_unit.set_rights_can_select(lambda unit: model_class.static_rights_can('CREATE', request.user, unit, current_year))
-            main_unit.set_rights_can_edit(lambda unit: model_class.static_rights_can('CREATE', request.user, unit, current_year))
+            units_with_create = set([unit.pk for unit in model_class.rights_units_with('CREATE', request.user, current_year)])
+
+            main_unit.set_rights_can_select(lambda unit: unit.pk in units_with_create)
+            main_unit.set_rights_can_edit(lambda unit: unit.pk in units_with_create)
             main_unit.check_if_can_use_hidden(request.user)
         else:
             main_unit = None
 
         if obj.pk:
-            before_data = obj.build_state()
+            before_data = obj.build_raw_state()
         else:
             before_data = None
 
@@ -458,24 +463,33 @@ def generate_edit(module, base_name, model_class, form_class, log_class, file_cl
 
             for line_data in lines_objects:
 
-                for submited_id in request.POST.getlist('_LINES_LIST_%s[]' % (line_data['related_name'], )):
-                    if submited_id != '-ID-':
+                submited_ids = filter(lambda submited_id: submited_id != '-ID-', request.POST.getlist('_LINES_LIST_%s[]' % (line_data['related_name'], )))
 
-                        if submited_id.startswith('NEW-'):
-                            line_instance = line_data['class'](**{line_data['field']: obj})
-                        else:
-                            line_instance = get_object_or_404(line_data['class'], pk=submited_id, **{line_data['field']: obj})
+                # Load existing lines at once
+                existing_ids = [int(submited_id) for submited_id in submited_ids if submited_id.isdigit()]
+                existing_lines = line_data['class'].objects.filter(**{line_data['field']: obj}).in_bulk(existing_ids) if obj.pk and existing_ids else {}
 
-                        line_old_val = line_instance.__unicode__()
+                for submited_id in submited_ids:
 
-                        line_form = line_data['form'](request.POST, request.FILES, instance=line_instance, prefix="_LINES_%s_%s" % (line_data['related_name'], submited_id))
+                    if submited_id.startswith('NEW-'):
+                        line_instance = line_data['class'](**{line_data['field']: obj})
+                    else:
+                        try:
+                            line_instance = existing_lines[int(submited_id)]
+                        except (ValueError, KeyError):
+                            raise Http404
 
-                        if not line_form.is_valid():
-                            all_forms_valids = False
+                    line_old_val = line_instance.__unicode__()
+                    line_old_values = [getattr(line_instance, field.attname) for field in line_instance._meta.concrete_fields]
 
-                        line_form_data = {'id': submited_id, 'form': line_form, 'old_val': line_old_val}
+                    line_form = line_data['form'](request.POST, request.FILES, instance=line_instance, prefix="_LINES_%s_%s" % (line_data['related_name'], submited_id))
 
-                        line_data['forms'].append(line_form_data)
+                    if not line_form.is_valid():
+                        all_forms_valids = False
+
+                    line_form_data = {'id': submited_id, 'form': line_form, 'old_val': line_old_val, 'old_values': line_old_values}
+
+                    line_data['forms'].append(line_form_data)
 
             form._clean_line_data = lines_objects
 
@@ -487,138 +501,163 @@ def generate_edit(module, base_name, model_class, form_class, log_class, file_cl
                     messages.error(request, _(u'Tu n\'as pas le droit de créer/modifier cet objet.'))
                     return redirect('{}.views.{}_edit'.format(module.__name__, base_name), pk='~' if right == 'CREATE' else obj.pk)
 
-                obj.save()
-                if hasattr(form, 'save_m2m'):
-                    form.save_m2m()
+                files_to_unlink = []
+                logs = []
 
-                lines_adds = {}
-                lines_updates = {}
-                lines_deletes = {}
+                # Save the object, its lines, files and tags at once
+                with transaction.atomic():
+                    obj.save()
+                    if hasattr(form, 'save_m2m'):
+                        form.save_m2m()
 
-                for line_data in lines_objects:
-                    valids_ids = []
+                    lines_adds = {}
+                    lines_updates = {}
+                    lines_deletes = {}
 
-                    line_order = 0
+                    for line_data in lines_objects:
+                        valids_ids = []
+                        new_lines = []
 
-                    for line_form in line_data['forms']:
-                        line_obj = line_form['form'].save(commit=False)
-                        setattr(line_obj, line_data['field'], obj)
+                        line_order = 0
 
-                        if not line_obj.pk:
-                            lines_adds['%s' % (line_data['related_name'],)] = line_obj.__unicode__()
-                        else:
-                            if line_form['old_val'] != line_obj.__unicode__():
-                                lines_updates['%s #%s' % (line_data['related_name'], line_obj.pk,)] = (line_form['old_val'], line_obj.__unicode__())
+                        for line_form in line_data['forms']:
+                            line_obj = line_form['form'].save(commit=False)
+                            setattr(line_obj, line_data['field'], obj)
 
-                        if line_data['sortable']:
-                            line_obj.order = line_order
-                            line_order += 1
+                            if line_data['sortable']:
+                                line_obj.order = line_order
+                                line_order += 1
 
-                        line_obj.save()
+                            if not line_obj.pk:
+                                lines_adds['%s' % (line_data['related_name'],)] = line_obj.__unicode__()
+                                new_lines.append(line_obj)
+                            else:
+                                if line_form['old_val'] != line_obj.__unicode__():
+                                    lines_updates['%s #%s' % (line_data['related_name'], line_obj.pk,)] = (line_form['old_val'], line_obj.__unicode__())
 
-                        valids_ids.append(line_obj.pk)
+                                # Only write lines really modified
+                                if line_form['old_values'] != [getattr(line_obj, field.attname) for field in line_obj._meta.concrete_fields]:
+                                    line_obj.save()
 
-                    for line_deleted in getattr(obj, line_data['related_name']).exclude(pk__in=valids_ids):
+                                valids_ids.append(line_obj.pk)
 
-                        lines_deletes['%s #%s' % (line_data['related_name'], line_deleted.pk,)] = line_deleted.__unicode__()
+                        lines_deleted = getattr(obj, line_data['related_name']).exclude(pk__in=valids_ids)
 
-                        line_deleted.delete()
+                        for line_deleted in lines_deleted:
+                            lines_deletes['%s #%s' % (line_data['related_name'], line_deleted.pk,)] = line_deleted.__unicode__()
 
-                if file_mode:
-                    files_data = request.session.get('pca_files_%s' % (file_key,))
+                        lines_deleted.delete()
 
-                    if files_data is None:
-                        messages.warning(request, _(u'Erreur lors de la récupération de la session pour la gestion des fichiers. Il est possible que le formulaire aie été sauvegardé deux fois. Vérifiez si l\'état actuel des fichiers correspond à ce que vous désirez !'))
-                    else:
+                        line_data['class'].objects.bulk_create(new_lines)
 
-                        for file_pk in files_data:
-                            file_obj = file_class.objects.get(pk=file_pk)
+                    if file_mode:
+                        files_data = request.session.get('pca_files_%s' % (file_key,))
 
-                            if file_obj.object != obj:
-                                file_obj.object = obj
-                                file_obj.save()
-                                log_class(who=request.user, what='file_added', object=obj, extra_data=file_obj.basename()).save()
+                        if files_data is None:
+                            messages.warning(request, _(u'Erreur lors de la récupération de la session pour la gestion des fichiers. Il est possible que le formulaire aie été sauvegardé deux fois. Vérifiez si l\'état actuel des fichiers correspond à ce que vous désirez !'))
+                        else:
 
-                        for file_obj in obj.files.all():
-                            if file_obj.pk not in files_data:
-                                log_class(who=request.user, what='file_removed', object=obj, extra_data=file_obj.basename()).save()
-                                os.unlink(file_obj.file.path)
-                                file_obj.delete()
+                            files_added = file_class.objects.filter(pk__in=files_data).exclude(object=obj)
 
-                        # Clean up session
-                        del request.session['pca_files_%s' % (file_key,)]
+                            for file_obj in files_added:
+                                log_entry = log_class(who=request.user, what='file_added', object=obj, extra_data=file_obj.basename())
+                                log_entry.save(expire_caches=False)
+                                logs.append(log_entry)
 
-                if tag_mode:
-                    for t in tags:
-                        __, ___ = tag_class.objects.get_or_create(tag=t, object=obj)
+                            files_added.update(object=obj)
 
-                    tag_class.objects.filter(object=obj).exclude(tag__in=tags).delete()
+                            files_removed = obj.files.exclude(pk__in=files_data)
 
-                    tags_after = ', '.join([t.tag for t in obj.tags.order_by('tag')])
+                            for file_obj in files_removed:
+                                log_entry = log_class(who=request.user, what='file_removed', object=obj, extra_data=file_obj.basename())
+                                log_entry.save(expire_caches=False)
+                                logs.append(log_entry)
+                                files_to_unlink.append(file_obj.file.path)
 
-                if linked_info_mode:
-                    object_ct = ContentType.objects.get(app_label=module.__name__, model=base_name)
-                    infos, __ = LinkedInfo.objects.get_or_create(content_type=object_ct, object_id=obj.pk, defaults={'user_pk': obj.user.pk})
-                    for (info_field, user_field) in (('first_name', 'first_name'), ('last_name', 'last_name'), ('address', 'adresse'), ('phone', 'mobile'), ('bank', 'nom_banque'), ('iban_ccp', 'iban_ou_ccp'), ('user_pk', 'pk')):
-                        setattr(infos, info_field, getattr(obj.user, user_field))
-                    infos.save()
+                            files_removed.delete()
 
-                if isinstance(obj, BasicRightModel):
-                    obj.rights_expire()
+                            # Clean up session
+                            del request.session['pca_files_%s' % (file_key,)]
 
-                if hasattr(obj, 'save_signal'):
-                    obj.save_signal()
+                    if tag_mode:
+                        existing_tags = set(tag_class.objects.filter(object=obj).values_list('tag', flat=True))
 
-                if hasattr(obj, 'MetaEdit') and hasattr(obj.MetaEdit, 'do_extra_post_actions'):
-                    extra_args = obj.MetaEdit.do_extra_post_actions(obj, request, request.POST, True)
-                    for (lines, logs) in [(lines_adds, 'log_add'), (lines_updates, 'log_update'), (lines_deletes, 'log_delete')]:
-                        lines.update(extra_args[logs])
+                        tag_class.objects.bulk_create([tag_class(tag=t, object=obj) for t in set(tags) - existing_tags])
+                        tag_class.objects.filter(object=obj, tag__in=existing_tags - set(tags)).delete()
 
-                messages.success(request, _(u'Élément sauvegardé !'))
+                        tags_after = ', '.join([t.tag for t in obj.tags.order_by('tag')])
 
-                if not before_data:
-                    log_class(who=request.user, what='created', object=obj).save()
+                    if linked_info_mode:
+                        object_ct = ContentType.objects.get(app_label=module.__name__, model=base_name)
+                        infos, __ = LinkedInfo.objects.get_or_create(content_type=object_ct, object_id=obj.pk, defaults={'user_pk': obj.user.pk})
+                        for (info_field, user_field) in (('first_name', 'first_name'), ('last_name', 'last_name'), ('address', 'adresse'), ('phone', 'mobile'), ('bank', 'nom_banque'), ('iban_ccp', 'iban_ou_ccp'), ('user_pk', 'pk')):
+                            setattr(infos, info_field, getattr(obj.user, user_field))
+                        infos.save()
 
-                    if hasattr(obj, 'create_signal'):
-                        obj.create_signal(request)
-                else:
-                    # Compute diff
-                    after_data = obj.build_state()
+                    if hasattr(obj, 'MetaEdit') and hasattr(obj.MetaEdit, 'do_extra_post_actions'):
+                        extra_args = obj.MetaEdit.do_extra_post_actions(obj, request, request.POST, True)
+                        for (lines, logs) in [(lines_adds, 'log_add'), (lines_updates, 'log_update'), (lines_deletes, 'log_delete')]:
+                            lines.update(extra_args[logs])
 
-                    for key in list(before_data)[::]:  # Be sure we're on a copy
-                        if key in after_data and after_data[key] == before_data[key]:
-                            del after_data[key]
-                            del before_data[key]
+                    messages.success(request, _(u'Élément sauvegardé !'))
 
-                    added = {}
-                    edited = {}
-                    deleted = {}
+                    if not before_data:
+                        log_entry = log_class(who=request.user, what='created', object=obj)
+                        log_entry.save(expire_caches=False)
+                        logs.append(log_entry)
 
-                    for key in before_data:
-                        if key not in after_data:
-                            deleted[key] = before_data[key]
-                        else:
-                            if not after_data[key]:
+                        if hasattr(obj, 'create_signal'):
+                            obj.create_signal(request)
+                    else:
+                        # Compute diff
+                        before_data, after_data = obj.build_state_diff(before_data)
+
+                        added = {}
+                        edited = {}
+                        deleted = {}
+
+                        for key in before_data:
+                            if key not in after_data:
                                 deleted[key] = before_data[key]
-                                del after_data[key]
-                            elif before_data[key]:
-                                edited[key] = (before_data[key], after_data[key])
-                                del after_data[key]
+                            else:
+                                if not after_data[key]:
+                                    deleted[key] = before_data[key]
+                                    del after_data[key]
+                                elif before_data[key]:
+                                    edited[key] = (before_data[key], after_data[key])
+                                    del after_data[key]
 
-                    added = after_data
+                        added = after_data
 
-                    added.update(lines_adds)
-                    edited.update(lines_updates)
-                    deleted.update(lines_deletes)
+                        added.update(lines_adds)
+                        edited.update(lines_updates)
+                        deleted.update(lines_deletes)
 
-                    if tag_mode and tags_before != tags_after:
-                        edited['tags'] = (tags_before, tags_after)
+                        if tag_mode and tags_before != tags_after:
+                            edited['tags'] = (tags_before, tags_after)
 
-                    diff = {'added': added, 'edited': edited, 'deleted': deleted}
+                        diff = {'added': added, 'edited': edited, 'deleted': deleted}
 
-                    log_class(who=request.user, what='edited', object=obj, extra_data=json.dumps(diff)).save()
+                        log_entry = log_class(who=request.user, what='edited', object=obj, extra_data=json.dumps(diff))
+                        log_entry.save(expire_caches=False)
+                        logs.append(log_entry)
 
-                obj.user_has_seen_object(request.user)
+                    obj.user_has_seen_object(request.user)
+
+                # Caches and search index are updated once the transaction is committed: a request in between would cache the old state again
+                if isinstance(obj, BasicRightModel):
+                    obj.rights_expire()
+
+                if hasattr(obj, 'save_signal'):
+                    obj.save_signal()
+
+                for log_entry in logs:
+                    log_entry.expire_caches()
+
+                update_search_index(model_class, [obj.pk])
+
+                for file_path in files_to_unlink:
+                    os.unlink(file_path)
 
                 if request.POST.get('post-save-dest'):
                     if request.POST.get('post-save-dest') == 'new':
@@ -895,7 +934,7 @@ def generate_deleted(module, base_name, model_class, log_class):
             messages.success(request, _(u'Élément restauré !'))
             return redirect(list_view)
 
-        liste = model_class.objects.filter(deleted=True).annotate(Max('logs__when')).order_by('-logs__when__max')
+        liste = model_class.objects.filter(deleted=True).order_by('-last_activity')
 
         if unit_mode:
             if isinstance(model_class(), CostCenterLinked):
@@ -1108,37 +1147,27 @@ def generate_calendar_json(module, base_name, model_class):
         start = pytz.timezone(settings.TIME_ZONE).localize(datetime.datetime.fromtimestamp(float(start)))
         end = pytz.timezone(settings.TIME_ZONE).localize(datetime.datetime.fromtimestamp(float(end)))
 
-        liste = filter__(model_class.objects.exclude((Q(start_date__lt=start) & Q(end_date__lt=start)) | (Q(start_date__gt=end) & Q(end_date__gt=end))).filter(Q(status='1_asking') | Q(status='2_online')))
+        liste = filter__(model_class.objects.filter(Q(status='1_asking') | Q(status='2_online')))
+
+        if unit_mode and not current_unit:
+            scope = 'calendar_blank_%s' % ('all' if request.user.is_superuser else request.user.pk,)
+        else:
+            scope = 'calendar_%s_%s' % (current_unit.pk if current_unit else 'all', current_year.pk if year_mode else 'all')
 
         retour = []
 
-        for l in liste:
+        for event in calendar_feed(model_class, scope, liste, start, end, request.user):
 
-            if l.status == '1_asking':
-                icon = 'fa-question'
-                className = ["event", "bg-color-redLight"]
+            if event['linked']:
+                titre = u'{} (Géré par {})'.format(u', '.join([name for (__, name, __) in event['linked']]), event['linked'][0][2])
             else:
-                icon = 'fa-check'
-                className = ["event", "bg-color-greenLight"]
+                titre = event['description'].decode('utf-8')
 
-            if l.rights_can('SHOW', request.user):
-                url = l.display_url()
-            else:
-                url = ''
+            retour.append(calendar_json_event(event, titre))
 
-            if hasattr(l, 'get_linked_object'):
-                linked_object = l.get_linked_object()
+        body = json.dumps(retour)
 
-                if isinstance(linked_object, list):
-                    titre = u'{} (Géré par {})'.format(u', '.join([o.__unicode__() for o in linked_object]), linked_object[0].unit)
-                else:
-                    titre = u'{} (Géré par {})'.format(l.get_linked_object(), l.get_linked_object().unit)
-            else:
-                titre = u'{}'.format(l)
-
-            retour.append({'title': titre, 'start': str(l.start_date), 'end': str(l.end_date), 'className': className, 'icon': icon, 'url': url, 'allDay': False, 'description': str(l)})
-
-        return HttpResponse(json.dumps(retour))
+        return cached_response(request, lambda: HttpResponse(body), etag=build_etag(body))
 
     return _generic_calendar_json
 
@@ -1189,45 +1218,28 @@ def generate_calendar_related_json(module, base_name, model_class):
         start = pytz.timezone(settings.TIME_ZONE).localize(datetime.datetime.fromtimestamp(float(start)))
         end = pytz.timezone(settings.TIME_ZONE).localize(datetime.datetime.fromtimestamp(float(end)))
 
-        liste = filter___(filter__(model_class.objects.exclude((Q(start_date__lt=start) & Q(end_date__lt=start)) | (Q(start_date__gt=end) & Q(end_date__gt=end))).filter(Q(status='1_asking') | Q(status='2_online')))).exclude(deleted=True).distinct()
+        liste = filter___(filter__(model_class.objects.filter(Q(status='1_asking') | Q(status='2_online')))).exclude(deleted=True).distinct()
+
+        scope = 'related_%s_%s_%s' % (current_unit.pk if current_unit else 'all', current_year.pk if year_mode else 'all', urllib.quote(request.GET.get('filter_object') or 'all'))
 
         retour = []
 
         colors = ['default', 'danger', 'success', 'warning', 'info', 'primary']
 
-        for l in liste:
-            if l.unit:
-                par = l.unit.name
-            else:
-                par = u'%s (%s)' % (l.unit_blank_name, l.unit_blank_user)
+        for event in calendar_feed(model_class, scope, liste, start, end, request.user):
 
-            if l.status == '1_asking':
-                icon = 'fa-question'
-                className = ["event", "bg-color-redLight"]
+            if event['linked']:
+                titre = u'{} (Réservé par {})'.format(u', '.join([name for (__, name, __) in event['linked']]), event['par'])
+                colored = colors[event['linked'][0][0] % len(colors)]
             else:
-                icon = 'fa-check'
-                className = ["event", "bg-color-greenLight"]
-
-            if l.rights_can('SHOW', request.user):
-                url = l.display_url()
-            else:
-                url = ''
-
-            if hasattr(l, 'get_linked_object'):
-                lobj = l.get_linked_object()
-                if isinstance(lobj, list):
-                    titre = u'{} (Réservé par {})'.format(u', '.join([o.__unicode__() for o in lobj]), par)
-                    colored = colors[lobj[0].pk % len(colors)]
-                else:
-                    titre = u'{} (Réservé par {})'.format(lobj, par)
-                    colored = colors[lobj.pk % len(colors)]
-            else:
-                titre = u'{} (Réservé par {})'.format(l, par)
+                titre = u'{} (Réservé par {})'.format(event['description'].decode('utf-8'), event['par'])
                 colored = ""
 
-            retour.append({'title': titre, 'start': str(l.start_date), 'end': str(l.end_date), 'className': className, 'icon': icon, 'url': url, 'allDay': False, 'description': str(l), 'colored': colored})
+            retour.append(calendar_json_event(event, titre, colored=colored))
+
+        body = json.dumps(retour)
 
-        return HttpResponse(json.dumps(retour))
+        return cached_response(request, lambda: HttpResponse(body), etag=build_etag(body))
 
     return _generic_calendar_related_json
 
@@ -1235,19 +1247,33 @@ def generate_calendar_related_json(module, base_name, model_class):
 def generate_calendar_specific(module, base_name, model_class):
 
     def _check_and_add_context(request, pk):
-        base_model = model_class.get_linked_object_class()
+        cobject = _calendar_specific_object(model_class, request.user, pk)
 
-        cobject = get_object_or_404(base_model, pk=pk, deleted=False, allow_calendar=True)
+        return {'cobject': cobject, 'ics_view': '%s.views.%s_calendar_specific_ics' % (module.__name__, base_name), 'ics_token': calendar_ics_token(model_class, 'specific_%s' % (cobject.pk,), request.user.pk)}
 
-        if not cobject.allow_externals and request.user.is_external():
-            raise Http404()
+    return generate_generic_list(module, base_name, model_class, '_calendar_specific_json', 'SHOW', 'SHOW', 'calendar_specific', False, bonus_args_transformator=_check_and_add_context)
 
-        if not cobject.allow_external_calendar and request.user.is_external():
-            raise Http404()
 
-        return {'cobject': cobject}
+def _calendar_specific_object(model_class, user, pk):
+    """Return the object (room, display, ...) of a specific calendar, if the user can see it"""
 
-    return generate_generic_list(module, base_name, model_class, '_calendar_specific_json', 'SHOW', 'SHOW', 'calendar_specific', False, bonus_args_transformator=_check_and_add_context)
+    cobject = get_object_or_404(model_class.get_linked_object_class(), pk=pk, deleted=False, allow_calendar=True)
+
+    if not cobject.allow_externals and user.is_external():
+        raise Http404()
+
+    if not cobject.allow_external_calendar and user.is_external():
+        raise Http404()
+
+    return cobject
+
+
+def _calendar_specific_queryset(model_class, cobject):
+    """Return the reservations shown in the specific calendar of the object"""
+
+    unit_field = getattr(model_class.MetaState, 'filter_unit_field', None) or model_class.MetaState.unit_field
+
+    return model_class.objects.filter(**{'__'.join(unit_field.split('.')[:-1] + ['pk']): cobject.pk}).filter(Q(status='1_asking') | Q(status='2_online')).exclude(deleted=True).distinct()
 
 
 def generate_calendar_specific_json(module, base_name, model_class):
@@ -1258,17 +1284,7 @@ def generate_calendar_specific_json(module, base_name, model_class):
 
         unit_mode, current_unit, unit_blank = get_unit_data(model_class, request, allow_blank=False)
 
-        base_model = model_class.get_linked_object_class()
-
-        cobject = get_object_or_404(base_model, pk=pk, deleted=False, allow_calendar=True)
-
-        if not cobject.allow_externals and request.user.is_external():
-            raise Http404()
-
-        if not cobject.allow_external_calendar and request.user.is_external():
-            raise Http404()
-
-        filter_ = lambda x: x.filter(**{'__'.join(model_class.MetaState.unit_field.split('.')[:-1] + ['pk']): cobject.pk})
+        cobject = _calendar_specific_object(model_class, request.user, pk)
 
         start = request.GET.get('start')
 
@@ -1277,35 +1293,39 @@ def generate_calendar_specific_json(module, base_name, model_class):
         start = pytz.timezone(settings.TIME_ZONE).localize(datetime.datetime.fromtimestamp(float(start)))
         end = pytz.timezone(settings.TIME_ZONE).localize(datetime.datetime.fromtimestamp(float(end)))
 
-        liste = filter_(model_class.objects.exclude((Q(start_date__lt=start) & Q(end_date__lt=start)) | (Q(start_date__gt=end) & Q(end_date__gt=end))).filter(Q(status='1_asking') | Q(status='2_online'))).exclude(deleted=True)
-
         retour = []
 
-        for l in liste:
-            if l.unit:
-                par = l.unit.name
-            else:
-                par = u'%s (%s)' % (l.unit_blank_name, l.unit_blank_user)
+        for event in calendar_feed(model_class, 'specific_%s' % (cobject.pk,), _calendar_specific_queryset(model_class, cobject), start, end, request.user):
+            retour.append(calendar_json_event(event, event['par']))
 
-            if l.status == '1_asking':
-                icon = 'fa-question'
-                className = ["event", "bg-color-redLight"]
-            else:
-                icon = 'fa-check'
-                className = ["event", "bg-color-greenLight"]
+        body = json.dumps(retour)
 
-            if l.rights_can('SHOW', request.user):
-                url = l.display_url()
-            else:
-                url = ''
+        return cached_response(request, lambda: HttpResponse(body), etag=build_etag(body))
+
+    return _generic_calendar_specific_json
 
-            titre = par
 
-            retour.append({'title': titre, 'start': str(l.start_date), 'end': str(l.end_date), 'className': className, 'icon': icon, 'url': url, 'allDay': False, 'description': str(l)})
+def generate_calendar_specific_ics(module, base_name, model_class):
 
-        return HttpResponse(json.dumps(retour))
+    def _generic_calendar_specific_ics(request, pk, user_pk, token):
 
-    return _generic_calendar_specific_json
+        # Pas de login pour les clients de calendrier: le token identifie l'user
+        user = calendar_ics_user(model_class, 'specific_%s' % (pk,), user_pk, token)
+
+        cobject = _calendar_specific_object(model_class, user, pk)
+
+        today = pytz.timezone(settings.TIME_ZONE).localize(datetime.datetime.combine(datetime.date.today(), datetime.time()))
+
+        start = today - datetime.timedelta(days=settings.CALENDAR_ICS_PAST_DAYS)
+        end = today + datetime.timedelta(days=settings.CALENDAR_ICS_FUTURE_DAYS)
+
+        events = calendar_events(model_class, 'specific_%s' % (cobject.pk,), _calendar_specific_queryset(model_class, cobject), start, end)
+
+        body = calendar_ics(model_class, u'{}'.format(cobject), events, lambda event: event['par'])
+
+        return cached_response(request, lambda: HttpResponse(body, content_type='text/calendar; charset=utf-8'), etag=build_etag(body))
+
+    return _generic_calendar_specific_ics
 
 
 def generate_directory(module, base_name, model_class):
@@ -1347,13 +1367,11 @@ def generate_logs(module, base_name, model_class):
     @login_required
     def _generic_logs(request):
 
-        # Le check des droits éventuelles est ultra complexe: il faut affichier
-        # les logs seulement des objets sur les quels l'users à le droit
-        # 'DISPLAY_LOG', hors c'est pas checkable via la base et il faut
-        # paginer. Le faire manuellement serait horible au niveau performances
-        # (par exemple en listant d'abord tous les objets puit en filtrant les
-        # logs via la liste d'objects possibles).
-        if not request.user.is_superuser:
+        # Les logs sont affichés seulement pour les objets sur les quels
+        # l'users à le droit 'DISPLAY_LOG'. Ces objets sont sélectionnés dans
+        # la base (voir rights_objects_with), ce qui permet de filtrer et
+        # paginer directement dans la base.
+        if not request.user.is_superuser and not model_class.rights_objects_with('DISPLAY_LOG', request.user).exists():
             raise Http404
 
         logs_json_view = '%s.views.%s_logs_json' % (module.__name__, base_name)
@@ -1374,8 +1392,15 @@ def generate_logs_json(module, base_name, model_class, logging_class):
     @csrf_exempt
     def _generic_logs_json(request):
 
-        if not request.user.is_superuser:
-            raise Http404
+        if request.user.is_superuser:
+            bonus_filter_function = None
+        else:
+            objects = model_class.rights_objects_with('DISPLAY_LOG', request.user)
+
+            if not objects.exists():
+                raise Http404
+
+            bonus_filter_function = lambda qs: qs.filter(object__in=objects)
 
         show_view = '%s.views.%s_show' % (module.__name__, base_name)
         list_view = '%s.views.%s_list' % (module.__name__, base_name)
@@ -1393,6 +1418,8 @@ def generate_logs_json(module, base_name, model_class, logging_class):
             },
             not_sortable_columns=['unit',],
             filter_fields=['when', 'who__first_name', 'what'] + bonus_filter,
+            bonus_filter_function=bonus_filter_function,
+            bonus_total_filter_function=bonus_filter_function,
         )
 
     return _generic_logs_json
@@ -1414,6 +1441,8 @@ def generate_file_upload(module, base_name, model_class, log_class, file_class):
         instance = file_class(file=file, uploader=request.user)
         instance.save()
 
+        instance.schedule_thumbnails()
+
         basename = os.path.basename(instance.file.path)
 
         file_dict = {
@@ -1484,7 +1513,12 @@ def generate_file_get(module, base_name, model_class, log_class, file_class):
             if isinstance(instance.object, BasicRightModel) and not instance.object.rights_can('SHOW', request.user):
                 raise Http404
 
-        return sendfile(request, instance.file.path, 'down' in request.GET)
+        path = instance.file.path
+
+        if not os.path.isfile(path):
+            raise Http404
+
+        return cached_response(request, lambda: sendfile(request, path, 'down' in request.GET), etag=build_etag(instance.pk, os.path.getmtime(path), os.path.getsize(path)), last_modified=os.path.getmtime(path))
 
     return _generic_file_get
 
@@ -1503,31 +1537,32 @@ def generate_file_get_thumbnail(module, base_name, model_class, log_class, file_
             if isinstance(instance.object, BasicRightModel) and not instance.object.rights_can('SHOW', request.user):
                 raise Http404
 
-        remove_me = None
+        from generic.models import get_thumbnail_options
 
-        if instance.is_picture():
-            url = instance.file
-        elif instance.is_pdf():
-            try:
+        size = (int(request.GET.get('w', 200)), int(request.GET.get('h', 100)))
+        options = get_thumbnail_options(size)
 
-                url = os.path.join('cache', 'pdfthumbnail', "{}.jpg".format(instance.file.name.replace('/', '_')))
-                full_url = os.path.join(settings.MEDIA_ROOT, url)
+        source = instance.get_thumbnail_source()
 
-                if not os.path.isfile(full_url):
-                    with Image(filename="{}{}[0]".format(settings.MEDIA_ROOT, instance.file)) as img:
-                        img.save(filename=full_url)
-            except:
-                url = 'img/PDF.png'
+        if source:
+            # Standard sizes are generated in background after upload, others on the fly
+            thumb = get_thumbnailer(source).get_thumbnail(options, generate=size not in settings.THUMBNAIL_STANDARD_SIZES)
         else:
-            url = 'img/File.png'
+            thumb = None
+
+        if not thumb:
+            # Not generated yet: display a placeholder meanwhile
+            instance.schedule_thumbnails()
 
-        options = {'size': (int(request.GET.get('w', 200)), int(request.GET.get('h', 100))), 'crop': True, 'upscale': True}
-        thumb = get_thumbnailer(url).get_thumbnail(options)
+            thumb = get_thumbnailer(instance.get_thumbnail_placeholder()).get_thumbnail(options)
 
-        if remove_me:
-            os.unlink(remove_me)
+            response = sendfile(request, '%s%s' % (settings.MEDIA_ROOT, thumb,))
+            response['Cache-Control'] = 'no-cache'
+            return response
 
-        return sendfile(request, '%s%s' % (settings.MEDIA_ROOT, thumb,))
+        path = '%s%s' % (settings.MEDIA_ROOT, thumb,)
+
+        return cached_response(request, lambda: sendfile(request, path), etag=build_etag(path, os.path.getmtime(path)), last_modified=os.path.getmtime(path))
 
     return _generic_file_thumbnail
 
@@ -1595,6 +1630,40 @@ def generate_mayi(module, base_name, model_class, logging_class):
         for r in ['RESTORE', 'CREATE']:
             retour[r] = model_class.static_rights_can(r, request.user, current_unit, current_year)
 
+        if unit_mode:
+            # Best unit where the user can create objects, if not the current one
+            create_unit = current_unit if retour['CREATE'] else next(model_class.rights_units_with('CREATE', request.user, current_year), None)
+            retour['CREATE_UNIT'] = create_unit.pk if create_unit else None
+
         return HttpResponse(json.dumps(retour), content_type='text/json')
 
     return _generic_mayi
+
+
+@login_required
+def pdfjob_status(request, job_id):
+    from generic.pdfjobs import get_pdf_job
+
+    job = get_pdf_job(job_id)
+
+    if not job or job['user_pk'] != request.user.pk:
+        raise Http404
+
+    retour = {'status': job['status'], 'error': job['error']}
+
+    if job['status'] == 'done':
+        retour['url'] = reverse('generic.views.pdfjob_download', args=(job_id,))
+
+    return HttpResponse(json.dumps(retour), content_type='text/json')
+
+
+@login_required
+def pdfjob_download(request, job_id):
+    from generic.pdfjobs import get_pdf_job, pdf_job_path
+
+    job = get_pdf_job(job_id)
+
+    if not job or job['user_pk'] != request.user.pk or job['status'] != 'done' or not os.path.isfile(pdf_job_path(job_id)):
+        raise Http404
+
+    return sendfile(request, pdf_job_path(job_id), 'down' in request.GET, job['filename'])
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+
+ACTIVE_STATUS = ('1_asking', '2_online')
+
+
+def load_supply_lines(supplies_pks, start_date, end_date, status=ACTIVE_STATUS, exclude_pk=None):
+    """Return the list of (supply pk, reservation pk, start, end, quantity) for reservations of the supplies overlapping the period, with one query"""
+
+    from logistics.models import SupplyReservationLine
+
+    lines = SupplyReservationLine.objects.filter(supply__in=supplies_pks, supply_reservation__deleted=False, supply_reservation__status__in=status, supply_reservation__end_date__gt=start_date, supply_reservation__start_date__lt=end_date)
+
+    if exclude_pk:
+        lines = lines.exclude(supply_reservation=exclude_pk)
+
+    return list(lines.values_list('supply', 'supply_reservation', 'supply_reservation__start_date', 'supply_reservation__end_date', 'quantity'))
+
+
+def sweep_supply_lines(lines, start_date, end_date):
+    """Return the list of intervals (start, end, used quantity, reservations pks) between start_date and end_date for lines of one supply.
+
+    Events are sorted by date, ends before starts at the same time: reservations touching each other don't overlap."""
+
+    events = []
+
+    for __, reservation_pk, line_start, line_end, quantity in lines:
+        if line_end > start_date and line_start < end_date:
+            events.append((max(line_start, start_date), 1, reservation_pk, quantity))
+            events.append((min(line_end, end_date), 0, reservation_pk, quantity))
+
+    intervals = []
+    used = 0
+    active = {}
+    last_date = start_date
+
+    for date, is_start, reservation_pk, quantity in sorted(events):
+
+        if date > last_date:
+            intervals.append((last_date, date, used, sorted(active.keys())))
+            last_date = date
+
+        if is_start:
+            active[reservation_pk] = active.get(reservation_pk, 0) + quantity
+            used += quantity
+        else:
+            active[reservation_pk] -= quantity
+            if not active[reservation_pk]:
+                del active[reservation_pk]
+            used -= quantity
+
+    if last_date < end_date:
+        intervals.append((last_date, end_date, used, sorted(active.keys())))
+
+    return intervals
+
+
+def supply_usage(supplies, start_date, end_date, status=ACTIVE_STATUS, exclude_pk=None):
+    """Return, for each supply, the list of intervals (start, end, used quantity, reservations pks) between start_date and end_date"""
+
+    supplies_pks = [getattr(supply, 'pk', supply) for supply in supplies]
+
+    lines_per_supply = dict((pk, []) for pk in supplies_pks)
+
+    for line in load_supply_lines(supplies_pks, start_date, end_date, status, exclude_pk):
+        lines_per_supply[line[0]].append(line)
+
+    return dict((supply_pk, sweep_supply_lines(lines, start_date, end_date)) for supply_pk, lines in lines_per_supply.iteritems())
+
+
+def supply_availability(supplies, start_date, end_date, status=ACTIVE_STATUS, exclude_pk=None):
+    """Return, for each supply, the list of intervals (start, end, available quantity) between start_date and end_date"""
+
+    usage = supply_usage(supplies, start_date, end_date, status, exclude_pk)
+
+    return dict((supply.pk, [(start, end, supply.quantity - used) for (start, end, used, __) in usage[supply.pk]]) for supply in supplies)
+
+
+def supply_peak_usage(supplies, start_date, end_date, status=ACTIVE_STATUS, exclude_pk=None):
+    """Return, for each supply, the maximum quantity used at the same time between start_date and end_date"""
+
+    usage = supply_usage(supplies, start_date, end_date, status, exclude_pk)
+
+    return dict((supply_pk, max([used for (__, __, used, __) in intervals] or [0])) for supply_pk, intervals in usage.iteritems())
+
+
+def find_conflicts(lines, usage):
+    """Return the list of (reservation pk, supply) for which, at some point, the quantity of the supply is not enough for the lines and the usage"""
+
+    conflicts = []
+
+    for line in lines:
+        for (__, __, used, reservations_pks) in usage[line.supply.pk]:
+            if used + line.quantity > line.supply.quantity:
+                for reservation_pk in reservations_pks:
+                    if (reservation_pk, line.supply) not in conflicts:
+                        conflicts.append((reservation_pk, line.supply))
+
+    return conflicts
+
+
+def supply_conflicts(lines, start_date, end_date, exclude_pk=None):
+    """Return the list of (reservation pk, supply) conflicting with the lines of a reservation"""
+
+    lines = list(lines)
+
+    return find_conflicts(lines, supply_usage([line.supply for line in lines], start_date, end_date, exclude_pk=exclude_pk))
+
+
+def prefetch_supply_conflicts(reservations):
+    """Compute the conflicts of a list of reservations at once (for lists), with a fixed number of queries. The result is used by get_conflicting_reservations."""
+
+    from logistics.models import SupplyReservation, SupplyReservationLine
+
+    reservations = [reservation for reservation in reservations if reservation.pk]
+
+    if not reservations:
+        return
+
+    lines_per_reservation = dict((reservation.pk, []) for reservation in reservations)
+
+    for line in SupplyReservationLine.objects.filter(supply_reservation__in=lines_per_reservation.keys()).select_related('supply'):
+        lines_per_reservation[line.supply_reservation_id].append(line)
+
+    supplies_pks = set([line.supply_id for lines in lines_per_reservation.values() for line in lines])
+
+    all_lines = load_supply_lines(supplies_pks, min([r.start_date for r in reservations]), max([r.end_date for r in reservations]))
+
+    lines_per_supply = dict((pk, []) for pk in supplies_pks)
+
+    for line in all_lines:
+        lines_per_supply[line[0]].append(line)
+
+    conflicts_per_reservation = {}
+
+    for reservation in reservations:
+        lines = lines_per_reservation[reservation.pk]
+        usage = dict((line.supply_id, sweep_supply_lines([l for l in lines_per_supply[line.supply_id] if l[1] != reservation.pk], reservation.start_date, reservation.end_date)) for line in lines)
+        conflicts_per_reservation[reservation.pk] = find_conflicts(lines, usage)
+
+    others = SupplyReservation.objects.in_bulk(set([reservation_pk for conflicts in conflicts_per_reservation.values() for (reservation_pk, __) in conflicts]))
+
+    for reservation in reservations:
+        reservation._conflicting_reservations = [(others[reservation_pk], supply) for (reservation_pk, supply) in conflicts_per_reservation[reservation.pk]]
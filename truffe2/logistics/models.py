@@ -99,8 +99,8 @@ class _RoomReservation(GenericModel, GenericDelayValidable, GenericGroupsValidab
 
     title = models.CharField(_('Titre'), max_length=255)
 
-    start_date = models.DateTimeField(_(u'Date de début'))
-    end_date = models.DateTimeField(_(u'Date de fin'))
+    start_date = models.DateTimeField(_(u'Date de début'), db_index=True)
+    end_date = models.DateTimeField(_(u'Date de fin'), db_index=True)
 
     reason = models.TextField(_('Raison'), help_text=_(u'Explique brièvement ce que tu vas faire'))
     remarks = models.TextField(_('Remarques'), blank=True, null=True)
@@ -179,6 +179,12 @@ Tu peux gérer ici la liste de réservation des salles de l'unité active.""")
         trans_sort = {'get_unit_name': 'unit__name', 'get_room_link': 'room__title'}
         not_sortable_columns = ['get_conflits_list', ]
 
+        @staticmethod
+        def prepare_list(objects):
+            from generic.availability import prefetch_overlaps
+            prefetch_overlaps(objects, 'room')
+            return objects
+
     class MetaEdit:
         datetime_fields = ('start_date', 'end_date')
 
@@ -231,9 +237,17 @@ Tu peux gérer ici la liste de réservation des salles de l'unité active.""")
 
         return tpl
 
+    def get_conflicting_reservations(self):
+        """Return the other reservations of the room at the same time (precomputed for lists, see prefetch_overlaps)"""
+
+        if hasattr(self, '_conflicting_reservations'):
+            return self._conflicting_reservations
+
+        return self.room.roomreservation_set.exclude(pk=self.pk).exclude(deleted=True).filter(status__in=['1_asking', '2_online'], end_date__gt=self.start_date, start_date__lt=self.end_date)
+
     def get_conflits(self):
 
-        liste = self.room.roomreservation_set.exclude(pk=self.pk).exclude(deleted=True).filter(status__in=['1_asking', '2_online'], end_date__gt=self.start_date, start_date__lt=self.end_date)
+        liste = self.get_conflicting_reservations()
 
         if not liste:
             return mark_safe(u'<span class="txt-color-green"><i class="fa fa-check"></i> {}</span>'.format(_(u'Pas de conflits !')))
@@ -254,7 +268,7 @@ Tu peux gérer ici la liste de réservation des salles de l'unité active.""")
 
     def get_conflits_list(self):
 
-        liste = self.room.roomreservation_set.exclude(pk=self.pk).exclude(deleted=True).filter(status__in=['1_asking', '2_online'], end_date__gt=self.start_date, start_date__lt=self.end_date)
+        liste = self.get_conflicting_reservations()
 
         if not liste:
             return u'<span class="txt-color-green"><i class="fa fa-check"></i></span>'
@@ -457,6 +471,12 @@ class _SupplyReservation(GenericModel, GenericModelWithLines, GenericDelayValida
         trans_sort = {'get_unit_name': 'unit__name', 'get_supply_link': 'lines__supply__title'}
         not_sortable_columns = ['get_conflits_list', 'get_supplies', 'supply']
 
+        @staticmethod
+        def prepare_list(objects):
+            from logistics.availability import prefetch_supply_conflicts
+            prefetch_supply_conflicts(objects)
+            return objects
+
     class MetaEdit:
         datetime_fields = ('start_date', 'end_date')
 
@@ -525,7 +545,10 @@ class _SupplyReservation(GenericModel, GenericModelWithLines, GenericDelayValida
         if not lines:
             return
 
+        start_date, end_date = data.get('start_date'), data.get('end_date')
+
         supply_in_list = []
+        supply_quantities = {}
         supply_unit = None
 
         for supply_form in lines[0]['forms']:
@@ -553,6 +576,7 @@ class _SupplyReservation(GenericModel, GenericModelWithLines, GenericDelayValida
                 raise forms.ValidationError(_(u'Il y a plusieurs fois \"{}\" dans la liste'.format(data['supply'])))
             else:
                 supply_in_list.append(data['supply'])
+                supply_quantities[data['supply'].pk] = data['quantity']
 
             if not supply_unit:
                 supply_unit = data['supply'].unit
@@ -562,6 +586,17 @@ class _SupplyReservation(GenericModel, GenericModelWithLines, GenericDelayValida
         if not supply_unit:
             raise forms.ValidationError(_(u'Il faut réserver du matériel !'))
 
+        if start_date and end_date and start_date < end_date:
+
+            from logistics.availability import supply_peak_usage
+
+            # Only accepted reservations are taken into account, others are displayed as conflicts
+            peak_usage = supply_peak_usage(supply_in_list, start_date, end_date, status=('2_online',), exclude_pk=self.pk)
+
+            for supply in supply_in_list:
+                if peak_usage[supply.pk] + supply_quantities[supply.pk] > supply.quantity:
+                    raise forms.ValidationError(_(u'Il ne reste que {} \"{}\" disponible(s) pendant la période demandée'.format(max(supply.quantity - peak_usage[supply.pk], 0), supply)))
+
     def genericFormExtraClean(self, data, form):
 
         from django import forms
@@ -605,23 +640,24 @@ class _SupplyReservation(GenericModel, GenericModelWithLines, GenericDelayValida
 
         return mark_safe(u'{}{}'.format(line_list, unit))
 
-    def get_conflits(self):
+    def get_conflicting_reservations(self):
+        """Return the list of (reservation, supply) for which there is not enough supply during the reservation (precomputed for lists, see prefetch_supply_conflicts)"""
+
+        if hasattr(self, '_conflicting_reservations'):
+            return self._conflicting_reservations
 
         from logistics.models import SupplyReservation
+        from logistics.availability import supply_conflicts
 
-        liste_reservation = SupplyReservation.objects.exclude(pk=self.pk).exclude(deleted=True).filter(status__in=['1_asking', '2_online'], end_date__gt=self.start_date, start_date__lt=self.end_date)
+        conflicts = supply_conflicts(self.lines.select_related('supply'), self.start_date, self.end_date, exclude_pk=self.pk)
 
-        conflicts = []
+        reservations = SupplyReservation.objects.in_bulk([reservation_pk for (reservation_pk, __) in conflicts])
 
-        for other_reservation in liste_reservation:
-            for supplyline in other_reservation.lines.all():
-                try:
-                    myline = self.lines.get(supply=supplyline.supply)
+        return [(reservations[reservation_pk], supply) for (reservation_pk, supply) in conflicts]
+
+    def get_conflits(self):
 
-                    if myline.quantity + supplyline.quantity > supplyline.supply.quantity:
-                        conflicts.append((other_reservation, supplyline.supply))
-                except:
-                    pass
+        conflicts = self.get_conflicting_reservations()
 
         if not conflicts:
             return mark_safe(u'<span class="txt-color-green"><i class="fa fa-check"></i> {}</span>'.format(unicode(_('Pas de conflits !'))))
@@ -639,21 +675,8 @@ class _SupplyReservation(GenericModel, GenericModelWithLines, GenericDelayValida
         return retour
 
     def get_conflits_list(self):
-        from logistics.models import SupplyReservation
-
-        liste_reservation = SupplyReservation.objects.exclude(pk=self.pk).exclude(deleted=True).filter(status__in=['1_asking', '2_online'], end_date__gt=self.start_date, start_date__lt=self.end_date)
-
-        conflicts = []
-
-        for other_reservation in liste_reservation:
-            for supplyline in other_reservation.lines.all():
-                try:
-                    myline = self.lines.get(supply=supplyline.supply)
 
-                    if myline.quantity + supplyline.quantity > supplyline.supply.quantity:
-                        conflicts.append((other_reservation, supplyline.supply))
-                except:
-                    pass
+        conflicts = self.get_conflicting_reservations()
 
         if not conflicts:
             return u'<span class="txt-color-green"><i class="fa fa-check"></i></span>'
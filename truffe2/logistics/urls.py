@@ -7,6 +7,7 @@ urlpatterns = patterns(
     'logistics.views',
 
     url('room/search', 'room_search'),
+    url('room/available', 'room_available'),
     url('supply/search', 'supply_search'),
 
     url(r'^loanagreement/(?P<pk>[0-9]+)/pdf/', 'loanagreement_pdf'),
@@ -65,6 +65,36 @@ def room_search(request):
     return HttpResponse(json.dumps(retour))
 
 
+@login_required
+def room_available(request):
+    """Liste des salles ayant des créneaux libres pendant une période"""
+
+    from logistics.models import Room, RoomReservation
+    from generic.availability import free_slots_response
+
+    q = request.GET.get('q')
+    unit_pk = request.GET.get('unit_pk', "-1") or "-1"
+
+    rooms = Room.objects.filter(active=True, deleted=False).select_related('unit').order_by('title')
+
+    if q:
+        rooms = rooms.filter(title__icontains=q)
+
+    if unit_pk == "-1":
+        rooms = rooms.filter(allow_externals=True)
+    else:
+        from units.models import Unit
+        get_object_or_404(Unit, pk=unit_pk)
+
+        dummy = RoomReservation()
+        update_current_unit(request, unit_pk)
+
+        if not dummy.rights_can('CREATE', request.user):
+            raise Http404
+
+    return free_slots_response(request, rooms, RoomReservation, 'room', lambda room: {'id': room.pk, 'text': room.title, 'unit': str(room.unit)})
+
+
 @login_required
 def supply_search(request):
 
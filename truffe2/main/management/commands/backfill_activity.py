@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+from django.core.management.base import BaseCommand
+
+
+from generic.models import GENERICS_MODELS
+from main.models import ActivityEntry
+
+
+class Command(BaseCommand):
+    help = 'Fill the activity stream with log entries written before it existed'
+
+    def handle(self, *args, **options):
+
+        total = 0
+
+        for key, (model_class, logging_class) in GENERICS_MODELS.iteritems():
+
+            already_done = set(ActivityEntry.objects.filter(model_key=key).values_list('log_pk', flat=True))
+
+            units = {}
+            entries = []
+
+            for log in logging_class.objects.select_related('object').order_by('pk'):
+
+                if log.pk in already_done:
+                    continue
+
+                if log.object_id not in units:
+                    units[log.object_id] = ActivityEntry.get_unit_of(log.object)
+
+                entries.append(ActivityEntry(model_key=key, object_pk=log.object_id, log_pk=log.pk, who_id=log.who_id, what=log.what, when=log.when, extra_data=log.extra_data, unit_id=units[log.object_id]))
+
+            ActivityEntry.objects.bulk_create(entries, batch_size=500)
+
+            if entries:
+                print "{}: {} entrie(s) added".format(key, len(entries))
+
+            total += len(entries)
+
+        print "{} entrie(s) added".format(total)
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from django.db import models
-from generic.models import GenericModel, GenericStateModel, FalseFK, SearchableModel
+from generic.models import GenericModel, GenericStateModel, FalseFK, SearchableModel, GenericLogEntry
 from django.utils.translation import ugettext_lazy as _
 from django.core.urlresolvers import reverse
 
@@ -329,6 +329,92 @@ class Signature(models.Model):
         return self.document_sha == self.document.sha
 
 
+class ActivityEntry(models.Model):
+    """Flux d'activité unifié: une ligne par entrée écrite dans un des <Model>Logging"""
+
+    model_key = models.CharField(max_length=255)
+    object_pk = models.PositiveIntegerField()
+    log_pk = models.PositiveIntegerField()
+
+    who = models.ForeignKey('users.TruffeUser')
+    what = models.CharField(max_length=64, choices=GenericLogEntry.LOG_TYPES)
+    when = models.DateTimeField(db_index=True)
+    extra_data = models.TextField(blank=True)
+
+    unit = models.ForeignKey('units.Unit', blank=True, null=True)
+
+    class Meta:
+        index_together = [
+            ('who', 'when'),
+            ('unit', 'when'),
+            ('model_key', 'object_pk'),
+        ]
+        unique_together = (('model_key', 'log_pk'),)
+
+    @staticmethod
+    def get_unit_of(obj):
+        """Retourne l'unité liée à un objet générique (directement ou via son centre de coût)"""
+
+        if hasattr(obj, 'MetaData') and getattr(obj.MetaData, 'has_unit', False) and getattr(obj, 'unit_id', None):
+            return obj.unit_id
+
+        if getattr(obj, 'costcenter', None):
+            return obj.costcenter.unit_id
+
+        return None
+
+    @staticmethod
+    def record(log_entry):
+        """Ajoute une entrée dans le flux d'activité depuis une entrée de logging"""
+
+        model_key = getattr(log_entry.__class__, '_t2_model_key', None)
+
+        if not model_key:
+            return None
+
+        return ActivityEntry.objects.create(model_key=model_key, object_pk=log_entry.object_id, log_pk=log_entry.pk, who_id=log_entry.who_id, what=log_entry.what, when=log_entry.when, extra_data=log_entry.extra_data, unit_id=ActivityEntry.get_unit_of(log_entry.object))
+
+    @staticmethod
+    def resolve(entries):
+        """Attache les objets liés à une liste d'entrées, avec une requête par type de modèle"""
+
+        from generic.models import GENERICS_MODELS
+
+        entries = list(entries)
+
+        pks_per_key = {}
+
+        for entry in entries:
+            pks_per_key.setdefault(entry.model_key, set()).add(entry.object_pk)
+
+        objects_per_key = {}
+
+        for key, pks in pks_per_key.iteritems():
+            if key in GENERICS_MODELS:
+                objects_per_key[key] = GENERICS_MODELS[key][0].objects.in_bulk(list(pks))
+            else:
+                objects_per_key[key] = {}
+
+        for entry in entries:
+            entry.object = objects_per_key[entry.model_key].get(entry.object_pk)
+
+        return [entry for entry in entries if entry.object is not None]
+
+    @staticmethod
+    def feed(user=None, unit=None, limit=100):
+        """Retourne les dernières entrées du flux, éventuellement filtrées par utilisateur ou par unité"""
+
+        entries = ActivityEntry.objects.select_related('who').order_by('-when')
+
+        if user:
+            entries = entries.filter(who=user)
+
+        if unit:
+            entries = entries.filter(unit=unit)
+
+        return ActivityEntry.resolve(entries[:limit])
+
+
 class _File(GenericModel, AgepolyEditableModel, SearchableModel):
 
     class MetaRightsUniyt(AgepolyEditableModel.MetaRightsAgepoly):
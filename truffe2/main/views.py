@@ -6,7 +6,6 @@ from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import InvalidPage, Paginator
 from django.utils.timezone import now
-from django.db import connection
 from django.core.urlresolvers import reverse
 from django.contrib import messages
 from django.utils.translation import ugettext_lazy as _
@@ -204,6 +203,14 @@ def home(request):
         if box not in user_order:
             ordered_boxes_to_show.append(box)
 
+    from django.db.models.query import QuerySet
+    from generic.models import GenericModel
+
+    # Compute 'new' badges for all boxes at once
+    for key, value in data.items():
+        if isinstance(value, (list, QuerySet)):
+            data[key] = GenericModel.prefetch_unseen(value, request.user)
+
     data.update({'boxes_to_show': ordered_boxes_to_show})
 
     from main.models import SignableDocument
@@ -218,7 +225,7 @@ def home(request):
 @login_required
 def get_to_moderate(request):
 
-    from generic.models import moderable_things
+    from generic.models import moderable_things, GenericModel
 
     liste = {}
 
@@ -228,7 +235,7 @@ def get_to_moderate(request):
         moderable = filter(lambda x: x.rights_can('VALIDATE', request.user), moderable)
 
         if moderable:
-            liste[model_class] = moderable
+            liste[model_class] = GenericModel.prefetch_unseen(moderable, request.user)
 
     return render(request, 'main/to_moderate.html', {'liste': liste})
 
@@ -262,25 +269,14 @@ def last_100_logging_entries(request):
     if not request.user.is_superuser:
         raise Http404
 
-    cursor = connection.cursor()
-
-    from generic.models import GENERICS_MODELS
-
-    query = """
-        SELECT * FROM (
-            {}
-        ) as _ ORDER BY `when` DESC limit 100""".format(
-            ' UNION ALL '.join(
-                ["""( SELECT *, '{}' as model_id from {} order by `when` desc limit 100)""".format(key, GENERICS_MODELS[key][1]._meta.db_table) for key in GENERICS_MODELS]
-            )
-        )
-    cursor.execute(query)
+    from main.models import ActivityEntry
+    from units.models import Unit
+    from users.models import TruffeUser
 
-    data = []
+    user = get_object_or_404(TruffeUser, pk=request.GET['user']) if request.GET.get('user') else None
+    unit = get_object_or_404(Unit, pk=request.GET['unit']) if request.GET.get('unit') else None
 
-    for row in cursor.fetchall():
-        log_pk, when, extra_data, who_pk, what, obj_pk, key = row
-        data.append(GENERICS_MODELS[key][1].objects.get(pk=log_pk))
+    data = ActivityEntry.feed(user=user, unit=unit)
 
     return render(request, 'main/last_100_logging_entries.html', {'data': data})
 
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+from django.db import transaction
+from django.utils.translation import ugettext_lazy as _
+
+from app.ldaputils import get_attrs_of_scipers
+from generic.search import update_search_index
+from users.models import TruffeUser
+
+import json
+import re
+
+
+def parse_import_file(data):
+    """Return the list of (username, payed_fees) of an exported file (a json list of usernames or of (username, payed_fees)). Raise ValueError if the file cannot be read."""
+
+    rows = []
+
+    for user_data in json.loads(data):
+        if isinstance(user_data, (int, str, unicode)):
+            rows.append((unicode(user_data), False))
+        elif type(user_data) is list and user_data:
+            rows.append((unicode(user_data[0]), len(user_data) > 1 and bool(user_data[1])))
+
+    return rows
+
+
+def parse_import_list(data, payed_fees):
+    """Return the list of (username, payed_fees) of a list of usernames, one per line"""
+    return [(username, payed_fees) for username in [line.strip() for line in data.split('\n')] if username]
+
+
+def resolve_users(usernames):
+    """Return a dict username -> user for the usernames and the list of pks of users created (with one batch LDAP lookup and one insert) for unknown scipers.
+
+    Created users are not in the search index yet: call update_search_index once the transaction is committed."""
+
+    usernames = set([username.strip() for username in usernames if username.strip()])
+
+    users = dict((user.username, user) for user in TruffeUser.objects.filter(username__in=usernames))
+
+    missing = [username for username in usernames if username not in users and re.match('^\d{6}$', username)]
+    created = []
+
+    if missing:
+        people = get_attrs_of_scipers(missing)
+
+        new_users = []
+
+        for username in missing:
+            user = TruffeUser(username=username, is_active=True)
+            user.last_name, user.first_name, user.email = people[username]
+            new_users.append(user)
+
+        TruffeUser.objects.bulk_create(new_users)
+
+        # bulk_create doesn't set pks: reload users
+        for user in TruffeUser.objects.filter(username__in=missing):
+            created.append(user.pk)
+            users[user.username] = user
+
+    return (users, created)
+
+
+def import_memberships(memberset, rows, who):
+    """Add members to a memberset, rows being a list of (username, payed_fees).
+
+    Users and current memberships are resolved with set queries, then new users and memberships are inserted in one transaction with a single log entry.
+    Return the report, a list of (level, user or username, message) for each row."""
+
+    from members.models import Membership, MemberSetLogging
+
+    report = []
+
+    with transaction.atomic():
+        (users, created) = resolve_users([username for (username, __) in rows])
+
+        current_members = set(memberset.membership_set.filter(end_date=None, user__in=[user.pk for user in users.values()]).values_list('user', flat=True))
+
+        new_memberships = []
+        edition_extra_data = {}
+
+        for username, payed_fees in rows:
+            user = users.get(username.strip())
+
+            if not user:
+                report.append(('danger', username, _(u'Impossible de créer l\'utilisateur')))
+            elif user.pk in current_members:
+                report.append(('warning', user, _(u'L\'utilisateur est déjà membre de ce groupe')))
+            else:
+                current_members.add(user.pk)
+                new_memberships.append(Membership(group=memberset, user=user, payed_fees=payed_fees))
+                edition_extra_data[user.get_full_name()] = ["None", "Membre"]
+                report.append(('success', user, _(u'Utilisateur ajouté avec succès')))
+
+        if new_memberships:
+            Membership.objects.bulk_create(new_memberships)
+            MemberSetLogging(who=who, what='edited', object=memberset, extra_data=json.dumps({'edited': edition_extra_data})).save()
+
+    update_search_index(TruffeUser, created)
+
+    return report
@@ -2,7 +2,8 @@
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import Http404, HttpResponse
+from django.db.models import Q
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render, redirect
 from django.utils.timezone import now
 from django.utils.translation import ugettext_lazy as _
@@ -11,14 +12,18 @@ from django.conf import settings
 
 
 from app.ldaputils import get_attrs_of_sciper
+from app.utils import build_etag, cached_response
 from members.forms2 import MembershipAddForm, MembershipImportForm, MembershipImportListForm
+from members.imports import import_memberships, parse_import_file, parse_import_list
 from generic.datatables import generic_list_json
 from users.models import TruffeUser
 
 
+import datetime
 import json
-import re
+import pytz
 import string
+import time
 import uuid
 
 
@@ -144,7 +149,7 @@ def export_members(request, pk):
 
 @login_required
 def import_members(request, pk):
-    from members.models import MemberSet, Membership, MemberSetLogging
+    from members.models import MemberSet
 
     memberset = get_object_or_404(MemberSet, pk=pk)
     if not memberset.rights_can('EDIT', request.user):
@@ -157,43 +162,14 @@ def import_members(request, pk):
 
         if form.is_valid():
 
-            edition_extra_data = {}
             try:
-                imp_file = json.loads(request.FILES['imported'].read())
-                for user_data in imp_file:
-                    if isinstance(user_data, (int, str, unicode)):
-                        username = str(user_data)
-                        fees = False
-                    elif type(user_data) is list:
-                        username = user_data[0]
-                        fees = len(user_data) > 1 and user_data[1]
-                    else:
-                        continue
-
-                    try:
-                        user = TruffeUser.objects.get(username=username)
-                    except TruffeUser.DoesNotExist:
-                        if re.match('^\d{6}$', username):
-                            user = TruffeUser(username=username, is_active=True)
-                            user.last_name, user.first_name, user.email = get_attrs_of_sciper(username)
-                            user.save()
-                        else:
-                            logs.append(('danger', username, _(u'Impossible de créer l\'utilisateur')))
-                            user = None
-
-                    if user:
-
-                        if memberset.membership_set.filter(user=user, end_date=None).exists():
-                            logs.append(('warning', user, _(u'L\'utilisateur est déjà membre de ce groupe')))
-                        else:
-                            # Copy the fees status if asked
-                            payed_fees = form.cleaned_data.get('copy_fees_status', False) and fees
-                            Membership(group=memberset, user=user, payed_fees=payed_fees).save()
-                            logs.append(('success', user, _(u'Utilisateur ajouté avec succès')))
-                            edition_extra_data[user.get_full_name()] = ["None", "Membre"]
-                            MemberSetLogging(who=request.user, what='edited', object=memberset, extra_data=json.dumps({'edited': edition_extra_data})).save()
+                rows = parse_import_file(request.FILES['imported'].read())
             except ValueError:
                 logs.append(('danger', _(u'ERREUR'), _(u'Le fichier ne peut pas être lu correctement, l\'import a été annulé')))
+            else:
+                # Copy the fees status if asked
+                copy_fees = form.cleaned_data.get('copy_fees_status', False)
+                logs = import_memberships(memberset, [(username, copy_fees and fees) for (username, fees) in rows], request.user)
 
     else:
         form = MembershipImportForm(request.user, memberset)
@@ -204,7 +180,7 @@ def import_members(request, pk):
 
 @login_required
 def import_members_list(request, pk):
-    from members.models import MemberSet, Membership, MemberSetLogging
+    from members.models import MemberSet
 
     memberset = get_object_or_404(MemberSet, pk=pk)
     if not memberset.rights_can('EDIT', request.user):
@@ -216,34 +192,7 @@ def import_members_list(request, pk):
         form = MembershipImportListForm(request.POST, request.FILES)
 
         if form.is_valid():
-
-            edition_extra_data = {}
-
-            for username in form.cleaned_data['data'].split('\n'):
-                username = username.strip()
-
-                if username:
-
-                    try:
-                        user = TruffeUser.objects.get(username=username)
-                    except TruffeUser.DoesNotExist:
-                        if re.match('^\d{6}$', username):
-                            user = TruffeUser(username=username, is_active=True)
-                            user.last_name, user.first_name, user.email = get_attrs_of_sciper(username)
-                            user.save()
-                        else:
-                            logs.append(('danger', username, _(u'Impossible de créer l\'utilisateur')))
-                            user = None
-
-                    if user:
-                        if memberset.membership_set.filter(user=user, end_date=None).exists():
-                            logs.append(('warning', user, _(u'L\'utilisateur est déjà membre de ce groupe')))
-                        else:
-                            Membership(group=memberset, user=user, payed_fees=form.cleaned_data['fee_status']).save()
-                            logs.append(('success', user, _(u'Utilisateur ajouté avec succès')))
-                            edition_extra_data[user.get_full_name()] = ["None", "Membre"]
-
-            MemberSetLogging(who=request.user, what='edited', object=memberset, extra_data=json.dumps({'edited': edition_extra_data})).save()
+            logs = import_memberships(memberset, parse_import_list(form.cleaned_data['data'], form.cleaned_data['fee_status']), request.user)
 
     else:
         form = MembershipImportListForm()
@@ -271,6 +220,68 @@ def memberset_info_api(request, pk):
     return render(request, 'members/memberset/info_api.html', {'obj': memberset, 'key_changed': key_changed, 'website_path': settings.WEBSITE_PATH})
 
 
+def memberset_api_members(request, memberset):
+    """GET side of memberset_api: the current members or, with since (a timestamp), the memberships added or removed since then.
+
+    Results are ordered and can be paginated with cursor (the 'next' value of the previous page) and limit. The content is streamed, with an ETag based on the last modification of the memberset."""
+
+    try:
+        since = float(request.GET['since']) if request.GET.get('since') else None
+        since_date = datetime.datetime.fromtimestamp(since, pytz.utc) if since is not None else None
+        cursor = int(request.GET.get('cursor') or 0)
+        limit = int(request.GET['limit']) if request.GET.get('limit') else None
+    except (ValueError, OverflowError):
+        return HttpResponse(json.dumps({'error': 'WRONG_PARAMETER'}), content_type='application/json')
+
+    if limit is not None:
+        limit = max(1, min(limit, settings.MEMBERSET_API_MAX_PAGE_SIZE))
+
+    # Taken before the query, to be used as the next since without missing changes
+    timestamp = time.time()
+
+    memberships = memberset.membership_set.filter(pk__gt=cursor).select_related('user').order_by('pk')
+
+    if since is None:
+        memberships = memberships.filter(end_date=None)
+    else:
+        memberships = memberships.filter(Q(start_date__gt=since_date) | Q(end_date__gt=since_date))
+
+    def member_data(member):
+
+        data = {
+            'sciper': member.user.username,
+            'added_date': str(member.start_date)
+        }
+
+        if memberset.handle_fees:
+            data['payed_fees'] = member.payed_fees
+
+        if since is not None:
+            data['action'] = 'removed' if member.end_date else 'added'
+
+        return data
+
+    def content():
+        next_cursor = None
+        last_pk = None
+
+        yield '{"timestamp": %s, "members": [' % (json.dumps(timestamp),)
+
+        for i, member in enumerate(memberships[:limit + 1] if limit else memberships.iterator()):
+            if limit and i == limit:
+                next_cursor = last_pk
+                break
+
+            yield (', ' if i else '') + json.dumps(member_data(member))
+            last_pk = member.pk
+
+        yield '], "next": %s}' % (json.dumps(next_cursor),)
+
+    etag = build_etag(memberset.pk, memberset.get_last_edit_date(), memberset.handle_fees, since, cursor, limit)
+
+    return cached_response(request, lambda: StreamingHttpResponse(content(), content_type='application/json'), etag=etag)
+
+
 @csrf_exempt
 def memberset_api(request, pk):
     from members.models import MemberSet, MemberSetLogging, Membership
@@ -293,22 +304,7 @@ def memberset_api(request, pk):
     result = {'error': 'WRONG_METHOD'}
 
     if request.method == 'GET':
-
-        result = []
-
-        for member in memberset.membership_set.filter(end_date=None):
-
-            data = {
-                'sciper': member.user.username,
-                'added_date': str(member.start_date)
-            }
-
-            if memberset.handle_fees:
-                data['payed_fees'] = member.payed_fees
-
-            result.append(data)
-
-        result = {'members': result}
+        return memberset_api_members(request, memberset)
 
     if request.method in ['PUT', 'POST', 'DELETE']:
 
@@ -50,31 +50,129 @@ class ModelWithRight(object):
 
         return dummy.rights_can(right, user)
 
+    @classmethod
+    def rights_units_with(cls, right, user, year_to_link=None):
+        """Iterate over the units where the user has the right on a new object of the model (see static_rights_can), best ones first. Only units where the user may have rights are tested (see Unit.rights_candidates_for)."""
+
+        from units.models import Unit
+
+        for unit in Unit.rights_candidates_for(user):
+            if cls.static_rights_can(right, user, unit, year_to_link):
+                yield unit
+
     def rights_expire(self):
         """Mark cache as invalid"""
         cache_key_last = 'right~last_%s.%s_%s' % (inspect.getmodule(self).__name__, self.__class__.__name__, self.pk or 'DUMMY')
         cached_last = time.time()
         cache.set(cache_key_last, cached_last)
 
-    def rights_can(self, right, user):
+        # Rights on the object may have changed (eg. status switch): the cached sets of objects too
+        self.__class__.rights_expire_model()
 
-        from accounting_core.utils import AccountingYearLinked
+    @classmethod
+    def rights_expire_model(cls):
+        """Mark the cached sets of objects (see rights_objects_with) as invalid. Needed when rights on an object may have changed (edition, status switch: see rights_expire) or when an object becomes a candidate (creation, restoration)."""
+        cache.set('right~model_%s.%s' % (inspect.getmodule(cls).__name__, cls.__name__), time.time())
 
-        if right not in self.MetaRights.rights or not hasattr(self, 'rights_can_%s' % (right,)):
-            return False
+    @classmethod
+    def rights_linked_unit_lookup(cls):
+        """Return the lookup to the linked unit (eg. costcenter__unit), or None if the model isn't linked to an unit"""
 
-        if user.is_superuser:
-            return True
+        prop = cls.MetaRights.linked_unit_property
 
-        if not user.pk:
-            return False
+        if not prop or prop.split('.')[0] not in [field.name for field in cls._meta.fields]:
+            return None
 
-        # A cache system is used, for performances
+        return prop.replace('.', '__')
 
-        # To be able to clear cache, a timestamp is also cached with the lasted
-        # modification on the object (cache_key_last) and on user's rights
-        # (cache_key_user_last). If the computed value is olded than those two
-        # values, cache is not taken into account
+    @classmethod
+    def rights_candidates_with(cls, user, units_pks):
+        """Return the queryset of objects on which the user may have rights: objects not deleted and, if units_pks is not None, linked to one of those units, without unit, created by the user or linked to him"""
+
+        fields = [field.name for field in cls._meta.fields]
+
+        candidates = cls.objects.all()
+
+        if 'deleted' in fields:
+            candidates = candidates.filter(deleted=False)
+
+        unit_lookup = cls.rights_linked_unit_lookup()
+
+        if units_pks is None or not unit_lookup:
+            return candidates
+
+        filters = models.Q(**{'%s__in' % (unit_lookup, ): units_pks}) | models.Q(**{'%s__isnull' % (unit_lookup, ): True})
+
+        for user_property in set(['creator', cls.MetaRights.linked_user_property]):
+            if user_property in fields:
+                filters |= models.Q(**{user_property: user})
+
+        return candidates.filter(filters)
+
+    @classmethod
+    def rights_objects_with(cls, right, user):
+        """Return a queryset of the objects on which the user has the right, to filter in the database (eg. logs with object__in).
+
+        Candidates are selected in the database, from the units where the user has accesses (see Unit.rights_candidates_for), and rights_can is run only on them. Refused objects are cached per user and model, with the last pk checked: newer objects are left out until the cache is invalidated (see rights_expire_model).
+        Refused pks are cached in chunks (settings.RIGHTS_OBJECTS_CHUNK_SIZE pks per key), to stay under the size limit of cached values."""
+
+        from units.models import Unit
+
+        cache_key = 'right~objects_%s.%s_%s_%s' % (inspect.getmodule(cls).__name__, cls.__name__, user.pk, right)
+        cache_keys_last = ['right~model_%s.%s' % (inspect.getmodule(cls).__name__, cls.__name__), 'right~user_%s' % (user.pk, ), 'units~access_last']
+
+        cached_values = cache.get_many([cache_key] + cache_keys_last)
+        cached_value = cached_values.get(cache_key)
+
+        refused_pks = None
+
+        if cached_value is not None and all([cached_value[0] >= (cached_values.get(key) or 0) for key in cache_keys_last]) and not settings.DEBUG:
+            (cached_time, units_pks, last_pk, nb_chunks) = cached_value
+
+            chunks_keys = ['%s_%s' % (cache_key, i) for i in range(nb_chunks)]
+            cached_chunks = cache.get_many(chunks_keys)
+
+            # Chunks must come from the same computation
+            if all([key in cached_chunks and cached_chunks[key][0] == cached_time for key in chunks_keys]):
+                refused_pks = [pk for key in chunks_keys for pk in cached_chunks[key][1]]
+
+        if refused_pks is None:
+            current_time = time.time()
+
+            if user.is_superuser:
+                units_pks = None
+            else:
+                units_pks = [unit.pk for unit in Unit.rights_candidates_for(user)]
+
+                # Accesses in the root unit may give rights on objects of any unit
+                if settings.ROOT_UNIT_PK in units_pks:
+                    units_pks = None
+
+            candidates = cls.rights_candidates_with(user, units_pks)
+
+            if cls.rights_linked_unit_lookup():
+                candidates = candidates.select_related(cls.rights_linked_unit_lookup())
+
+            candidates = list(candidates)
+            allowed_pks = set([obj.pk for obj in cls.rights_can_many(right, user, candidates)])
+
+            last_pk = max([obj.pk for obj in candidates] or [0])
+            refused_pks = [obj.pk for obj in candidates if obj.pk not in allowed_pks]
+
+            chunk_size = settings.RIGHTS_OBJECTS_CHUNK_SIZE
+            chunks = [refused_pks[i:i + chunk_size] for i in range(0, len(refused_pks), chunk_size)]
+
+            to_cache = dict(('%s_%s' % (cache_key, i), (current_time, chunk)) for (i, chunk) in enumerate(chunks))
+            to_cache[cache_key] = (current_time, units_pks, last_pk, len(chunks))
+
+            cache.set_many(to_cache, 600)
+
+        return cls.rights_candidates_with(user, units_pks).filter(pk__lte=last_pk).exclude(pk__in=refused_pks)
+
+    def rights_cache_keys(self, right, user):
+        """Return the keys used to cache a right: the value, the last modification of the object and the last modification of user's rights"""
+
+        from accounting_core.utils import AccountingYearLinked
 
         if hasattr(self, 'unit') and self.unit and self.unit.pk:
             unit_pk = self.unit.pk
@@ -95,6 +193,62 @@ class ModelWithRight(object):
         cache_key_last = 'right~last_%s.%s_%s' % (inspect.getmodule(self).__name__, self.__class__.__name__, self.pk or 'DUMMY')
         cache_key_user_last = 'right~user_%s' % (user.pk, )
 
+        return (cache_key, cache_key_last, cache_key_user_last)
+
+    @classmethod
+    def rights_can_many(cls, right, user, objects):
+        """Return the list of objects on which the user has the right, like rights_can but fetching values already cached at once"""
+
+        objects = list(objects)
+
+        if user.is_superuser:
+            return objects
+
+        if not user.pk:
+            return []
+
+        keys = dict((obj.pk, obj.rights_cache_keys(right, user)) for obj in objects)
+        cached_values = cache.get_many(set([key for obj_keys in keys.values() for key in obj_keys]))
+
+        retour = []
+
+        for obj in objects:
+            (cache_key, cache_key_last, cache_key_user_last) = keys[obj.pk]
+
+            cached_value = cached_values.get(cache_key)
+            cached_last = cached_values.get(cache_key_last)
+            cached_user_last = cached_values.get(cache_key_user_last)
+
+            if cached_value is not None and cached_last is not None and cached_user_last is not None and cached_value[0] >= cached_last and cached_value[0] >= cached_user_last and not settings.DEBUG:
+                allowed = cached_value[1]
+            else:
+                allowed = obj.rights_can(right, user)
+
+            if allowed:
+                retour.append(obj)
+
+        return retour
+
+    def rights_can(self, right, user):
+
+        if right not in self.MetaRights.rights or not hasattr(self, 'rights_can_%s' % (right,)):
+            return False
+
+        if user.is_superuser:
+            return True
+
+        if not user.pk:
+            return False
+
+        # A cache system is used, for performances
+
+        # To be able to clear cache, a timestamp is also cached with the lasted
+        # modification on the object (cache_key_last) and on user's rights
+        # (cache_key_user_last). If the computed value is olded than those two
+        # values, cache is not taken into account
+
+        (cache_key, cache_key_last, cache_key_user_last) = self.rights_cache_keys(right, user)
+
         cached_value = cache.get(cache_key)
 
         cached_last = cache.get(cache_key_last)
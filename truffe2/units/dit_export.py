@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+from django.conf import settings
+from django.utils.encoding import smart_str
+
+import csv
+import importlib
+import os
+import shutil
+import subprocess
+
+
+HEADER = ["Scriper", "GroupeId", "RoleId", "botweb", "Prenom", "Nom", "GroupeNom", "RoleNom", "Type"]
+
+
+def build_dit_rows():
+    """Return the rows (without header) of the export of accreds and members for the DIT, with a fixed number of queries.
+
+    For each unit, accreds come first (by role order), then members of member sets generating accreds. A user is exported once per unit."""
+
+    from members.models import Membership
+    from units.models import Unit, Accreditation
+
+    units = [u for u in Unit.objects.filter(deleted=False).exclude(id_epfl=None).order_by('pk') if u.id_epfl]
+
+    accreds_per_unit = dict((u.pk, []) for u in units)
+    memberships_per_unit = dict((u.pk, []) for u in units)
+
+    for a in Accreditation.objects.filter(unit__in=accreds_per_unit.keys(), end_date=None).exclude(no_epfl_sync=True).select_related('user', 'role').order_by('role__order', 'pk'):
+        accreds_per_unit[a.unit_id].append(a)
+
+    for mship in Membership.objects.filter(group__unit__in=memberships_per_unit.keys(), group__status='1_active', group__generates_accred=True, end_date=None).select_related('user', 'group', 'group__generated_accred_type').order_by('group', 'pk'):
+        memberships_per_unit[mship.group.unit_id].append(mship)
+
+    rows = []
+
+    for u in units:
+
+        already_accredited = set()
+
+        # Toutes les accreds encore valides
+        for a in accreds_per_unit[u.pk]:
+
+            if not a.role.id_epfl or not a.user.username_is_sciper() or a.user_id in already_accredited:
+                continue
+
+            already_accredited.add(a.user_id)
+
+            rows.append((smart_str(a.user.username.strip()), smart_str(u.id_epfl), smart_str(a.role.id_epfl), "False" if a.hidden_in_epfl else "True", smart_str(a.user.first_name), smart_str(a.user.last_name), smart_str(u.name), smart_str(a.role.name), 'Acred'))
+
+        # Tous les membres encore actifs
+        for mship in memberships_per_unit[u.pk]:
+            mset = mship.group
+
+            if not mset.generated_accred_type or not mset.generated_accred_type.id_epfl or not mship.user.username_is_sciper() or mship.user_id in already_accredited:
+                continue
+
+            already_accredited.add(mship.user_id)
+
+            rows.append((smart_str(mship.user.username.strip()), smart_str(u.id_epfl), smart_str(mset.generated_accred_type.id_epfl), "True" if mset.ldap_visible else "False", smart_str(mship.user.first_name), smart_str(mship.user.last_name), smart_str(u.name), smart_str(mset.generated_accred_type.name), 'Membre'))
+
+    return rows
+
+
+def read_dit_rows(path):
+    """Return the rows (without header) of a previous export, or an empty list if there is none"""
+
+    if not os.path.isfile(path):
+        return []
+
+    with open(path, 'rb') as csvfile:
+        return [tuple(row) for row in list(csv.reader(csvfile, delimiter='\t'))[1:]]
+
+
+def diff_dit_rows(old_rows, new_rows):
+    """Return (added rows, removed rows) between two exports. A changed row is removed then added."""
+
+    old_set = set(old_rows)
+    new_set = set(new_rows)
+
+    return ([row for row in new_rows if row not in old_set], [row for row in old_rows if row not in new_set])
+
+
+def write_dit_rows(path, header, rows):
+    """Write an export, in a temporary file first to never leave a partial file"""
+
+    with open('{}.tmp'.format(path), 'wb') as csvfile:
+        writer = csv.writer(csvfile, delimiter='\t')
+        writer.writerow(header)
+
+        for row in rows:
+            writer.writerow(row)
+
+    os.rename('{}.tmp'.format(path), path)
+
+
+class SftpUploader(object):
+    """Upload files with sftp (settings.DIT_SFTP_TARGET)"""
+
+    def __init__(self, target=None):
+        self.target = target or settings.DIT_SFTP_TARGET
+
+    def upload(self, path):
+        process = subprocess.Popen(['sftp', '-b', '-', self.target], stdin=subprocess.PIPE)
+        process.communicate('put {}\n'.format(path))
+
+        if process.returncode:
+            raise Exception('sftp exited with code {}'.format(process.returncode))
+
+
+class DirectoryUploader(object):
+    """Copy files to a local folder (settings.DIT_UPLOAD_DIR). Used as a stand-in for the sftp server."""
+
+    def __init__(self, path=None):
+        self.path = path or settings.DIT_UPLOAD_DIR
+
+    def upload(self, path):
+        shutil.copy(path, os.path.join(self.path, os.path.basename(path)))
+
+
+def get_dit_uploader():
+    """Return the uploader, using the class set in settings.DIT_UPLOADER"""
+
+    module, name = settings.DIT_UPLOADER.rsplit('.', 1)
+    return getattr(importlib.import_module(module), name)()
@@ -2,61 +2,101 @@
 
 from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
+from django.db import transaction
 from django.utils.timezone import now
 
 
+from optparse import make_option
 import datetime
+import time
 
 
+from generic.search import update_search_index
 from notifications.utils import notify_people
-from units.models import Unit, AccreditationLog
+from units.models import Unit, Accreditation, AccreditationLog
 from users.models import TruffeUser
 
 
 class Command(BaseCommand):
     help = 'Do accreds timeout-related-stuff who should be done dailly'
 
+    option_list = BaseCommand.option_list + (
+        make_option('--dry-run', action='store_true', dest='dry_run', default=False, help='Only display what would be done'),
+    )
+
     def handle(self, *args, **options):
 
+        dry_run = options['dry_run']
+        start_time = time.time()
+
         days_before_warnings = [30, 15, 7, 3, 2, 1]
 
         system_user = TruffeUser.objects.get(pk=settings.SYSTEM_USER_PK)
 
-        # On travaille par unité
-        for u in Unit.objects.filter(deleted=False):
+        current_date = now()
+
+        to_warning = {}
+        to_delete = set()
+
+        # Nombre de jours avant l'expiration de toutes les accreds encore valides
+        for pk, renewal_date in Accreditation.objects.filter(end_date=None, unit__deleted=False).values_list('pk', 'renewal_date'):
+            delta = ((renewal_date + datetime.timedelta(days=365)) - current_date).days
+
+            # Faut-il supprimer l'accred ?
+            if delta <= 0:
+                to_delete.add(pk)
+
+            # Faut-il prévenir les responsables ?
+            if delta in days_before_warnings:
+                to_warning[pk] = delta
+
+        accreds = Accreditation.objects.filter(pk__in=list(to_delete) + to_warning.keys()).select_related('user', 'role', 'unit')
+
+        # Par unité: {unit: ({jours: [accreds]}, [accreds supprimées])}
+        per_unit = {}
+
+        for a in accreds:
+            warnings, deleted = per_unit.setdefault(a.unit, ({}, []))
+
+            if a.pk in to_warning:
+                warnings.setdefault(to_warning[a.pk], []).append(a)
+
+            if a.pk in to_delete:
+                deleted.append(a)
 
-            # Les destinataires
-            dest_users = u.users_with_access('INFORMATIQUE', no_parent=True)
+        print "{} accred(s) to delete, {} to warn about, in {} unit(s) ({:.2f}s)".format(len(to_delete), len(to_warning), len(per_unit), time.time() - start_time)
 
-            to_warning = {}
+        if dry_run:
+            for u, (warnings, deleted) in sorted(per_unit.items(), key=lambda (u, __): u.name):
+                for d, liste in sorted(warnings.items()):
+                    print u"{}: {} jour(s): {}".format(u, d, u', '.join([unicode(a) for a in liste]))
+                if deleted:
+                    print u"{}: supprimées: {}".format(u, u', '.join([unicode(a) for a in deleted]))
+            return
 
-            for d in days_before_warnings:
-                to_warning[d] = []
+        # Les destinataires (avant les suppressions, qui peuvent les concerner)
+        dest_users = Unit.users_with_access_by_unit([u.pk for u in per_unit.keys()], 'INFORMATIQUE', no_parent=True)
 
-            to_delete = []
+        deleted_accreds = [a for (__, deleted) in per_unit.values() for a in deleted]
 
-            # Toutes les accreds encore valides
-            for a in u.accreditation_set.filter(end_date=None):
+        if deleted_accreds:
+            with transaction.atomic():
+                Accreditation.objects.filter(pk__in=[a.pk for a in deleted_accreds]).update(end_date=current_date)
+                AccreditationLog.objects.bulk_create([AccreditationLog(accreditation=a, who=system_user, type='autodeleted') for a in deleted_accreds])
 
-                # Nombre de jours avant l'expiration
-                delta = ((a.renewal_date + datetime.timedelta(days=365)) - now()).days
+            TruffeUser.clear_rights_cache_of(set([a.user_id for a in deleted_accreds]))
 
-                # Faut-il supprimer l'accred ?
-                if delta <= 0:
-                    a.end_date = now()
-                    a.save()
+            # update() doesn't update the search index
+            update_search_index(Accreditation, [a.pk for a in deleted_accreds])
 
-                    AccreditationLog(accreditation=a, who=system_user, what='autodeleted').save()
+        print "Accreds deleted ({:.2f}s)".format(time.time() - start_time)
 
-                    to_delete.append(a)
+        for u, (warnings, deleted) in per_unit.iteritems():
 
-                # Faut-il prévenir les responsables ?
-                if delta in days_before_warnings:
-                    to_warning[delta].append(a)
+            for d, liste in warnings.iteritems():
+                notify_people(None, 'Accreds.Warning', 'accreds_warning', u, dest_users[u.pk], {'jours': d, 'accreds': map(lambda a: {'pk': a.pk, 'user': str(a.user), 'role': str(a.role)}, liste)})
 
-            for d in days_before_warnings:
-                if to_warning[d]:
-                    notify_people(None, 'Accreds.Warning', 'accreds_warning', u, dest_users, {'jours': d, 'accreds': map(lambda a: {'pk': a.pk, 'user': str(a.user), 'role': str(a.role)}, to_warning[d])})
+            if deleted:
+                notify_people(None, 'Accreds.Deleted', 'accreds_deleted', u, dest_users[u.pk], {'accreds': map(lambda a: {'pk': a.pk, 'user': str(a.user), 'role': str(a.role)}, deleted)})
 
-            if to_delete:
-                notify_people(None, 'Accreds.Deleted', 'accreds_deleted', u, dest_users, {'accreds': map(lambda a: {'pk': a.pk, 'user': str(a.user), 'role': str(a.role)}, to_delete)})
+        print "Notifications sent ({:.2f}s)".format(time.time() - start_time)
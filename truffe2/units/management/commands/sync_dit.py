@@ -2,64 +2,49 @@
 
 from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
-from django.utils.encoding import smart_str
 
-import csv
-import os
+from optparse import make_option
 
-from units.models import Unit
+from units.dit_export import HEADER, build_dit_rows, read_dit_rows, diff_dit_rows, write_dit_rows, get_dit_uploader
 
 
 class Command(BaseCommand):
     help = 'Sync accreds to DIT server'
 
-    def handle(self, *args, **options):
-
-        with open('/tmp/generateListAccredsForDIT', 'wb') as csvfile:
-
-            writer = csv.writer(csvfile, delimiter='\t')
-            writer.writerow(["Scriper", "GroupeId", "RoleId", "botweb", "Prenom", "Nom", "GroupeNom", "RoleNom", "Type"])
-
-            # On travaille par unité
-            for u in Unit.objects.filter(deleted=False).exclude(id_epfl=None):
+    option_list = BaseCommand.option_list + (
+        make_option('--delta', action='store_true', dest='delta', default=False, help='Also upload the changes since the previous export'),
+        make_option('--no-upload', action='store_false', dest='upload', default=True, help='Only write the export files'),
+    )
 
-                if not u.id_epfl:
-                    continue
-
-                already_accredited = []
-
-                # Toutes les accreds encore valides
-                for a in u.accreditation_set.filter(end_date=None).exclude(no_epfl_sync=True).order_by('role__order'):
+    def handle(self, *args, **options):
 
-                    if not a.role.id_epfl:
-                        continue
+        path = settings.DIT_EXPORT_FILE
 
-                    if not a.user.username_is_sciper():
-                        continue
+        # Rows of the last delta uploaded, used to compute the next one. Only advanced once a delta has been uploaded.
+        snapshot_path = '{}.snapshot'.format(path)
 
-                    if a.user in already_accredited:
-                        continue
+        old_rows = read_dit_rows(snapshot_path)
+        rows = build_dit_rows()
 
-                    already_accredited.append(a.user)
+        added, removed = diff_dit_rows(old_rows, rows)
 
-                    writer.writerow([a.user.username.strip(), u.id_epfl, a.role.id_epfl, "False" if a.hidden_in_epfl else "True", smart_str(a.user.first_name), smart_str(a.user.last_name), smart_str(u.name), smart_str(a.role.name), 'Acred'])
+        print "{} row(s), {} added, {} removed since the last delta".format(len(rows), len(added), len(removed))
 
-                # Tous les membres encore actifs
-                for mset in u.memberset_set.filter(status='1_active', generates_accred=True):
-                    role_id = mset.generated_accred_type.id_epfl
+        write_dit_rows(path, HEADER, rows)
 
-                    if not role_id:
-                        continue
+        to_upload = [path]
 
-                    for mship in mset.membership_set.filter(end_date=None):
-                        if not mship.user.username_is_sciper():
-                            continue
+        send_delta = options['delta'] and options['upload'] and (added or removed)
 
-                        if mship.user in already_accredited:
-                            continue
+        if send_delta:
+            write_dit_rows(settings.DIT_EXPORT_DELTA_FILE, HEADER + ["Action"], [row + ('add',) for row in added] + [row + ('remove',) for row in removed])
+            to_upload.append(settings.DIT_EXPORT_DELTA_FILE)
 
-                        already_accredited.append(mship.user)
+        if options['upload']:
+            uploader = get_dit_uploader()
 
-                        writer.writerow([mship.user.username.strip(), u.id_epfl, role_id, "True" if mset.ldap_visible else "False", smart_str(mship.user.first_name), smart_str(mship.user.last_name), smart_str(u.name), smart_str(mset.generated_accred_type.name), 'Membre'])
+            for upload_path in to_upload:
+                uploader.upload(upload_path)
 
-        os.system("echo put /tmp/generateListAccredsForDIT | sftp collecte@cadibatch.epfl.ch:agepoly/")
+        if send_delta:
+            write_dit_rows(snapshot_path, HEADER, rows)
@@ -2,12 +2,12 @@
 
 from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
 from django.utils.timezone import now
 
 
-import datetime
-
-
+from generic.search import update_search_index
 from units.models import Unit, AccreditationLog, Accreditation, Role
 from users.models import TruffeUser
 
@@ -22,30 +22,64 @@ class Command(BaseCommand):
         rlc_role = Role.objects.get(pk=settings.AUTO_RLC_GIVEN_ROLE)
         system_user = TruffeUser.objects.get(pk=settings.SYSTEM_USER_PK)
 
-        valids_accreds = []
+        current_date = now()
+
+        # Accreds wanted, by (user, display_name). The display name identifies the source unit and role.
+        desired = {}
+
+        for accred in Accreditation.objects.filter(end_date=None).filter(Q(unit=settings.ROOT_UNIT_PK, role__pk__in=settings.AUTO_RLC_ROOT_ROLES) | Q(unit__is_commission=True, role__pk__in=settings.AUTO_RLC_COMS_ROLES)).select_related('role', 'unit'):
+            key = (accred.user_id, u'{} {} ({})'.format(settings.AUTO_RLC_TAG, accred.get_role_or_display_name(), accred.unit))
+            desired[key] = max(desired.get(key, accred.renewal_date), accred.renewal_date)
+
+        # Accreds existing. Accreds with other settings (edited by hand) or duplicated are replaced.
+        existing = {}
+        to_close = []
+
+        for accred in Accreditation.objects.filter(end_date=None, unit=rlc_unit, display_name__startswith=settings.AUTO_RLC_TAG).order_by('pk'):
+            key = (accred.user_id, accred.display_name)
+
+            if key in desired and key not in existing and accred.role_id == rlc_role.pk and not accred.no_epfl_sync and accred.hidden_in_epfl and accred.hidden_in_truffe and not accred.need_validation:
+                existing[key] = accred
+            else:
+                to_close.append(accred)
+
+        to_create = [key for key in desired if key not in existing]
+
+        # Renewal dates follow the source accreds, grouped by date to update them with few queries
+        to_update = {}
+
+        for key, accred in existing.iteritems():
+            if accred.renewal_date != desired[key]:
+                to_update.setdefault(desired[key], []).append(accred.pk)
+
+        updated = sum([len(pks) for pks in to_update.values()])
 
-        def _do(unit, roles):
+        for key in to_create:
+            to_update.setdefault(desired[key], [])
 
-            for accred in unit.accreditation_set.filter(end_date=None, role__pk__in=roles):
+        with transaction.atomic():
 
-                rlc_accred, created = Accreditation.objects.get_or_create(unit=rlc_unit, user=accred.user, end_date=None, role=rlc_role, display_name=u'{} {} ({})'.format(settings.AUTO_RLC_TAG, accred.get_role_or_display_name(), unit), no_epfl_sync=False, hidden_in_epfl=True, hidden_in_truffe=True, need_validation=False)
+            Accreditation.objects.bulk_create([Accreditation(unit=rlc_unit, user_id=user_pk, role=rlc_role, display_name=display_name, no_epfl_sync=False, hidden_in_epfl=True, hidden_in_truffe=True, need_validation=False) for (user_pk, display_name) in to_create])
 
-                rlc_accred.renewal_date = accred.renewal_date
-                rlc_accred.save()
+            # bulk_create doesn't return pks: reload created accreds
+            created = [accred for accred in Accreditation.objects.filter(end_date=None, unit=rlc_unit, display_name__startswith=settings.AUTO_RLC_TAG).exclude(pk__in=[accred.pk for accred in existing.values() + to_close]) if (accred.user_id, accred.display_name) in desired]
 
-                if created:
-                    AccreditationLog(accreditation=rlc_accred, who=system_user, what='autocreated').save()
+            for accred in created:
+                to_update[desired[(accred.user_id, accred.display_name)]].append(accred.pk)
 
-                valids_accreds.append(rlc_accred)
+            # renewal_date is set on creation (auto_now_add): set it in a second time
+            for renewal_date, pks in to_update.iteritems():
+                if pks:
+                    Accreditation.objects.filter(pk__in=pks).update(renewal_date=renewal_date)
 
-        _do(Unit.objects.get(pk=settings.ROOT_UNIT_PK), settings.AUTO_RLC_ROOT_ROLES)
+            if to_close:
+                Accreditation.objects.filter(pk__in=[accred.pk for accred in to_close]).update(end_date=current_date)
 
-        for unit in Unit.objects.filter(is_commission=True):
-            _do(unit, settings.AUTO_RLC_COMS_ROLES)
+            AccreditationLog.objects.bulk_create([AccreditationLog(accreditation=accred, who=system_user, type='autocreated') for accred in created] + [AccreditationLog(accreditation=accred, who=system_user, type='autodeleted') for accred in to_close])
 
+        TruffeUser.clear_rights_cache_of(set([accred.user_id for accred in created + to_close]))
 
-        for old_accred in Accreditation.objects.filter(end_date=None, unit=rlc_unit, display_name__startswith=settings.AUTO_RLC_TAG).exclude(pk__in=map(lambda u: u.pk, valids_accreds)):
+        # bulk_create() and update() don't update the search index (renewal dates included, as the last edit date)
+        update_search_index(Accreditation, [pk for pks in to_update.values() for pk in pks] + [accred.pk for accred in to_close])
 
-            old_accred.end_date = now()
-            old_accred.save()
-            AccreditationLog(accreditation=old_accred, who=system_user, what='autodeleted').save()
+        print "{} accred(s) created, {} closed, {} renewal date(s) updated, {} unchanged".format(len(created), len(to_close), updated, len(existing) - updated)
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models
 from django.db.models import Q
 from django.utils.translation import ugettext_lazy as _
@@ -11,9 +12,15 @@ from rights.utils import AgepolyEditableModel, UnitEditableModel
 from users.models import TruffeUser
 
 import datetime
+import time
 from multiselectfield import MultiSelectField
 
 
+def units_access_expire():
+    """Mark the cached accesses in units (see Unit.users_with_access_by_unit) as invalid"""
+    cache.set('units~access_last', time.time())
+
+
 class _Unit(GenericModel, AgepolyEditableModel, SearchableModel):
 
     class MetaRightsAgepoly(AgepolyEditableModel.MetaRightsAgepoly):
@@ -226,19 +233,137 @@ Les unités sont organisées en arbre hiérarchique, avec le Comité de l'AGEPol
             return self.parent_hierarchique.is_user_in_groupe(user, access, True)
         return False
 
-    def users_with_access(self, access=None, no_parent=False):
+    @staticmethod
+    def rights_candidates_for(user):
+        """Return the list of units where the user may have rights, best ones first: units where the user is accredited (by role order), then their sub units (by depth and name).
+
+        Rights in units come from accreditations in the unit or in a parent unit, so other units don't need to be tested."""
+
+        from units.models import Unit
+
+        units = list(Unit.objects.filter(deleted=False).order_by('name'))
+
+        if user.is_superuser:
+            return units
+
+        units_by_pk = dict((unit.pk, unit) for unit in units)
+        childrens = {}
+
+        for unit in units:
+            childrens.setdefault(unit.parent_hierarchique_id, []).append(unit)
 
         retour = []
 
-        for accreditation in self.accreditation_set.filter(end_date=None):
-            if not accreditation.is_valid():
-                continue
+        for accreditation in user.accreditation_set.filter(end_date=None).order_by('role__order', 'unit__name'):
+            if accreditation.unit_id in units_by_pk and units_by_pk[accreditation.unit_id] not in retour:
+                retour.append(units_by_pk[accreditation.unit_id])
+
+        # Sub units, breadth first
+        for unit in retour:
+            for sub_unit in childrens.get(unit.pk, []):
+                if sub_unit not in retour:
+                    retour.append(sub_unit)
+
+        return retour
+
+    def users_with_access(self, access=None, no_parent=False):
+        """Return the users accredited in the unit with the access, in the unit or (unless no_parent) inherited from a parent unit. See users_with_access_by_unit."""
+        return self.users_with_access_by_unit([self.pk], access, no_parent)[self.pk]
+
+    @staticmethod
+    def users_with_access_by_unit(units_pks, access=None, no_parent=False):
+        """Return a dict unit pk -> list of users accredited in the unit with the access (like is_user_in_groupe), for many units at once.
+
+        Results are cached per unit and access, until an accreditation, a delegation, a role or a unit is changed (see units_access_expire and TruffeUser.clear_rights_cache_of)."""
+
+        accesses = sorted(access) if type(access) is list else [access]
+        cache_keys = dict((pk, 'units~access_%s_%s_%s' % (pk, ','.join([unicode(acc) for acc in accesses]), int(no_parent))) for pk in units_pks)
+
+        cached_last = cache.get('units~access_last')
+
+        if cached_last is None:
+            cached_last = time.time()
+            cache.set('units~access_last', cached_last)
+
+        cached_values = cache.get_many(cache_keys.values())
+
+        users_pks = {}
+
+        for pk, cache_key in cache_keys.iteritems():
+            if cache_key in cached_values and cached_values[cache_key][0] >= cached_last:
+                users_pks[pk] = cached_values[cache_key][1]
+
+        missing = [pk for pk in units_pks if pk not in users_pks]
+
+        if missing:
+            current_time = time.time()
+            computed = _Unit._compute_users_with_access(missing, access, no_parent)
+
+            cache.set_many(dict((cache_keys[pk], (current_time, computed[pk])) for pk in missing))
+            users_pks.update(computed)
+
+        users = TruffeUser.objects.in_bulk(set([user_pk for pks in users_pks.values() for user_pk in pks]))
 
-            if accreditation.user in retour:
-                continue
+        return dict((pk, [users[user_pk] for user_pk in users_pks[pk] if user_pk in users]) for pk in units_pks)
 
-            if not access or self.is_user_in_groupe(accreditation.user, access, no_parent=no_parent):  # To avoid duplicate code, check if access with other function
-                retour.append(accreditation.user)
+    @staticmethod
+    def _compute_users_with_access(units_pks, access=None, no_parent=False):
+        """Return a dict unit pk -> list of users pks for users_with_access_by_unit, with one query for units, one for accreditations and one for delegations"""
+
+        from units.models import Unit, Accreditation, AccessDelegation
+
+        accesses = access if type(access) is list else [access]
+        has_one_of = lambda values: any([acc in (values or []) for acc in accesses])
+
+        # The unit and, unless no_parent, its parents: accesses are inherited from accreditations in parents
+        chains = dict((pk, [pk]) for pk in units_pks)
+
+        if not no_parent:
+            parents = dict(Unit.objects.values_list('pk', 'parent_hierarchique'))
+
+            for chain in chains.values():
+                while parents.get(chain[-1]) and parents[chain[-1]] not in chain:
+                    chain.append(parents[chain[-1]])
+
+        all_units = set([pk for chain in chains.values() for pk in chain])
+
+        delegations = dict((pk, []) for pk in all_units)
+
+        if access:
+            for access_delegation in AccessDelegation.objects.filter(unit__in=all_units).exclude(deleted=True):
+                if has_one_of(access_delegation.access):
+                    delegations[access_delegation.unit_id].append(access_delegation)
+
+        accreditations = Accreditation.objects.filter(unit__in=all_units, end_date=None).select_related('role').order_by('pk')
+
+        if len(all_units) > len(units_pks):
+            # In parents, only accreditations of users accredited in the units matter
+            accreditations = accreditations.filter(user__in=Accreditation.objects.filter(unit__in=units_pks, end_date=None).values('user'))
+
+        def grants(accreditation, parent_mode):
+            if has_one_of(accreditation.role.access):
+                return True
+
+            return any([access_delegation.user_id in (None, accreditation.user_id) and access_delegation.role_id in (None, accreditation.role_id) and (not parent_mode or access_delegation.valid_for_sub_units) for access_delegation in delegations[accreditation.unit_id]])
+
+        # For each unit, users in order of accreditation, and users with the access (directly or from a parent)
+        users_in_unit = dict((pk, []) for pk in all_units)
+        granted = set()
+
+        for accreditation in accreditations:
+            if accreditation.user_id not in users_in_unit[accreditation.unit_id]:
+                users_in_unit[accreditation.unit_id].append(accreditation.user_id)
+
+            if access:
+                if grants(accreditation, False):
+                    granted.add((accreditation.unit_id, accreditation.user_id, False))
+                if grants(accreditation, True):
+                    granted.add((accreditation.unit_id, accreditation.user_id, True))
+
+        retour = {}
+
+        for pk in units_pks:
+            retour[pk] = [user_pk for user_pk in users_in_unit[pk] if not access or (pk, user_pk, False) in granted or any([(parent_pk, user_pk, True) in granted for parent_pk in chains[pk][1:]])]
 
         return retour
 
@@ -265,6 +390,13 @@ Les unités sont organisées en arbre hiérarchique, avec le Comité de l'AGEPol
 
         return super(_Unit, self).rights_can_SHOW(user)
 
+    def save_signal(self):
+        """Cleanup cached accesses (parent units give accesses)"""
+        units_access_expire()
+
+    def delete_signal(self, request):
+        self.save_signal()
+
 
 class _Role(GenericModel, AgepolyEditableModel, SearchableModel):
     """Un role, pour une accred"""
@@ -371,6 +503,13 @@ Par exemple, le rôle 'Trésorier' donne l'accès TRÉSORERIE. Les droits sont g
 
         return (True, None)
 
+    def save_signal(self):
+        """Cleanup cached accesses (roles give accesses)"""
+        units_access_expire()
+
+    def delete_signal(self, request):
+        self.save_signal()
+
 
 class Accreditation(models.Model, UnitEditableModel, SearchableModel):
     unit = models.ForeignKey('Unit')
@@ -570,8 +709,7 @@ Il est aussi possible de restreindre une délégation â un utilisateur ou à un
     def save_signal(self):
         """Cleanup rights"""
 
-        for user in self.unit.get_users():
-            user.clear_rights_cache()
+        TruffeUser.clear_rights_cache_of([user.pk for user in self.unit.get_users()])
 
     def get_display_list(self):
         return _(u'Délégation #{}'.format(self.pk))
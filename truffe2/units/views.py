@@ -14,6 +14,7 @@ from generic.datatables import generic_list_json
 from units.models import Accreditation, AccreditationLog
 from app.utils import update_current_unit, get_current_unit
 from app.ldaputils import get_attrs_of_sciper
+from users.avatars import prefetch_avatars
 from users.models import TruffeUser
 
 
@@ -32,7 +33,18 @@ def accreds_list(request):
     if request.GET.get('upk'):
         update_current_unit(request, request.GET.get('upk'))
 
-    can_edit = Accreditation.static_rights_can('CREATE', request.user, get_current_unit(request))
+    unit = get_current_unit(request)
+
+    can_edit = Accreditation.static_rights_can('CREATE', request.user, unit)
+
+    # Members of the unit will be displayed: refresh their pictures in the background, once for the page (and not on each json call)
+    if Accreditation.static_rights_can('LIST', request.user, unit):
+        accreds = Accreditation.objects.filter(unit=unit, end_date=None)
+
+        if not can_edit:
+            accreds = accreds.filter(hidden_in_truffe=False)
+
+        prefetch_avatars(TruffeUser.objects.filter(pk__in=accreds.values('user')))
 
     return render(request, 'units/accreds/list.html', {'main_unit': main_unit, 'can_edit': can_edit})
 
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+from django.conf import settings
+from django.core.cache import cache
+
+from PIL import Image
+
+import cStringIO as StringIO
+import importlib
+import logging
+import os
+import requests
+import time
+
+
+class PeopleFetcher(object):
+    """Fetch pictures from the people directory (settings.AVATARS_PEOPLE_URL)"""
+
+    def fetch(self, username):
+        """Return the picture (raw data) of the user, or None if he has no public picture. Raise an exception if the directory cannot be reached."""
+
+        r = requests.get(settings.AVATARS_PEOPLE_URL.format(username), timeout=settings.AVATARS_FETCH_TIMEOUT)
+
+        if r.status_code == requests.codes.ok and 'text/html' not in r.headers.get('content-type', ''):
+            return r.content
+
+        if r.status_code in (requests.codes.ok, requests.codes.not_found):
+            return None
+
+        r.raise_for_status()
+
+
+class DirectoryFetcher(object):
+    """Fetch pictures from a local folder (settings.AVATARS_LOCAL_DIR), named [username].png or [username].jpg. Used as a stand-in for the people directory."""
+
+    def __init__(self, path=None):
+        self.path = path or settings.AVATARS_LOCAL_DIR
+
+    def fetch(self, username):
+        for ext in ('png', 'jpg'):
+            path = os.path.join(self.path, '{}.{}'.format(username, ext))
+
+            if os.path.isfile(path):
+                with open(path, 'rb') as f:
+                    return f.read()
+
+        return None
+
+
+_fetcher = None
+
+
+def get_avatar_fetcher():
+    """Return the fetcher, using the class set in settings.AVATARS_FETCHER"""
+
+    global _fetcher
+
+    if _fetcher is None:
+        module, name = settings.AVATARS_FETCHER.rsplit('.', 1)
+        _fetcher = getattr(importlib.import_module(module), name)()
+
+    return _fetcher
+
+
+def set_avatar_fetcher(fetcher):
+    """Replace the fetcher (eg. a DirectoryFetcher for tests)"""
+
+    global _fetcher
+
+    _fetcher = fetcher
+
+
+def avatar_path(user):
+    return os.path.join(settings.MEDIA_ROOT, 'cache', 'users', '{}.png'.format(user.pk))
+
+
+def avatar_url(user):
+    return '{}cache/users/{}.png'.format(settings.MEDIA_URL, user.pk)
+
+
+def default_avatar_url():
+    return '{}img/default_avatar.png'.format(settings.MEDIA_URL)
+
+
+def _avatar_state(user):
+    """Return (cached, stale) for the picture of the user. A user without picture is cached (with the default picture) until the negative cache expires."""
+
+    try:
+        mtime = os.path.getmtime(avatar_path(user))
+    except OSError:
+        return (False, not cache.get('avatar~missing_{}'.format(user.pk)))
+
+    return (True, mtime + settings.AVATARS_TIMEOUT < time.time())
+
+
+def queue_avatars_refresh(users):
+    """Enqueue, in one task, the refresh of the pictures of the users. Users already waiting for a refresh are skipped."""
+
+    from users.tasks import refresh_avatars
+
+    pks = [user.pk for user in users if cache.add('avatar~queued_{}'.format(user.pk), True, settings.AVATARS_QUEUE_TIMEOUT)]
+
+    if pks:
+        refresh_avatars.delay(pks)
+
+
+def prefetch_avatars(users):
+    """Enqueue the refresh of the pictures of the users (eg. members of a unit) that are missing or stale, before they are displayed"""
+    queue_avatars_refresh([user for user in users if not user.avatar and _avatar_state(user)[1]])
+
+
+def get_avatar_url(user):
+    """Return the url of the picture of the user, without waiting for the directory: a stale picture is returned (and refreshed in the background), the default one if the picture is not known yet"""
+
+    if user.avatar:
+        return '{}{}'.format(settings.MEDIA_URL, user.avatar)
+
+    cached, stale = _avatar_state(user)
+
+    if stale:
+        queue_avatars_refresh([user])
+
+    return avatar_url(user) if cached else default_avatar_url()
+
+
+def refresh_avatar(user):
+    """Fetch the picture of the user and store it, resized, in the cache. Users without picture are remembered (settings.AVATARS_MISSING_TIMEOUT)."""
+
+    path = avatar_path(user)
+
+    try:
+        data = get_avatar_fetcher().fetch(user.username)
+    except Exception as e:
+        # Keep the stale picture, the next try will be after the end of the queue timeout
+        logger = logging.getLogger(__name__)
+        logger.warning("Cannot fetch picture of %s: %s", user.username, e)
+        return
+
+    image = None
+
+    if data:
+        try:
+            image = Image.open(StringIO.StringIO(data))
+
+            if image.mode not in ('1', 'L', 'P', 'RGB', 'RGBA'):
+                image = image.convert('RGB')
+
+            image.thumbnail((settings.AVATARS_SIZE, settings.AVATARS_SIZE), Image.ANTIALIAS)
+        except IOError:
+            image = None
+
+    if image is not None:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+
+        # Write in a temporary file first, to never serve a partial picture
+        image.save('{}.tmp'.format(path), 'PNG')
+        os.rename('{}.tmp'.format(path), path)
+
+        cache.delete('avatar~missing_{}'.format(user.pk))
+    else:
+        if os.path.exists(path):
+            os.unlink(path)
+
+        cache.set('avatar~missing_{}'.format(user.pk), True, settings.AVATARS_MISSING_TIMEOUT)
+
+    cache.delete('avatar~queued_{}'.format(user.pk))
@@ -2,6 +2,7 @@
 
 from django.core.management.base import BaseCommand
 
+from app.ldaputils import get_attrs_of_scipers
 from users.models import TruffeUser
 
 
@@ -10,5 +11,10 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
 
-        for user in TruffeUser.objects.all():
+        users = [user for user in TruffeUser.objects.all() if (not user.first_name or not user.last_name) and user.username_is_sciper()]
+
+        # Fetch all scipers at once, update_from_ldap will use the cache
+        get_attrs_of_scipers([user.username for user in users])
+
+        for user in users:
             user.update_from_ldap()
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.utils.translation import ugettext_lazy as _
 from django.utils import timezone
@@ -100,8 +101,8 @@ class TruffeUser(AbstractBaseUser, PermissionsMixin, ModelWithRight, SearchableM
         """Returns the short name for the user."""
         return self.first_name
 
-    def generate_vcard(self, source_user, add_unit=None):
-        """Generate the user's vcard"""
+    def generate_vcard(self, source_user, add_unit=None, privacy=None):
+        """Generate the user's vcard. privacy is an UserPrivacyResolver for source_user, to reuse when generating many vcards."""
 
         retour = u"""BEGIN:VCARD
 VERSION:3.0%s
@@ -109,7 +110,7 @@ N:%s;%s
 FN:%s
 """ % (u'\nORG:{}'.format(add_unit) if add_unit else u'', self.last_name, self.first_name, self.get_full_name())
 
-        if UserPrivacy.user_can_access(source_user, self, 'mobile'):
+        if (privacy or UserPrivacyResolver(source_user)).can_access(self, 'mobile'):
             retour += u"""TEL;CELL:%s
 """ % (self.mobile, )
 
@@ -132,16 +133,63 @@ FN:%s
 
         return liste.order_by('unit__name', 'role__order')
 
+    def access_profile(self):
+        """Return (set of (unit pk, access) given by the user's accreditations, like is_user_in_groupe with no_parent, True if the user has no accreditation).
+
+        The profile is computed once per instance (eg. request.user) and cached until accreditations, delegations or roles change (see clear_rights_cache_of)."""
+
+        if getattr(self, '_access_profile', None) is None:
+
+            cache_key = 'users~access_profile_%s' % (self.pk,)
+
+            cached = cache.get_many([cache_key, 'units~access_last'])
+
+            if 'units~access_last' not in cached:
+                cached['units~access_last'] = time.time()
+                cache.set('units~access_last', cached['units~access_last'])
+
+            if cache_key in cached and cached[cache_key][0] >= cached['units~access_last']:
+                self._access_profile = cached[cache_key][1]
+            else:
+                current_time = time.time()
+                self._access_profile = self._compute_access_profile()
+                cache.set(cache_key, (current_time, self._access_profile))
+
+        return self._access_profile
+
+    def _compute_access_profile(self):
+
+        from units.models import AccessDelegation
+
+        accreds = list(self.accreditation_set.filter(end_date=None).select_related('role'))
+
+        accesses = set()
+
+        for accred in accreds:
+            for access in accred.role.access or []:
+                accesses.add((accred.unit_id, access))
+
+        if accreds:
+            for access_delegation in AccessDelegation.objects.filter(Q(user=self) | Q(user=None), unit__in=set([accred.unit_id for accred in accreds])).exclude(deleted=True):
+                for accred in accreds:
+                    if accred.unit_id == access_delegation.unit_id and access_delegation.role_id in (None, accred.role_id):
+                        for access in access_delegation.access or []:
+                            accesses.add((accred.unit_id, access))
+
+        return (frozenset(accesses), not accreds)
+
     def rights_in_any_unit(self, access):
-        for accred in self.active_accreds(with_hiddens=True):
-            # Ask the coresponding unit to do the check.
-            if accred.unit.is_user_in_groupe(self, access, no_parent=True):
-                return True
+        accesses, external = self.access_profile()
 
-        return False
+        if not access:
+            return not external
+
+        user_accesses = set([acc for (__, acc) in accesses])
+
+        return any([acc in user_accesses for acc in (access if type(access) is list else [access])])
 
     def is_external(self):
-        return not self.active_accreds(with_hiddens=True)
+        return self.access_profile()[1]
 
     def username_is_sciper(self):
         return re.match('^\d{6}$', self.username)
@@ -166,7 +214,19 @@ FN:%s
         return self.accreditation_set.exclude(end_date=None).order_by('unit__name', 'role__order', 'start_date', 'end_date')
 
     def clear_rights_cache(self):
-        cache.set('right~user_%s' % (self.pk,), time.time())
+        self._access_profile = None
+        TruffeUser.clear_rights_cache_of([self.pk])
+
+    @staticmethod
+    def clear_rights_cache_of(users_pks):
+        """Clear the rights cache of many users at once. Cached accesses in units (see units.models.units_access_expire) are cleared too."""
+
+        current_time = time.time()
+
+        values = dict(('right~user_%s' % (pk,), current_time) for pk in users_pks)
+        values['units~access_last'] = current_time
+
+        cache.set_many(values)
 
     def __unicode__(self):
         return '%s (%s)' % (self.get_full_name(), self.username)
@@ -244,19 +304,85 @@ class UserPrivacy(models.Model):
 
     @staticmethod
     def user_can_access(user_reader, user_readed, field):
-        level = UserPrivacy.get_privacy_for_field(user_readed, field)
+        return UserPrivacyResolver(user_reader).can_access(user_readed, field)
+
+
+class UserPrivacyResolver(object):
+    """Check which fields of users a reader can see. The relationship of the reader (rights, accreditations) is computed once, and privacy settings of many users are loaded with one query (see prefetch): use one resolver for a list of users."""
 
-        if user_reader == user_readed or user_readed.rights_can('EDIT', user_reader):
+    TRESORERIE_FIELDS = ['adresse', 'nom_banque', 'iban_ou_ccp']
+
+    def __init__(self, user_reader):
+        self.user_reader = user_reader
+        self.levels = {}
+        self.units = {}
+
+        self._can_edit_all = None
+        self._is_treasurer = None
+        self._reader_units = None
+
+    def can_edit_all(self):
+        if self._can_edit_all is None:
+            self._can_edit_all = self.user_reader.is_superuser or self.user_reader.rights_in_root_unit(self.user_reader, access='INFORMATIQUE')
+        return self._can_edit_all
+
+    def is_treasurer(self):
+        if self._is_treasurer is None:
+            self._is_treasurer = self.user_reader.rights_in_root_unit(self.user_reader, access='TRESORERIE')
+        return self._is_treasurer
+
+    def reader_units(self):
+        if self._reader_units is None:
+            self._reader_units = set(self.user_reader.accreditation_set.filter(end_date=None).values_list('unit', flat=True))
+        return self._reader_units
+
+    def prefetch(self, users):
+        """Load the privacy settings and the units of the users, with one query each"""
+
+        from units.models import Accreditation
+
+        pks = [user.pk for user in users if user.pk not in self.levels]
+
+        if not pks:
+            return
+
+        for pk in pks:
+            self.levels[pk] = {}
+            self.units[pk] = set()
+
+        for pk, field, level in UserPrivacy.objects.filter(user__in=pks).values_list('user', 'field', 'level'):
+            self.levels[pk][field] = level
+
+        for pk, unit_pk in Accreditation.objects.filter(user__in=pks, end_date=None).values_list('user', 'unit'):
+            self.units[pk].add(unit_pk)
+
+    def can_access(self, user_readed, field):
+
+        if self.user_reader == user_readed or self.can_edit_all():
+            return True
+
+        if field in self.TRESORERIE_FIELDS and self.is_treasurer():
             return True
-        elif user_reader.rights_in_root_unit(user_reader, access='TRESORERIE') and field in ['adresse', 'nom_banque', 'iban_ou_ccp']:
+
+        self.prefetch([user_readed])
+
+        # Without settings, fields are private
+        level = self.levels[user_readed.pk].get(field, 'prive')
+
+        if level == 'public':
             return True
-        else:
-            if level == 'public':
-                return True
-            if level == 'prive':
-                return False
-            if level == 'member':
-                return user_reader.accreditation_set.filter(end_date=None).count() > 0
-            if level == 'groupe':
-                my_groups = [a.unit.pk for a in list(user_readed.accreditation_set.filter(end_date=None))]
-                return user_reader.accreditation_set.filter(end_date=None, unit__pk__in=my_groups).count() > 0
+        if level == 'member':
+            return bool(self.reader_units())
+        if level == 'groupe':
+            return bool(self.reader_units() & self.units[user_readed.pk])
+
+        return False
+
+    def visibility(self, users, fields=None):
+        """Return, for each user pk, a dict field -> True if the reader can see the field"""
+
+        fields = fields or [field for (field, __) in UserPrivacy.FIELD_CHOICES]
+
+        self.prefetch(users)
+
+        return dict((user.pk, dict((field, self.can_access(user, field)) for field in fields)) for user in users)
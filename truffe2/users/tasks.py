@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+from celery import shared_task
+
+
+@shared_task
+def refresh_avatars(pks):
+    """Refresh the cached pictures of users, asked with users.avatars.queue_avatars_refresh"""
+
+    from users.avatars import refresh_avatar
+    from users.models import TruffeUser
+
+    for user in TruffeUser.objects.filter(pk__in=pks):
+        refresh_avatar(user)
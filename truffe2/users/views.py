@@ -4,6 +4,7 @@ from django.shortcuts import get_object_or_404, render, redirect
 from django.views.decorators.csrf import csrf_exempt
 from django.http import Http404, HttpResponse
 from django.utils.encoding import smart_str
+from django.utils.text import slugify
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login as auth_login
@@ -15,18 +16,16 @@ from django.utils.translation import ugettext_lazy as _
 from django.utils.http import is_safe_url
 from django.utils.timezone import now
 
-from app.utils import send_templated_mail, update_current_unit, get_current_unit, generate_pdf
+from app.utils import send_templated_mail, update_current_unit, get_current_unit
 from app.ldaputils import search_sciper
 from generic.datatables import generic_list_json
-from users.models import TruffeUser, UserPrivacy
+from generic.pdfjobs import start_pdf_job
+from users.avatars import get_avatar_url
+from users.models import TruffeUser, UserPrivacy, UserPrivacyResolver
 from users.forms import TruffeUserForm, TruffeCreateUserForm, TruffePasswordResetForm
 
 import json
-import os
 import re
-import requests
-import shutil
-import time
 
 
 def login(request, why=None):
@@ -90,10 +89,7 @@ def users_profile(request, pk):
 
     user = get_object_or_404(TruffeUser, pk=pk)
 
-    privacy_values = {}
-
-    for field in UserPrivacy.FIELD_CHOICES:
-        privacy_values[field[0]] = UserPrivacy.user_can_access(request.user, user, field[0])
+    privacy_values = UserPrivacyResolver(request.user).visibility([user])[user.pk]
 
     return render(request, 'users/users/profile.html', {'user_to_display': user, 'privacy_values': privacy_values})
 
@@ -170,25 +166,7 @@ def users_profile_picture(request, pk):
 
     user = get_object_or_404(TruffeUser, pk=pk)
 
-    if user.avatar:
-        return HttpResponseRedirect('{}{}'.format(settings.MEDIA_URL, user.avatar))
-
-    file_cache = os.path.join(settings.MEDIA_ROOT, 'cache', 'users', '{}.png'.format(user.pk))
-
-    if not os.path.exists(file_cache) or (os.path.getmtime(file_cache) + 60.0 * 24.0) < time.time():
-        if os.path.exists(file_cache):
-            os.unlink(file_cache)
-
-        r = requests.get('http://people.epfl.ch/cgi-bin/people/getPhoto?id={}'.format(user.username), stream=True)
-
-        if r.status_code == requests.codes.ok and 'text/html' not in r.headers['content-type']:
-            with open(file_cache, 'wb') as fd:
-                for chunk in r.iter_content(1024):
-                    fd.write(chunk)
-        else:
-            shutil.copy(os.path.join(settings.MEDIA_ROOT, 'img', 'default_avatar.png'), file_cache)
-
-    return HttpResponseRedirect('{}cache/users/{}.png'.format(settings.MEDIA_URL, user.pk))
+    return HttpResponseRedirect(get_avatar_url(user))
 
 
 @login_required
@@ -304,8 +282,13 @@ def users_myunit_vcard(request):
 
     retour = ""
 
-    for accred in current_unit.current_accreds():
-        retour += "%s\n\n" % (accred.user.generate_vcard(request.user, add_unit=current_unit),)
+    accreds = list(current_unit.current_accreds().select_related('user'))
+
+    privacy = UserPrivacyResolver(request.user)
+    privacy.prefetch([accred.user for accred in accreds])
+
+    for accred in accreds:
+        retour += "%s\n\n" % (accred.user.generate_vcard(request.user, add_unit=current_unit, privacy=privacy),)
 
     response = HttpResponse(retour[:-2], content_type='text/x-vcard')
     name = smart_str(current_unit)
@@ -327,10 +310,21 @@ def users_myunit_pdf(request):
 
     no_display = bool(request.GET.get('no_display', False))
 
-    liste = []
+    return start_pdf_job(request, 'users.views.build_myunit_pdf', u'{}.pdf'.format(slugify(unicode(current_unit))), unit_pk=current_unit.pk, no_display=no_display)
+
+
+def build_myunit_pdf(user, unit_pk, no_display):
+    """Build the PDF of users in an unit. Rendered in background (see users_myunit_pdf)"""
+    from units.models import Unit
+
+    unit = Unit.objects.get(pk=unit_pk)
+
+    liste = list(unit.current_accreds().select_related('user', 'role'))
+
+    privacy = UserPrivacyResolver(user)
+    privacy.prefetch([accred.user for accred in liste])
 
-    for accred in current_unit.current_accreds():
-        accred.truffe2_tmp_pdf_display_mobile = UserPrivacy.user_can_access(request.user, accred.user, 'mobile')
-        liste.append(accred)
+    for accred in liste:
+        accred.truffe2_tmp_pdf_display_mobile = privacy.can_access(accred.user, 'mobile')
 
-    return generate_pdf("users/users/myunit_pdf.html", request, {'unit': current_unit, 'liste': liste, 'no_display_name': no_display})
+    return ("users/users/myunit_pdf.html", {'unit': unit, 'liste': liste, 'no_display_name': no_display}, None)
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+from django.conf import settings
+from django.core.urlresolvers import reverse
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
 from django import forms
@@ -111,6 +113,18 @@ class _VehicleType(GenericModel, AgepolyEditableModel, SearchableModel):
     def __unicode__(self):
         return self.name
 
+    def calendar_ics_url(self, user):
+        """Return the personal url of the iCalendar feed of the bookings of the type, None if the user cannot validate bookings"""
+
+        from generic.calendar_feed import calendar_ics_token
+        from units.models import Unit
+        from vehicles.models import Booking
+
+        if not Booking.static_rights_can('VALIDATE', user, Unit.objects.get(pk=settings.ROOT_UNIT_PK)):
+            return None
+
+        return reverse('vehicles.views.vehicletype_calendar_ics', args=(self.pk, user.pk, calendar_ics_token(Booking, 'vehicletype_%s' % (self.pk,), user.pk)))
+
 
 class _Card(GenericModel, AgepolyEditableModel, SearchableModel):
 
@@ -234,8 +248,8 @@ class _Booking(GenericModel, GenericGroupsModerableModel, GenericGroupsModel, Ge
     card = FalseFK('vehicles.models.Card', verbose_name=_(u'Carte'), blank=True, null=True)
     location = FalseFK('vehicles.models.Location', verbose_name=_(u'Lieu'), blank=True, null=True)
 
-    start_date = models.DateTimeField(_(u'Début de la réservation'))
-    end_date = models.DateTimeField(_(u'Fin de la réservation'))
+    start_date = models.DateTimeField(_(u'Début de la réservation'), db_index=True)
+    end_date = models.DateTimeField(_(u'Fin de la réservation'), db_index=True)
 
     class MetaData:
         list_display = [
@@ -403,4 +417,4 @@ Ils sont soumis à validation par le secrétariat de l'AGEPoly. Il faut toujours
                     raise forms.ValidationError(_(u'Le type de véhicule n\'est pas lié au fournisseur sélectionné'))
 
     def conflicting_reservation(self):
-        return self.__class__.objects.exclude(pk=self.pk, deleted=True).filter(status__in=['2_online'], end_date__gt=self.start_date, start_date__lt=self.end_date)
+        return self.__class__.objects.exclude(pk=self.pk).exclude(deleted=True).filter(status__in=['2_online'], end_date__gt=self.start_date, start_date__lt=self.end_date)
@@ -8,4 +8,6 @@ urlpatterns = patterns(
     'vehicles.views',
 
     url(r'^booking/(?P<pk>[0-9]+)/pdf/', 'booking_pdf'),
+    url(r'^vehicletype/available$', 'vehicletype_available'),
+    url(r'^vehicletype/(?P<pk>[0-9]+)/calendar/ics/(?P<user_pk>[0-9]+)/(?P<token>[0-9a-f]+)$', 'vehicletype_calendar_ics'),
 )
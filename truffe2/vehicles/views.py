@@ -9,7 +9,10 @@ from django.shortcuts import get_object_or_404
 from django.conf import settings
 
 
-from app.utils import generate_pdf
+from app.utils import generate_pdf, build_etag, cached_response
+
+import datetime
+import pytz
 
 
 @login_required
@@ -23,3 +26,52 @@ def booking_pdf(request, pk):
         raise Http404
 
     return generate_pdf("vehicles/booking/pdf.html", request, {'object': booking})
+
+
+@login_required
+def vehicletype_available(request):
+    """Liste des types de véhicules ayant des créneaux libres pendant une période"""
+
+    from vehicles.models import Booking, VehicleType
+    from units.models import Unit
+    from generic.availability import free_slots_response
+
+    unit = get_object_or_404(Unit, pk=request.GET.get('unit_pk') or settings.ROOT_UNIT_PK)
+
+    if not Booking.static_rights_can('CREATE', request.user, unit):
+        raise Http404
+
+    vehicletypes = VehicleType.objects.filter(deleted=False).select_related('provider').order_by('name')
+
+    if request.GET.get('provider'):
+        vehicletypes = vehicletypes.filter(provider__pk=request.GET.get('provider'))
+
+    return free_slots_response(request, vehicletypes, Booking, 'vehicletype', lambda vehicletype: {'id': vehicletype.pk, 'text': vehicletype.name, 'provider': vehicletype.provider.name})
+
+
+def vehicletype_calendar_ics(request, pk, user_pk, token):
+    """Calendrier iCalendar des réservations d'un type de véhicule. Pas de login pour les clients de calendrier: le token identifie l'user (voir VehicleType.calendar_ics_url)."""
+
+    from vehicles.models import Booking, VehicleType
+    from units.models import Unit
+    from generic.calendar_feed import calendar_events, calendar_ics, calendar_ics_user
+
+    user = calendar_ics_user(Booking, 'vehicletype_%s' % (pk,), user_pk, token)
+
+    vehicletype = get_object_or_404(VehicleType, pk=pk, deleted=False)
+
+    if not Booking.static_rights_can('VALIDATE', user, get_object_or_404(Unit, pk=settings.ROOT_UNIT_PK)):
+        raise Http404
+
+    today = pytz.timezone(settings.TIME_ZONE).localize(datetime.datetime.combine(datetime.date.today(), datetime.time()))
+
+    start = today - datetime.timedelta(days=settings.CALENDAR_ICS_PAST_DAYS)
+    end = today + datetime.timedelta(days=settings.CALENDAR_ICS_FUTURE_DAYS)
+
+    bookings = Booking.objects.filter(vehicletype=vehicletype, status__in=['1_asking', '2_online'], deleted=False)
+
+    events = calendar_events(Booking, 'vehicletype_%s' % (vehicletype.pk,), bookings, start, end)
+
+    body = calendar_ics(Booking, vehicletype.name, events, lambda event: u'{} (Réservé par {})'.format(event['description'].decode('utf-8'), event['par']))
+
+    return cached_response(request, lambda: HttpResponse(body, content_type='text/calendar; charset=utf-8'), etag=build_etag(body))